@@ -5,9 +5,8 @@ _BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, os.path.join(_BASE_DIR, "src"))
 
 import streamlit as st
-from controller import TaskController
 from repository import JSONTaskRepository
-from patterns import TaskMediator
+from store import SharedTaskStore
 from view import TodoView
 
 
@@ -23,18 +22,17 @@ st.set_page_config(
 def init_app():
     """
     Initialisiert Anwendung
-    Session State
+    Session State: jede Session erhält ein Handle auf den
+    prozessweit geteilten Store (Daten nur einmal im Speicher).
     """
     if "mediator" not in st.session_state:
         data_path = os.path.join(_BASE_DIR, "data", "tasks.json")
-        repository = JSONTaskRepository(data_path)
-        
-        controller = TaskController(repository)
-        controller.load()
-        
-        mediator = TaskMediator(controller)
-        
-        st.session_state.mediator = mediator
+        store = SharedTaskStore.for_path(
+            data_path,
+            lambda path: JSONTaskRepository(path, use_snapshot=True),
+            write_behind=True,
+        )
+        st.session_state.mediator = store.session()
     
     return st.session_state.mediator
 
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Zusatzkosten von atomarem Speichern (Temp-Datei, fsync,
+os.replace) und Datei-Lock gegenüber dem direkten Überschreiben.
+Beide Varianten schreiben denselben, vorab kodierten Text: das
+Kodieren (mit TaskCodec-Cache im Repository) ist nicht Teil der Messung.
+
+Ausführung:
+    python benchmarks/bench_atomic_save.py
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from codec import TaskCodec
+from model import Task
+from repository import _exclusive_lock, _write_json_atomic
+
+SIZES = [100, 1_000, 10_000]
+ROUNDS = 20
+BUDGET_MS = 10.0  # erlaubte Zusatzkosten pro Save
+
+
+def save_in_place(filepath: str, text: str) -> None:
+    """Bisheriges Verfahren: Datei direkt mit "w" überschreiben."""
+    with open(filepath, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def save_atomic(filepath: str, text: str) -> None:
+    """Wie JSONTaskRepository.save() nach dem Kodieren."""
+    with _exclusive_lock(filepath + ".lock"):
+        _write_json_atomic(filepath, text)
+
+
+def measure(save, text: str) -> float:
+    """Median der Zeit pro Save in Millisekunden (robust gegen einzelne Ausreißer)."""
+    times = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        save(text)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main():
+    ok = True
+    print(f"{'Tasks':>8}  {'in-place':>10}  {'atomar':>10}  {'Zusatz':>10}")
+    for n in SIZES:
+        text = TaskCodec().encode([Task(title=f"Task {i}", category="Bench") for i in range(n)])
+        with tempfile.TemporaryDirectory() as tmp:
+            filepath = os.path.join(tmp, "tasks.json")
+            plain = measure(lambda t: save_in_place(filepath, t), text)
+            atomic = measure(lambda t: save_atomic(filepath, t), text)
+        overhead = atomic - plain
+        ok = ok and overhead <= BUDGET_MS
+        print(f"{n:>8}  {plain:8.2f}ms  {atomic:8.2f}ms  {overhead:8.2f}ms")
+    print(f"Budget {BUDGET_MS:.1f} ms pro Save: {'eingehalten' if ok else 'ÜBERSCHRITTEN'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
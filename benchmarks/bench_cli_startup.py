@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Kaltstart der Kommandozeile (todo.py) als eigener Prozess -
+gegen den leeren Interpreter und gegen den Import von streamlit, den
+jeder Start über app.py bezahlt. Ziel: "stats" auf einer kleinen Datei
+höchstens TARGET_MS über dem leeren Interpreter.
+
+Ausführung:
+    python benchmarks/bench_cli_startup.py [Anzahl Tasks]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from model import Task
+from repository import JSONTaskRepository
+
+DEFAULT_TASKS = 100
+REPEAT = 7
+TARGET_MS = 100
+
+
+def cold_start(args) -> float:
+    """Beste Laufzeit aus REPEAT Prozessstarts in ms."""
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TASKS
+    tmp = tempfile.TemporaryDirectory()
+    path = os.path.join(tmp.name, "tasks.json")
+    JSONTaskRepository(path).save([Task(f"Task {i}", category="Arbeit") for i in range(n)])
+    # Bytecode vorab erzeugen, sonst misst der erste Start das Kompilieren mit
+    subprocess.run([sys.executable, "-m", "compileall", "-q", os.path.join(ROOT, "src")],
+                   check=True, stdout=subprocess.DEVNULL)
+
+    base = cold_start(["-c", "pass"])
+    runs = [
+        ("todo --help", ["-m", "todo", "--help"]),
+        ("todo stats", ["-m", "todo", "--data", path, "stats"]),
+        ("todo list", ["-m", "todo", "--data", path, "list", "--limit", "20"]),
+    ]
+    try:
+        import importlib.util
+        if importlib.util.find_spec("streamlit") is not None:
+            runs.append(("import streamlit", ["-c", "import streamlit"]))
+    except ImportError:
+        pass
+
+    print(f"{n} Tasks, beste von {REPEAT} Starts")
+    print(f"{'python -c pass':>18}: {base:7.1f} ms")
+    for name, args in runs:
+        ms = cold_start(args)
+        print(f"{name:>18}: {ms:7.1f} ms  (+{ms - base:.1f} ms)")
+        if name == "todo stats":
+            verdict = "erreicht" if ms - base <= TARGET_MS else "verfehlt"
+            print(f"{'':>18}  Ziel +{TARGET_MS} ms {verdict}")
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
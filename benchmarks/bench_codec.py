@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Kodieren und Dekodieren von Task-Listen.
+Kodieren: json.dump über to_dict() gegen TaskCodec (kalt, und warm
+mit 1 % geänderten Tasks wie bei einem normalen Speichern).
+Dekodieren: Task.from_dict pro Record gegen decode_tasks (ein Durchlauf
+ohne Umwege pro Record).
+
+Ausführung:
+    python benchmarks/bench_codec.py [Anzahl Tasks]
+"""
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from codec import TaskCodec, decode_tasks
+from model import Task
+
+DEFAULT_TASKS = 100_000
+REPEAT = 5
+
+
+def make_tasks(n: int):
+    rng = random.Random(0)
+    today = date.today()
+    return [
+        Task(f"Task {i}", done=rng.random() < 0.3, category=rng.choice(["", "Arbeit", "Privat", "Sport"]),
+             due_date=today + timedelta(days=rng.randint(-30, 60)) if rng.random() < 0.6 else None)
+        for i in range(n)
+    ]
+
+
+def timed(func, setup=None) -> float:
+    """Mittlere Laufzeit in Millisekunden (setup wird nicht mitgemessen)."""
+    total = 0.0
+    for _ in range(REPEAT):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        total += time.perf_counter() - start
+    return total / REPEAT * 1000
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TASKS
+    tasks = make_tasks(n)
+    rng = random.Random(1)
+    changed = max(1, n // 100)
+
+    def touch():
+        for task in rng.sample(tasks, changed):
+            task.toggle()
+
+    warm = TaskCodec()
+    warm.encode(tasks)
+    print(f"{n} Tasks")
+    print(f"{'Kodieren':>28}  {'Zeit':>10}")
+    rows = [
+        ("json.dump(to_dict)", lambda: json.dumps([t.to_dict() for t in tasks], ensure_ascii=False, indent=2), None),
+        ("TaskCodec kalt", lambda: TaskCodec().encode(tasks), None),
+        (f"TaskCodec warm ({changed} geändert)", lambda: warm.encode(tasks), touch),
+    ]
+    for name, func, setup in rows:
+        print(f"{name:>28}  {timed(func, setup):7.1f} ms")
+
+    records = json.loads(warm.encode(tasks))
+    print(f"{'Dekodieren':>28}  {'Zeit':>10}")
+    rows = [
+        ("Task.from_dict", lambda: [Task.from_dict(r) for r in records]),
+        ("decode_tasks", lambda: decode_tasks(records)),
+    ]
+    for name, func in rows:
+        print(f"{name:>28}  {timed(func):7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Speicher, Statistik-Zeit und eine Seite der Liste (50 offene
+Tasks, Smart-Sort) - TaskController (Task-Objekte mit Indizes) gegen
+ColumnarTaskRepository hinter dem Pushdown-Controller.
+Misst den Columnar-Pfad mit NumPy (falls installiert) und ohne.
+
+Ausführung:
+    python benchmarks/bench_columnar.py [Anzahl Tasks]
+"""
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import columnar
+from columnar import ColumnarTaskRepository
+from controller import TaskController, PushdownTaskController
+from model import Task
+from query import TaskQuery
+from repository import JSONTaskRepository
+
+DEFAULT_TASKS = 200_000
+REPEAT = 5
+
+
+def make_tasks(n: int):
+    rng = random.Random(0)
+    today = date.today()
+    return [
+        Task(f"Task {i}", done=rng.random() < 0.3, category=rng.choice(["", "Arbeit", "Privat", "Sport"]),
+             due_date=today + timedelta(days=rng.randint(-30, 60)) if rng.random() < 0.6 else None)
+        for i in range(n)
+    ]
+
+
+def measure(build):
+    """Gibt (Controller, belegte MB) zurück."""
+    gc.collect()
+    tracemalloc.start()
+    ctrl = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return ctrl, size / 1024 / 1024
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        func()
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TASKS
+    tmp = tempfile.TemporaryDirectory()
+    path = os.path.join(tmp.name, "tasks.json")
+    JSONTaskRepository(path).save(make_tasks(n))
+
+    def objects():
+        ctrl = TaskController(repository=JSONTaskRepository(path))
+        ctrl.load(streaming=True)
+        return ctrl
+
+    def columns():
+        return PushdownTaskController(ColumnarTaskRepository(JSONTaskRepository(path)))
+
+    print(f"{n} Tasks")
+    print(f"{'Variante':>18}  {'Speicher':>10}  {'Statistik':>11}  {'Kategorien':>11}  {'Überfällig':>11}  {'Seite':>11}")
+    page = TaskQuery(status="open", sort="smart", limit=50)
+    numpy = columnar.np
+    for name, build, vectorized in [("Task-Objekte", objects, None),
+                                    ("Columnar (NumPy)", columns, numpy),
+                                    ("Columnar (array)", columns, None)]:
+        if name.endswith("(NumPy)") and numpy is None:
+            continue
+        columnar.np = vectorized
+        ctrl, mb = measure(build)
+        stats = timed(ctrl.get_statistics)
+        cats = timed(ctrl.get_category_counts)
+        overdue = timed(ctrl.get_overdue)
+        first_page = timed(lambda: ctrl.query(page))
+        print(f"{name:>18}  {mb:7.1f} MB  {stats:8.2f} ms  {cats:8.2f} ms  {overdue:8.2f} ms  {first_page:8.2f} ms")
+        del ctrl
+    columnar.np = numpy
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Latenz pro Controller-Operation (ohne Speichern) je Bestandsgröße.
+Mit ID-Index sollte die Zeit pro Operation unabhängig von der Anzahl sein.
+
+Ausführung:
+    python benchmarks/bench_controller_ops.py [max. Anzahl Tasks]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from controller import TaskController
+from model import Task
+from repository import InMemoryTaskRepository
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+OPERATIONS = 2_000
+
+
+def bench(n: int) -> dict:
+    """Gibt die mittlere Zeit pro Operation in Mikrosekunden zurück."""
+    ctrl = TaskController(repository=InMemoryTaskRepository())
+    ctrl.replace_all([Task(title=f"Task {i}", category="Bench") for i in range(n)])
+    sample = random.choices(list(ctrl.tasks), k=OPERATIONS)
+    ids = [t.id for t in sample]
+    by_id = {t.id: t for t in sample}
+
+    ops = {
+        "get_by_id": ctrl.get_by_id,
+        "toggle": ctrl.toggle,
+        "update": lambda task_id: ctrl.update(task_id, title="Geändert"),
+        "delete+add": lambda task_id: (ctrl.delete(task_id),
+                                       ctrl.add_task(by_id[task_id])),
+    }
+    results = {}
+    for name, op in ops.items():
+        start = time.perf_counter()
+        for task_id in ids:
+            op(task_id)
+        results[name] = (time.perf_counter() - start) / len(ids) * 1e6
+    return results
+
+
+def main():
+    limit = int(sys.argv[1]) if len(sys.argv) > 1 else SIZES[-1]
+    names = ["get_by_id", "toggle", "update", "delete+add"]
+    print(f"{'Tasks':>9}  " + "  ".join(f"{name:>13}" for name in names))
+    for n in [size for size in SIZES if size <= limit]:
+        results = bench(n)
+        print(f"{n:>9}  " + "  ".join(f"{results[name]:10.2f} µs" for name in names))
+
+
+if __name__ == "__main__":
+    main()
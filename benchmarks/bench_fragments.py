@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Skriptzeit pro Interaktion (headless mit Streamlit AppTest).
+Mit Fragmenten läuft nur der Körper des betroffenen Fragments (Zeile
+bzw. Task-Sektion). Gemessen werden ein ganzer Skriptlauf (AppTest führt
+immer das ganze Skript aus) und die Laufzeit des Fragment-Körpers, der
+die Interaktion behandelt.
+
+Ausführung:
+    python benchmarks/bench_fragments.py [Anzahl Tasks]
+"""
+import functools
+import os
+import sys
+import time
+
+os.environ.setdefault("STREAMLIT_LOGGER_LEVEL", "error")
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC)
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+DEFAULT_TASKS = 1_000
+REPEAT = 5
+
+# Laufzeit jedes Fragment-Körpers: (Funktionsname, Argumente, Sekunden)
+FRAGMENT_TIMES = []
+_fragment = st.fragment
+
+
+def timed_fragment(func=None, **kwargs):
+    """st.fragment, das zusätzlich die Laufzeit des Körpers aufzeichnet."""
+    if func is None:
+        return lambda f: timed_fragment(f, **kwargs)
+
+    @functools.wraps(func)
+    def timed(*args, **kw):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kw)
+        finally:
+            FRAGMENT_TIMES.append((func.__name__, args[1:], time.perf_counter() - start))
+    return _fragment(timed, **kwargs)
+
+
+st.fragment = timed_fragment  # vor dem Import von view
+
+
+def app(src: str, n: int):
+    import sys
+    sys.path.insert(0, src)
+    import streamlit as st
+    from controller import TaskController
+    from patterns import TaskMediator
+    from repository import InMemoryTaskRepository
+    from view import TodoView
+
+    if "mediator" not in st.session_state:
+        mediator = TaskMediator(TaskController(repository=InMemoryTaskRepository()))
+        mediator.add_many([f"Task {i}" for i in range(n)], category="Arbeit")
+        st.session_state.mediator = mediator
+    TodoView(st.session_state.mediator).render()
+
+
+def fragment_ms(name: str, args: tuple = None) -> float:
+    times = [t for f, a, t in FRAGMENT_TIMES if f == name and (args is None or a == args)]
+    return times[0] * 1000
+
+
+def measure(at: AppTest, interact, fragment: str, args_of=lambda: None):
+    """Mittel über REPEAT Interaktionen: (ganzer Skriptlauf, Fragment-Körper) in ms."""
+    script = body = 0.0
+    for _ in range(REPEAT):
+        args = args_of()
+        FRAGMENT_TIMES.clear()
+        interact()
+        start = time.perf_counter()
+        at.run()
+        script += time.perf_counter() - start
+        body += fragment_ms(fragment, args)
+        if at.exception:
+            raise RuntimeError(at.exception)
+    return script / REPEAT * 1000, body / REPEAT
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TASKS
+    at = AppTest.from_function(app, args=(SRC, n), default_timeout=600)
+    at.session_state.smart_sort = False  # feste Reihenfolge: die erste Zeile bleibt die erste
+    at.run()
+    first_box = lambda: next(box for box in at.checkbox if box.key.startswith("cb_"))
+    first = lambda: first_box().key[len("cb_"):].rsplit("_", 1)[0]  # cb_<id>_<version>
+
+    def toggle():
+        box = first_box()
+        box.set_value(not box.value)
+
+    def next_page():
+        at.session_state.page = 0
+        at.button(key="page_next").click()
+
+    print(f"{n} Tasks, je Interaktion")
+    print(f"{'Interaktion':>14}  {'Skriptlauf':>11}  {'Fragment':>10}")
+    for name, interact, fragment, args_of in [
+        ("Abhaken", toggle, "_task_row", lambda: (first(),)),
+        ("Blättern", next_page, "render_task_section", lambda: None),
+    ]:
+        script, body = measure(at, interact, fragment, args_of)
+        print(f"{name:>14}  {script:8.1f} ms  {body:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
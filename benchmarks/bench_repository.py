@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Latenz pro Änderung (toggle + save) je Repository.
+
+Ausführung:
+    python benchmarks/bench_repository.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from controller import TaskController
+from repository import JSONTaskRepository, JournalTaskRepository
+
+SIZES = [1_000, 10_000, 100_000]
+MUTATIONS = 20
+
+
+def bench(repo_factory, n: int) -> float:
+    """Gibt die mittlere Zeit pro toggle+save in Millisekunden zurück."""
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = repo_factory(os.path.join(tmp, "tasks.json"))
+        ctrl = TaskController(repository=repo)
+        for i in range(n):
+            ctrl.add(f"Task {i}", category="Bench")
+        ctrl.save()
+        ids = [t.id for t in ctrl.tasks[:MUTATIONS]]
+
+        start = time.perf_counter()
+        for task_id in ids:
+            ctrl.toggle(task_id)
+            ctrl.save()
+        elapsed = time.perf_counter() - start
+        if isinstance(repo, JournalTaskRepository):
+            repo.wait_for_compaction()
+        return elapsed / len(ids) * 1000
+
+
+def main():
+    repos = {
+        "JSONTaskRepository": JSONTaskRepository,
+        "JournalTaskRepository": JournalTaskRepository,
+    }
+    print(f"{'Tasks':>8}  " + "  ".join(f"{name:>22}" for name in repos))
+    for n in SIZES:
+        row = [f"{bench(factory, n):19.2f} ms" for factory in repos.values()]
+        print(f"{n:>8}  " + "  ".join(row))
+
+
+if __name__ == "__main__":
+    main()
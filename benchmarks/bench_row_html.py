@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: HTML der Task-Zeilen - jedes Mal neu zusammengesetzt gegen
+RenderCache pro (Task, Task-Version, Tag). Nach einer Änderung wird nur
+die geänderte Zeile neu gebaut.
+
+Ausführung:
+    python benchmarks/bench_row_html.py [Anzahl Zeilen]
+"""
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from controller import TaskController
+from patterns import TaskMediator
+from query import TaskQuery
+from repository import InMemoryTaskRepository
+from viewmodel import RenderCache, build_view_model, render_row_html
+
+DEFAULT_ROWS = 50
+REPEAT = 2000
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    today = date.today()
+    mediator = TaskMediator(TaskController(repository=InMemoryTaskRepository()))
+    for i in range(n):
+        mediator.add_task(f"Task {i}", category=("Arbeit", "Privat", "")[i % 3],
+                          due_date=today + timedelta(days=i % 10 - 3))
+    cache = RenderCache(4 * n)
+
+    def uncached(vm):
+        for row in vm.rows:
+            render_row_html(row)
+
+    def cached(vm):
+        for row in vm.rows:
+            cache.get_or_build((row.id, row.version, vm.today), lambda: render_row_html(row))
+
+    print(f"{n} Zeilen pro Rerun, {REPEAT} Reruns (je eine Änderung)")
+    for name, render in [("ohne Cache", uncached), ("RenderCache", cached)]:
+        vm = build_view_model(mediator, TaskQuery(), 0, n, today=today)
+        render(vm)
+        elapsed = 0.0
+        for i in range(REPEAT):
+            mediator.update_task(vm.rows[i % n].id, title=f"Task {i}")
+            vm = build_view_model(mediator, TaskQuery(), 0, n, today=today)
+            start = time.perf_counter()
+            render(vm)
+            elapsed += time.perf_counter() - start
+        print(f"{name:>12}: {elapsed / REPEAT * 1e6:8.1f} µs pro Rerun")
+    print(f"Cache: {cache.hits} Treffer, {cache.misses} neu gebaut, {len(cache)} Einträge")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Titelsuche über den invertierten Index gegen einen
+linearen Durchlauf über alle Titel.
+
+Ausführung:
+    python benchmarks/bench_search.py [Anzahl Tasks]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from controller import TaskController
+from indexes import matches_text
+from patterns import TaskFactory
+from repository import InMemoryTaskRepository
+
+DEFAULT_TASKS = 200_000
+REPEAT = 20
+WORDS = ["Bericht", "Übung", "Einkauf", "Straße", "Müll", "Arzttermin", "Präsentation",
+         "Steuererklärung", "Geburtstag", "Fahrrad", "Küche", "Rechnung", "Urlaub",
+         "Meeting", "Garten", "Wäsche", "Prüfung", "Vertrag", "Reparatur", "Bücher"]
+QUERIES = ["prufung", "re", "bericht vertrag", "strasse", "xyz"]
+
+
+def make_tasks(n: int):
+    rng = random.Random(0)
+    types = TaskFactory.get_available_types()
+    return [
+        TaskFactory.create(rng.choice(types),
+                           " ".join(rng.sample(WORDS, 3)) + f" {i}")
+        for i in range(n)
+    ]
+
+
+def timed(func, repeat: int = REPEAT) -> float:
+    """Mittlere Laufzeit in Millisekunden."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TASKS
+    tasks = make_tasks(n)
+    ctrl = TaskController(repository=InMemoryTaskRepository())
+    start = time.perf_counter()
+    ctrl.replace_all(tasks)
+    print(f"{n} Tasks, Indexaufbau (alle Indizes): {time.perf_counter() - start:.2f} s")
+
+    print(f"{'Suche':>18}  {'Treffer':>8}  {'Index':>11}  {'Durchlauf':>11}")
+    for text in QUERIES:
+        hits = len(ctrl.search(text))
+        indexed = timed(lambda: ctrl.search(text))
+        scan = timed(lambda: [t for t in ctrl.tasks if matches_text(text, t.title)], repeat=2)
+        print(f"{text!r:>18}  {hits:>8}  {indexed:8.2f} ms  {scan:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: N Sessions mit eigenem Controller gegen geteilten Store.
+Misst Startzeit aller Sessions und belegten Speicher (tracemalloc).
+
+Ausführung:
+    python benchmarks/bench_shared_store.py
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from controller import TaskController
+from model import Task
+from patterns import TaskMediator
+from repository import JSONTaskRepository
+from store import SharedTaskStore
+
+TASKS = 5_000
+SESSIONS = [1, 10, 50, 200]
+
+
+def per_session(filepath: str):
+    """Bisheriges Verfahren: jede Session lädt die Datei selbst."""
+    controller = TaskController(JSONTaskRepository(filepath))
+    controller.load()
+    return TaskMediator(controller)
+
+
+def shared(filepath: str):
+    return SharedTaskStore.for_path(filepath).session()
+
+
+def measure(create, filepath: str, n: int):
+    tracemalloc.start()
+    start = time.perf_counter()
+    sessions = [create(filepath) for _ in range(n)]
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del sessions
+    return elapsed * 1000, current / 1024 / 1024
+
+
+def main():
+    print(f"{TASKS} Tasks pro Datei")
+    print(f"{'Sessions':>8}  {'einzeln':>20}  {'geteilt':>20}")
+    for n in SESSIONS:
+        with tempfile.TemporaryDirectory() as tmp:
+            filepath = os.path.join(tmp, "tasks.json")
+            JSONTaskRepository(filepath).save([Task(title=f"Task {i}") for i in range(TASKS)])
+            own_ms, own_mb = measure(per_session, filepath, n)
+            shared_ms, shared_mb = measure(shared, filepath, n)
+        print(f"{n:>8}  {own_ms:8.0f}ms {own_mb:7.1f}MB  {shared_ms:8.0f}ms {shared_mb:7.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Ladezeit JSON gegen binären Snapshot.
+
+Ausführung:
+    python benchmarks/bench_snapshot.py
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from model import Task
+from repository import JSONTaskRepository
+
+SIZES = [1_000, 10_000, 100_000]
+ROUNDS = 5
+
+
+def measure(load) -> float:
+    """Beste Zeit aus ROUNDS Durchläufen in Millisekunden."""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        load()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    print(f"{'Tasks':>8}  {'JSON':>10}  {'Snapshot':>10}  {'Faktor':>7}")
+    for n in SIZES:
+        tasks = [
+            Task(title=f"Task {i}", category=f"Kategorie {i % 7}",
+                 due_date=date.today() + timedelta(days=i % 30) if i % 3 else None,
+                 done=i % 4 == 0)
+            for i in range(n)
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            filepath = os.path.join(tmp, "tasks.json")
+            JSONTaskRepository(filepath).save(tasks)
+            snap_repo = JSONTaskRepository(filepath, use_snapshot=True)
+            snap_repo.load()  # Snapshot erzeugen
+            json_ms = measure(JSONTaskRepository(filepath).load)
+            snap_ms = measure(snap_repo.load)
+        print(f"{n:>8}  {json_ms:8.1f}ms  {snap_ms:8.1f}ms  {json_ms / snap_ms:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
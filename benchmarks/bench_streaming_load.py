@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: load() gegen iter_load() bei großen Task-Dateien.
+Misst Peak-RSS (je Modus in eigenem Prozess), Zeit bis zum ersten
+Task und Gesamtzeit.
+
+Ausführung:
+    python benchmarks/bench_streaming_load.py [Anzahl Tasks]
+"""
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from model import Task
+from repository import JSONTaskRepository
+
+DEFAULT_TASKS = 500_000
+
+
+def run_mode(mode: str, filepath: str) -> None:
+    """Wird im Kindprozess ausgeführt und gibt die Messwerte aus."""
+    repo = JSONTaskRepository(filepath)
+    start = time.perf_counter()
+    if mode == "load":
+        tasks = repo.load()
+        first = time.perf_counter()
+    else:
+        tasks = []
+        stream = repo.iter_load()
+        tasks.append(next(stream))
+        first = time.perf_counter()
+        tasks.extend(stream)
+    total = time.perf_counter() - start
+    # ru_maxrss ist unter Linux in KiB angegeben
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode:>10}  {len(tasks):>9}  {peak_mb:8.1f} MB  "
+          f"{(first - start) * 1000:9.1f} ms  {total * 1000:9.1f} ms")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TASKS
+    with tempfile.TemporaryDirectory() as tmp:
+        filepath = os.path.join(tmp, "tasks.json")
+        JSONTaskRepository(filepath).save(
+            [Task(title=f"Task {i}", category="Bench") for i in range(n)]
+        )
+        size_mb = os.path.getsize(filepath) / 1024 / 1024
+        print(f"Datei: {n} Tasks, {size_mb:.1f} MB")
+        print(f"{'Modus':>10}  {'Tasks':>9}  {'Peak-RSS':>11}  {'1. Task':>12}  {'Gesamt':>12}")
+        for mode in ("load", "iter_load"):
+            subprocess.run([sys.executable, __file__, "--mode", mode, filepath], check=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--mode":
+        run_mode(sys.argv[2], sys.argv[3])
+    else:
+        main()
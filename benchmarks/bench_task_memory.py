@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Speicher pro Task - bisherige @dataclass (mit __dict__,
+ISO-String für created_at, eigene Kategorie-Kopie je Task) gegen den
+Task mit __slots__, internierter Kategorie und created_at in µs.
+Die Tasks entstehen wie beim Laden über from_dict aus JSON-Daten.
+
+Ausführung:
+    python benchmarks/bench_task_memory.py [Anzahl Tasks]
+"""
+import gc
+import os
+import random
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Optional
+from uuid import uuid4
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from model import Task
+
+DEFAULT_TASKS = 1_000_000
+CATEGORIES = ["", "Arbeit", "Privat", "Sport", "Einkauf"]
+
+
+@dataclass
+class DataclassTask:
+    """Bisheriges Modell als Vergleich."""
+    title: str
+    done: bool = False
+    category: str = ""
+    due_date: Optional[date] = None
+    id: str = field(default_factory=lambda: str(uuid4())[:8])
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    @staticmethod
+    def from_dict(data: dict) -> "DataclassTask":
+        return DataclassTask(
+            id=data["id"],
+            title=data["title"],
+            done=data["done"],
+            category=data.get("category", ""),
+            due_date=date.fromisoformat(data["due_date"]) if data.get("due_date") else None,
+            created_at=data.get("created_at", datetime.now().isoformat())
+        )
+
+
+def make_dicts(n: int):
+    """JSON-Daten wie nach json.loads: jeder String ist ein eigenes Objekt."""
+    rng = random.Random(0)
+    start = datetime(2024, 1, 1)
+    today = date.today()
+    for i in range(n):
+        due = today + timedelta(days=rng.randint(-30, 60)) if rng.random() < 0.6 else None
+        yield {
+            "id": "%08x" % rng.getrandbits(32),
+            "title": f"Task {i}",
+            "done": rng.random() < 0.3,
+            "category": "".join(rng.choice(CATEGORIES)),
+            "due_date": due.isoformat() if due else None,
+            "created_at": (start + timedelta(seconds=i, microseconds=rng.randint(0, 999_999))).isoformat(),
+        }
+
+
+def bytes_per_task(cls, n: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    tasks = [cls.from_dict(data) for data in make_dicts(n)]
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del tasks
+    return size / n
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TASKS
+    print(f"{n} Tasks")
+    before = bytes_per_task(DataclassTask, n)
+    after = bytes_per_task(Task, n)
+    print(f"{'Modell':>22}  {'Bytes/Task':>10}")
+    print(f"{'@dataclass':>22}  {before:10.0f}")
+    print(f"{'__slots__ + intern':>22}  {after:10.0f}")
+    print(f"Ersparnis: {(1 - after / before) * 100:.0f} %")
+
+
+if __name__ == "__main__":
+    main()
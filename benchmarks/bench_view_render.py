@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Zeit pro Rerun der Task-Liste (headless mit Streamlit AppTest)
+- alle Treffer auf einmal gegen seitenweise Darstellung (PAGE_SIZE).
+
+Ausführung:
+    python benchmarks/bench_view_render.py [Anzahl Tasks ...]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("STREAMLIT_LOGGER_LEVEL", "error")
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC)
+
+from streamlit.testing.v1 import AppTest
+from view import PAGE_SIZE
+
+DEFAULT_SIZES = [1_000, 10_000]
+REPEAT = 3
+
+
+def app(src: str, n: int, page_size: int):
+    import sys
+    sys.path.insert(0, src)
+    import streamlit as st
+    from controller import TaskController
+    from patterns import TaskMediator
+    from repository import InMemoryTaskRepository
+    from view import TodoView
+
+    if "mediator" not in st.session_state:
+        ctrl = TaskController(repository=InMemoryTaskRepository())
+        mediator = TaskMediator(ctrl)
+        mediator.add_many([f"Task {i}" for i in range(n)], category="Arbeit")
+        st.session_state.mediator = mediator
+    TodoView(st.session_state.mediator, page_size=page_size).render()
+
+
+def rerun_ms(n: int, page_size: int) -> float:
+    at = AppTest.from_function(app, args=(SRC, n, page_size), default_timeout=600)
+    at.run()  # Aufbau der Tasks nicht mitmessen
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        at.run()
+    if at.exception:
+        raise RuntimeError(at.exception)
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    print(f"{'Tasks':>8}  {'alle Zeilen':>12}  {f'Seite ({PAGE_SIZE})':>12}")
+    for n in sizes:
+        full = rerun_ms(n, n)
+        paged = rerun_ms(n, PAGE_SIZE)
+        print(f"{n:>8}  {full:9.0f} ms  {paged:9.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+#Async-API: Asynchrones Gegenstück zu Repository und Mediator.
+#Datei-I/O läuft in einem Executor, sodass ein asyncio-Frontend viele
+#Clients bedienen kann, ohne pro Anfrage einen Thread zu blockieren.
+
+import asyncio
+import functools
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+from datetime import date
+from typing import List, Optional, TYPE_CHECKING
+from model import Task
+from query import TaskQuery
+from repository import TaskRepositoryInterface, TaskChangeSet, TaskChangeSetInterface
+from patterns import TaskFactory, TaskAdapter, ExternalTaskFormat
+
+if TYPE_CHECKING:
+    from controller import TaskController
+
+
+class AsyncTaskRepositoryInterface(ABC):
+    """Abstrakte Schnittstelle für asynchrone Task-Repositories."""
+
+    @abstractmethod
+    async def save(self, tasks: List[Task]) -> None:
+        """Speichert alle Tasks."""
+        pass
+
+    @abstractmethod
+    async def load(self) -> List[Task]:
+        """Lädt alle Tasks."""
+        pass
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Löscht alle Tasks."""
+        pass
+
+    @property
+    def supports_changes(self) -> bool:
+        """Prüft ob das Repository Teil-Speicherung unterstützt."""
+        return False
+
+    async def save_changes(self, changes: TaskChangeSet) -> None:
+        """Schreibt nur die Änderungen."""
+        raise TypeError("Repository unterstützt keine Teil-Speicherung")
+
+
+class AsyncTaskRepository(AsyncTaskRepositoryInterface):
+    """
+    Adapter: macht ein synchrones Repository asynchron nutzbar.
+    Jeder Aufruf läuft im Executor (Standard: Thread-Pool des Loops).
+
+    Verwendung:
+        repo = AsyncTaskRepository(JSONTaskRepository("tasks.json"))
+        tasks = await repo.load()
+    """
+
+    def __init__(self, repository: TaskRepositoryInterface,
+                 executor: Optional[Executor] = None):
+        self.repository = repository
+        self.executor = executor
+
+    @property
+    def supports_changes(self) -> bool:
+        return isinstance(self.repository, TaskChangeSetInterface)
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args))
+
+    async def save(self, tasks: List[Task]) -> None:
+        await self._run(self.repository.save, list(tasks))
+
+    async def load(self) -> List[Task]:
+        return await self._run(self.repository.load)
+
+    async def clear(self) -> None:
+        await self._run(self.repository.clear)
+
+    async def save_changes(self, changes: TaskChangeSet) -> None:
+        if not self.supports_changes:
+            await super().save_changes(changes)
+        await self._run(self.repository.save_changes, changes)
+
+
+class AsyncTaskMediator:
+    """
+    Asynchroner Mediator: gleiche Operationen wie TaskMediator, aber
+    Speichern wird abgewartet statt blockierend ausgeführt.
+    Speichervorgänge werden über einen asyncio.Lock serialisiert.
+
+    Verwendung:
+        mediator = AsyncTaskMediator(controller)
+        await mediator.load()
+        task = await mediator.add_task("Neue Aufgabe")
+    """
+
+    def __init__(self, controller: "TaskController",
+                 repository: Optional[AsyncTaskRepositoryInterface] = None):
+        self.controller = controller
+        self.repository = repository or AsyncTaskRepository(controller.repository)
+        self._listeners: List[callable] = []
+        self._save_lock: Optional[asyncio.Lock] = None
+
+    def add_listener(self, callback: callable) -> None:
+        """Registriert einen Listener für Änderungen."""
+        self._listeners.append(callback)
+
+    def _notify(self, event: str) -> None:
+        for listener in self._listeners:
+            listener(event)
+
+    # Persistenz
+
+    async def load(self) -> None:
+        """Lädt alle Tasks asynchron in den Controller."""
+        self.controller.replace_all(await self.repository.load())
+
+    async def save(self) -> None:
+        """Speichert Änderungen (bzw. alle Tasks) asynchron."""
+        if self._save_lock is None:
+            self._save_lock = asyncio.Lock()
+        async with self._save_lock:
+            changes = self.controller.take_changes()
+            tasks = list(self.controller.tasks)
+            try:
+                if self.repository.supports_changes:
+                    if changes:
+                        await self.repository.save_changes(changes)
+                else:
+                    await self.repository.save(tasks)
+            except Exception:
+                self.controller.restore_changes(changes)
+                raise
+
+    # Task-Operationen
+
+    async def add_task(self, title: str, category: str = "",
+                       due_date: Optional[date] = None) -> Optional[Task]:
+        """Fügt einen Task hinzu und benachrichtigt Listener."""
+        try:
+            task = self.controller.add(title, category, due_date)
+        except ValueError:
+            return None
+        await self.save()
+        self._notify("task_added")
+        return task
+
+    async def delete_task(self, task_id: str) -> bool:
+        """Löscht einen Task und benachrichtigt Listener."""
+        result = self.controller.delete(task_id)
+        if result:
+            await self.save()
+            self._notify("task_deleted")
+        return result
+
+    async def toggle_task(self, task_id: str) -> bool:
+        """Wechselt Task-Status und benachrichtigt Listener."""
+        result = self.controller.toggle(task_id)
+        if result:
+            await self.save()
+            self._notify("task_toggled")
+        return result
+
+    async def update_task(self, task_id: str, title: str = None,
+                          category: str = None, due_date: Optional[date] = None) -> bool:
+        """Aktualisiert einen Task und benachrichtigt Listener."""
+        try:
+            result = self.controller.update(task_id, title, category, due_date)
+        except ValueError:
+            return False
+        if result:
+            await self.save()
+            self._notify("task_updated")
+        return result
+
+    async def add_typed_task(self, task_type: str, title: str, **kwargs) -> Task:
+        """Erstellt einen Task über die Factory und fügt ihn hinzu."""
+        task = self.controller.add_task(TaskFactory.create(task_type, title, **kwargs))
+        await self.save()
+        self._notify("task_added")
+        return task
+
+    async def import_external_tasks(self, externals: List[ExternalTaskFormat]) -> int:
+        """Importiert externe Tasks über den Adapter."""
+        tasks = TaskAdapter.adapt_many(externals)
+        for task in tasks:
+            self.controller.add_task(task)
+        await self.save()
+        self._notify("tasks_imported")
+        return len(tasks)
+
+    async def import_tasks(self, tasks: List[Task]) -> int:
+        """Übernimmt Tasks (z.B. aus einem Export); gleiche ID ersetzt den vorhandenen Task."""
+        return await self._bulk("tasks_imported", lambda t: len(self.controller.add_many(t)), tasks)
+
+    # Sammeloperationen (ein Speichern, eine Benachrichtigung)
+
+    async def add_many(self, titles: List[str], category: str = "",
+                       due_date: Optional[date] = None) -> List[Task]:
+        """Fügt mehrere Tasks hinzu; leere Titel werden übersprungen."""
+        tasks = [Task(title=t.strip(), category=category, due_date=due_date)
+                 for t in titles if t and t.strip()]
+        if tasks:
+            self.controller.add_many(tasks)
+            await self.save()
+            self._notify("tasks_added")
+        return tasks
+
+    async def delete_many(self, task_ids: List[str]) -> int:
+        return await self._bulk("tasks_deleted", self.controller.delete_many, task_ids)
+
+    async def toggle_many(self, task_ids: List[str]) -> int:
+        return await self._bulk("tasks_toggled", self.controller.toggle_many, task_ids)
+
+    async def set_done_many(self, task_ids: List[str], done: bool = True) -> int:
+        return await self._bulk("tasks_toggled", self.controller.set_done_many, task_ids, done)
+
+    async def update_many(self, task_ids: List[str], title: str = None,
+                          category: str = None, due_date: Optional[date] = None) -> int:
+        try:
+            return await self._bulk("tasks_updated", self.controller.update_many,
+                                    task_ids, title, category, due_date)
+        except ValueError:
+            return 0
+
+    async def _bulk(self, event: str, operation, *args) -> int:
+        count = operation(*args)
+        if count:
+            await self.save()
+            self._notify(event)
+        return count
+
+    # Abfragen (im Speicher, kein I/O)
+
+    async def get_all_tasks(self) -> List[Task]:
+        return self.controller.get_all()
+
+    async def get_open_tasks(self) -> List[Task]:
+        return self.controller.get_open()
+
+    async def get_done_tasks(self) -> List[Task]:
+        return self.controller.get_done()
+
+    async def get_task_by_id(self, task_id: str) -> Optional[Task]:
+        return self.controller.get_by_id(task_id)
+
+    async def get_categories(self) -> List[str]:
+        return self.controller.get_categories()
+
+    async def get_by_category(self, category: str) -> List[Task]:
+        return self.controller.get_by_category(category)
+
+    async def get_overdue_tasks(self) -> List[Task]:
+        return self.controller.get_overdue()
+
+    async def get_upcoming_tasks(self, days: int = 7) -> List[Task]:
+        return self.controller.get_upcoming(days)
+
+    async def search_tasks(self, text: str) -> List[Task]:
+        return self.controller.search(text)
+
+    async def query_tasks(self, query: TaskQuery) -> List[Task]:
+        return self.controller.query(query)
+
+    async def count_tasks(self, query: TaskQuery) -> int:
+        return self.controller.count(query)
+
+    async def get_statistics(self) -> dict:
+        return self.controller.get_statistics()
+
+    async def get_version(self) -> int:
+        return self.controller.version
+
+    async def get_task_version(self, task_id: str) -> int:
+        return self.controller.task_version(task_id)
@@ -0,0 +1,206 @@
+#CLI: Kommandozeile für die TODO-App ohne Streamlit (für Cronjobs und
+#Skripte). Arbeitet über TaskMediator/TaskController auf derselben Datei
+#wie die App. Controller, Repository & Co. werden erst im Unterbefehl
+#importiert, damit der Start schnell bleibt; streamlit wird nie importiert.
+#Eine laufende App lädt die Datei nach einer Änderung von außen neu; ihre noch
+#nicht geschriebenen Änderungen (Write-Behind) wendet sie danach erneut an.
+#
+#Verwendung (im Projektverzeichnis, siehe todo.py):
+#   python -m todo list --status open
+#   python -m todo add "Steuererklärung" --category Privat --due 2026-05-31
+#   python -m todo done 8d09217e
+#   python -m todo export backup.json
+
+import argparse
+import os
+import sys
+from datetime import date
+from typing import List, Optional
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            "data", "tasks.json")
+
+
+def _due_date(text: str) -> date:
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Ungültiges Datum (JJJJ-MM-TT erwartet): {text}")
+
+
+def _non_negative(text: str) -> int:
+    try:
+        value = int(text)
+    except ValueError:
+        value = -1
+    if value < 0:
+        raise argparse.ArgumentTypeError(f"Keine Zahl >= 0: {text}")
+    return value
+
+
+def _open(path: str):
+    """Lädt die Tasks und gibt einen Mediator darauf zurück (speichert synchron)."""
+    from controller import TaskController
+    from patterns import TaskMediator
+    from repository import JSONTaskRepository
+
+    controller = TaskController(repository=JSONTaskRepository(path, use_snapshot=True))
+    controller.load()
+    return TaskMediator(controller)
+
+
+def _format_task(task) -> str:
+    meta = [m for m in (task.category, task.due_date and f"fällig {task.due_date}") if m]
+    line = f"{task.id}  [{'x' if task.done else ' '}] {task.title}"
+    return f"{line}  ({', '.join(meta)})" if meta else line
+
+
+def _print_json(data) -> None:
+    import json
+    json.dump(data, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+
+
+# Unterbefehle (geben den Exit-Code zurück)
+
+def cmd_list(args) -> int:
+    from query import TaskQuery
+
+    query = TaskQuery(
+        status=None if args.status == "all" else args.status,
+        category=args.category,
+        text=args.search or "",
+        sort=args.sort,
+        limit=args.limit,
+    )
+    tasks = _open(args.data).query_tasks(query)
+    if args.json:
+        _print_json([task.to_dict() for task in tasks])
+    else:
+        for task in tasks:
+            print(_format_task(task))
+    return 0
+
+
+def cmd_add(args) -> int:
+    task = _open(args.data).add_task(args.title, args.category, args.due)
+    if task is None:
+        print("Fehler: Titel darf nicht leer sein", file=sys.stderr)
+        return 1
+    print(task.id)
+    return 0
+
+
+def _missing(mediator, task_ids: List[str]) -> List[str]:
+    return [task_id for task_id in task_ids if mediator.get_task_by_id(task_id) is None]
+
+
+def cmd_done(args) -> int:
+    mediator = _open(args.data)
+    missing = _missing(mediator, args.ids)
+    mediator.set_done_many(args.ids, not args.undo)
+    for task_id in missing:
+        print(f"Fehler: Task {task_id} nicht gefunden", file=sys.stderr)
+    return 1 if missing else 0
+
+
+def cmd_delete(args) -> int:
+    mediator = _open(args.data)
+    missing = _missing(mediator, args.ids)
+    mediator.delete_many(args.ids)
+    for task_id in missing:
+        print(f"Fehler: Task {task_id} nicht gefunden", file=sys.stderr)
+    return 1 if missing else 0
+
+
+def cmd_import(args) -> int:
+    import json
+    from codec import decode_tasks
+
+    try:
+        if args.file == "-":
+            records = json.load(sys.stdin)
+        else:
+            with open(args.file, "r", encoding="utf-8") as f:
+                records = json.load(f)
+        # Parst alle Felder, auch due_date: ungültige Daten scheitern hier, nicht beim Übernehmen
+        tasks = decode_tasks(records)
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        print(f"Fehler: {args.file} ist kein gültiger Export ({e})", file=sys.stderr)
+        return 1
+    count = _open(args.data).import_tasks(tasks)
+    print(f"{count} Tasks importiert")
+    return 0
+
+
+def cmd_export(args) -> int:
+    from codec import TaskCodec
+
+    text = TaskCodec().encode(_open(args.data).get_all_tasks())
+    if args.file == "-":
+        sys.stdout.write(text + "\n")
+    else:
+        with open(args.file, "w", encoding="utf-8") as f:
+            f.write(text)
+    return 0
+
+
+def cmd_stats(args) -> int:
+    stats = _open(args.data).get_statistics()
+    if args.json:
+        _print_json(stats)
+        return 0
+    for label, key in (("Gesamt", "total"), ("Offen", "open"), ("Erledigt", "done"),
+                       ("Überfällig", "overdue"), ("Heute fällig", "due_today")):
+        print(f"{label + ':':<14}{stats[key]}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="todo", description="TODO-App ohne Oberfläche")
+    parser.add_argument("--data", default=DEFAULT_PATH,
+                        help="JSON-Datei der Tasks (Standard: data/tasks.json)")
+    commands = parser.add_subparsers(dest="command", metavar="BEFEHL")
+    commands.required = True
+
+    p = commands.add_parser("list", help="Tasks anzeigen")
+    p.add_argument("--status", choices=("open", "done", "all"), default="all")
+    p.add_argument("--category")
+    p.add_argument("--search", help="Wortanfänge im Titel")
+    p.add_argument("--sort", choices=("insertion", "smart", "due", "title"), default="insertion")
+    p.add_argument("--limit", type=_non_negative)
+    p.add_argument("--json", action="store_true", help="als JSON ausgeben")
+    p.set_defaults(func=cmd_list)
+
+    p = commands.add_parser("add", help="Task anlegen (gibt die ID aus)")
+    p.add_argument("title")
+    p.add_argument("--category", default="")
+    p.add_argument("--due", type=_due_date, help="Fälligkeit JJJJ-MM-TT")
+    p.set_defaults(func=cmd_add)
+
+    p = commands.add_parser("done", help="Tasks als erledigt markieren")
+    p.add_argument("ids", nargs="+", metavar="ID")
+    p.add_argument("--undo", action="store_true", help="wieder als offen markieren")
+    p.set_defaults(func=cmd_done)
+
+    p = commands.add_parser("delete", help="Tasks löschen")
+    p.add_argument("ids", nargs="+", metavar="ID")
+    p.set_defaults(func=cmd_delete)
+
+    p = commands.add_parser("import", help="Tasks aus einem Export übernehmen (gleiche ID ersetzt)")
+    p.add_argument("file", help="JSON-Datei oder - für stdin")
+    p.set_defaults(func=cmd_import)
+
+    p = commands.add_parser("export", help="alle Tasks als JSON schreiben")
+    p.add_argument("file", nargs="?", default="-", help="Zieldatei (Standard: stdout)")
+    p.set_defaults(func=cmd_export)
+
+    p = commands.add_parser("stats", help="Statistik anzeigen")
+    p.add_argument("--json", action="store_true", help="als JSON ausgeben")
+    p.set_defaults(func=cmd_stats)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
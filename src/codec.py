@@ -0,0 +1,119 @@
+#Codec: Schnelles Kodieren und Dekodieren ganzer Task-Listen im JSON-Format
+#der Repositories. Beim Kodieren wird der fertige JSON-Text jedes Tasks
+#zwischengespeichert und beim nächsten Speichern wiederverwendet, solange
+#sich der Task nicht geändert hat.
+#
+#Die Ausgabe ist Byte für Byte identisch mit
+#json.dump([t.to_dict() for t in tasks], f, ensure_ascii=False, indent=2).
+
+import json
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Tuple
+from model import Task
+
+_encode_string = json.encoder.encode_basestring  # wie json.dumps(s, ensure_ascii=False)
+
+
+def _encode_value(value) -> str:
+    """Wie json.dump mit indent=2 für einen Wert auf Ebene 2 (z.B. "category": null)."""
+    if type(value) is str:
+        return _encode_string(value)
+    return json.dumps(value, ensure_ascii=False, indent=2).replace("\n", "\n    ")
+
+_RECORD = ('  {\n'
+           '    "id": %s,\n'
+           '    "title": %s,\n'
+           '    "done": %s,\n'
+           '    "category": %s,\n'
+           '    "due_date": %s,\n'
+           '    "created_at": %s\n'
+           '  }')
+
+
+def encode_task(task: Task) -> str:
+    """JSON-Text eines Tasks als Element eines mit indent=2 formatierten Arrays."""
+    due = task.due_date
+    done = task.done
+    return _RECORD % (
+        _encode_value(task.id),
+        _encode_value(task.title),
+        "true" if done is True else "false" if done is False else _encode_value(done),
+        _encode_value(task.category),
+        "null" if due is None else _encode_string(due.isoformat()),
+        _encode_value(task.created_at),
+    )
+
+
+def join_records(fragments: List[str]) -> str:
+    """Setzt kodierte Tasks zum JSON-Array zusammen."""
+    if not fragments:
+        return "[]"
+    return "[\n" + ",\n".join(fragments) + "\n]"
+
+
+def decode_tasks(records: Iterable[dict]) -> List[Task]:
+    """
+    Erstellt Tasks aus to_dict()-Records (wie Task.from_dict, ohne
+    Umwege pro Record).
+
+    Raises:
+        KeyError: Wenn ein Pflichtfeld (id, title, done) fehlt
+        ValueError: Wenn ein due_date kein ISO-Datum ist
+    """
+    restore = Task._restore
+    parse_date = date.fromisoformat
+    tasks = []
+    append = tasks.append
+    now = None
+    for record in records:
+        created = record.get("created_at")
+        if created is None:
+            now = now or datetime.now().isoformat()
+            created = now
+        due = record.get("due_date")
+        task = restore(record["title"], record["done"], record.get("category", ""),
+                       parse_date(due) if due else None, record["id"], 0)
+        task.created_at = created
+        append(task)
+    return tasks
+
+
+class TaskCodec:
+    """
+    Kodiert Task-Listen mit Cache pro Task.
+    Ein Eintrag gilt, solange die gespeicherten Felder des Tasks
+    unverändert sind; Tasks, die beim letzten encode() fehlten,
+    fallen aus dem Cache.
+    """
+
+    def __init__(self):
+        self._cache: Dict[str, Tuple[tuple, str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def encode(self, tasks: Iterable[Task]) -> str:
+        """Gibt den JSON-Text für tasks zurück."""
+        cache = self._cache
+        fragments = []
+        append = fragments.append
+        ids = []
+        misses = 0
+        for task in tasks:
+            task_id = task.id
+            fields = (task.title, task.done, task._category, task.due_date, task_id, task._created)
+            entry = cache.get(task_id)
+            if entry is None or entry[0] != fields:
+                entry = cache[task_id] = (fields, encode_task(task))
+                misses += 1
+            append(entry[1])
+            ids.append(task_id)
+        if len(cache) > len(ids):
+            # Gelöschte Tasks verwerfen
+            self._cache = {task_id: cache[task_id] for task_id in ids}
+        self.hits += len(fragments) - misses
+        self.misses += misses
+        return join_records(fragments)
+
+    def clear(self) -> None:
+        """Verwirft alle zwischengespeicherten Records."""
+        self._cache = {}
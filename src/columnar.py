@@ -0,0 +1,336 @@
+#Columnar: Spaltenorientierter Task-Bestand für sehr große Datenmengen.
+#Statt eines Task-Objekts pro Zeile liegen Status, Fälligkeit, Erstellzeit
+#und Kategorie in kompakten Spalten; Task-Objekte entstehen erst für die
+#Zeilen, die eine Abfrage tatsächlich zurückgibt (bei find_query() nur
+#für die angefragte Seite: Filter, Sortierung und limit/offset laufen
+#über Zeilennummern).
+#
+#Verwendung (Abfragen laufen über den Pushdown-Controller):
+#   repo = ColumnarTaskRepository(JournalTaskRepository("data/tasks.json"))
+#   controller = PushdownTaskController(repo)
+
+import heapq
+from array import array
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional
+from indexes import matches_text
+from model import Task
+from query import TaskQuery, STATUS_DONE, SORT_SMART, SORT_DUE, SORT_TITLE
+from repository import (
+    TaskRepositoryInterface,
+    TaskQueryInterface,
+    TaskChangeSet,
+    TaskChangeSetInterface,
+)
+
+try:
+    import numpy as np
+except ImportError:  # Optional: ohne NumPy zählen Python-Schleifen über die Spalten
+    np = None
+
+
+class ColumnarTaskRepository(TaskRepositoryInterface, TaskQueryInterface):
+    """
+    Hält alle Tasks spaltenweise im Speicher und schreibt Änderungen an
+    ein Quell-Repository durch (bei TaskChangeSetInterface nur die
+    Änderungen, sonst den ganzen Bestand).
+
+    Spalten (Zeile = Einfügereihenfolge, gelöschte Zeilen als Lücke):
+        done      bytearray   1 = erledigt
+        due       array("i")  Ordinalzahl der Fälligkeit, 0 = keine
+        created   array("q")  µs seit 1970 (sonst Originalstring in _raw_created)
+        category  array("I")  Index in die Kategorie-Tabelle
+        titles    Stringliste
+    Mit NumPy werden Zählungen und Masken vektorisiert.
+    """
+
+    def __init__(self, source: TaskRepositoryInterface):
+        self.source = source
+        self._reset()
+        self._append_all(source.iter_load())
+
+    def _reset(self) -> None:
+        self._ids: List[Optional[str]] = []
+        self._row: Dict[str, int] = {}
+        self._alive = bytearray()
+        self._done = bytearray()
+        self._due = array("i")
+        self._created = array("q")
+        self._category = array("I")
+        self._titles: List[str] = []
+        self._raw_created: Dict[int, str] = {}
+        self._categories: List[str] = []
+        self._category_code: Dict[str, int] = {}
+
+    # Zeilen schreiben und lesen
+
+    def _code(self, category: str) -> int:
+        code = self._category_code.get(category)
+        if code is None:
+            code = self._category_code[category] = len(self._categories)
+            self._categories.append(category)
+        return code
+
+    def _append_all(self, tasks: Iterable[Task]) -> None:
+        for task in tasks:
+            row = self._row.get(task.id)
+            if row is None:
+                row = self._row[task.id] = len(self._ids)
+                self._ids.append(task.id)
+                self._alive.append(1)
+                self._done.append(0)
+                self._due.append(0)
+                self._created.append(0)
+                self._category.append(0)
+                self._titles.append("")
+            self._write_row(row, task)
+
+    def _write_row(self, row: int, task: Task) -> None:
+        self._done[row] = 1 if task.done else 0
+        self._due[row] = task.due_date.toordinal() if task.due_date else 0
+        self._category[row] = self._code(task.category)
+        self._titles[row] = task.title
+        created = task.created_micros
+        if created is None:
+            self._raw_created[row] = task.created_at
+            created = 0
+        else:
+            self._raw_created.pop(row, None)
+        self._created[row] = created
+
+    def _remove_row(self, row: int) -> None:
+        del self._row[self._ids[row]]
+        self._ids[row] = None
+        self._titles[row] = ""
+        self._raw_created.pop(row, None)
+        # Gelöschte Zeilen zählen weder als erledigt noch als fällig
+        self._alive[row] = self._done[row] = 0
+        self._due[row] = 0
+        if len(self._row) * 2 < len(self._ids):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Entfernt Lücken gelöschter Zeilen."""
+        tasks = self._tasks(self._alive_rows())
+        self._reset()
+        self._append_all(tasks)
+
+    def _task(self, row: int) -> Task:
+        """Erzeugt das Task-Objekt für eine Zeile (nur bei Bedarf)."""
+        due = self._due[row]
+        raw = self._raw_created.get(row)
+        return Task._restore(
+            self._titles[row],
+            self._done[row] == 1,
+            self._categories[self._category[row]],
+            date.fromordinal(due) if due else None,
+            self._ids[row],
+            raw if raw is not None else self._created[row],
+        )
+
+    def _tasks(self, rows: Iterable[int]) -> List[Task]:
+        return [self._task(row) for row in rows]
+
+    # Masken (vektorisiert mit NumPy, sonst zeilenweise)
+
+    def _alive_rows(self) -> List[int]:
+        if np is not None:
+            return np.flatnonzero(np.frombuffer(self._alive, np.uint8)).tolist()
+        return [row for row, alive in enumerate(self._alive) if alive]
+
+    def _status_rows(self, done: bool) -> List[int]:
+        if np is not None:
+            mask = np.frombuffer(self._alive, np.uint8) & (np.frombuffer(self._done, np.uint8) == done)
+            return np.flatnonzero(mask).tolist()
+        flag = 1 if done else 0
+        return [row for row, (alive, d) in enumerate(zip(self._alive, self._done))
+                if alive and d == flag]
+
+    def _due_rows(self, start: int, end: int, open_only: bool) -> List[int]:
+        """Zeilen mit start <= Fälligkeit < end (Ordinalzahlen), nach Fälligkeit sortiert."""
+        if np is not None:
+            due = np.frombuffer(self._due, np.int32)
+            mask = (due >= max(start, 1)) & (due < end)
+            if open_only:
+                mask &= np.frombuffer(self._done, np.uint8) == 0
+            rows = np.flatnonzero(mask)
+            return rows[np.argsort(due[rows], kind="stable")].tolist()
+        start = max(start, 1)
+        rows = [row for row, (d, done) in enumerate(zip(self._due, self._done))
+                if start <= d < end and not (open_only and done)]
+        due = self._due
+        return sorted(rows, key=lambda row: due[row])
+
+    # TaskRepositoryInterface
+
+    def save(self, tasks: List[Task]) -> None:
+        self._reset()
+        self._append_all(tasks)
+        self.source.save(tasks)
+
+    def load(self) -> List[Task]:
+        return self._tasks(self._alive_rows())
+
+    def clear(self) -> None:
+        self._reset()
+        self.source.clear()
+
+    def _persist(self, changes: TaskChangeSet) -> None:
+        if isinstance(self.source, TaskChangeSetInterface):
+            self.source.save_changes(changes)
+        else:
+            self.source.save(self.load())
+
+    # TaskQueryInterface
+
+    def find_by_id(self, task_id: str) -> Optional[Task]:
+        row = self._row.get(task_id)
+        return self._task(row) if row is not None else None
+
+    def find_open(self) -> List[Task]:
+        return self._tasks(self._status_rows(False))
+
+    def find_done(self) -> List[Task]:
+        return self._tasks(self._status_rows(True))
+
+    def find_by_category(self, category: str) -> List[Task]:
+        code = self._category_code.get(category)
+        if code is None:
+            return []
+        if np is not None:
+            mask = (np.frombuffer(self._category, np.uint32) == code) \
+                & np.frombuffer(self._alive, np.uint8).astype(bool)
+            return self._tasks(np.flatnonzero(mask).tolist())
+        return self._tasks(row for row, (c, alive) in enumerate(zip(self._category, self._alive))
+                           if c == code and alive)
+
+    def find_categories(self) -> List[str]:
+        return sorted(c for c, n in self.count_by_category().items() if c)
+
+    def find_overdue(self, today: date) -> List[Task]:
+        return self._tasks(self._due_rows(0, today.toordinal(), open_only=True))
+
+    def find_due_today(self, today: date) -> List[Task]:
+        ordinal = today.toordinal()
+        return self._tasks(self._due_rows(ordinal, ordinal + 1, open_only=False))
+
+    def find_due_between(self, start: Optional[date], end: Optional[date]) -> List[Task]:
+        return self._tasks(self._due_rows(
+            start.toordinal() if start else 0,
+            end.toordinal() if end else date.max.toordinal() + 1,
+            open_only=True,
+        ))
+
+    def _query_rows(self, query: TaskQuery) -> List[int]:
+        """Zeilen, die alle Filter der Abfrage erfüllen, in Einfügereihenfolge."""
+        code = None
+        if query.category is not None:
+            code = self._category_code.get(query.category)
+            if code is None:
+                return []
+        # Ohne Fälligkeit ist due = 0 und fällt bei gesetztem Bereich heraus
+        start = query.due_from.toordinal() if query.due_from else 1
+        end = query.due_to.toordinal() if query.due_to else date.max.toordinal()
+        has_range = query.has_due_range
+        if np is not None:
+            mask = np.frombuffer(self._alive, np.uint8) == 1
+            if query.status is not None:
+                mask &= np.frombuffer(self._done, np.uint8) == (query.status == STATUS_DONE)
+            if code is not None:
+                mask &= np.frombuffer(self._category, np.uint32) == code
+            if has_range:
+                due = np.frombuffer(self._due, np.int32)
+                mask &= (due >= start) & (due <= end)
+            rows = np.flatnonzero(mask).tolist()
+        else:
+            done = None if query.status is None else int(query.status == STATUS_DONE)
+            alive, flags, categories, dues = self._alive, self._done, self._category, self._due
+            rows = [row for row in range(len(alive)) if alive[row]
+                    and (done is None or flags[row] == done)
+                    and (code is None or categories[row] == code)
+                    and (not has_range or start <= dues[row] <= end)]
+        if query.text:
+            text, titles = query.text, self._titles
+            rows = [row for row in rows if matches_text(text, titles[row])]
+        return rows
+
+    def _sort_key(self, sort: str, today: date) -> Optional[Callable[[int], tuple]]:
+        """Sortierschlüssel über Zeilennummern wie query.sort_key()."""
+        done, dues = self._done, self._due
+        if sort == SORT_SMART:
+            ordinal = today.toordinal()
+
+            def key(row: int) -> tuple:
+                if done[row]: return (4, 0)
+                due = dues[row]
+                if not due: return (3, 0)
+                if due < ordinal: return (0, due)
+                if due == ordinal: return (1, due)
+                return (2, due)
+            return key
+        if sort == SORT_DUE:
+            return lambda row: (dues[row] == 0, dues[row])
+        if sort == SORT_TITLE:
+            titles = self._titles
+            return lambda row: titles[row].casefold()
+        return None
+
+    def find_query(self, query: TaskQuery, today: date) -> List[Task]:
+        rows = self._query_rows(query)
+        key = self._sort_key(query.sort, today)
+        stop = None if query.limit is None else query.offset + query.limit
+        if key is not None:
+            rows = heapq.nsmallest(stop, rows, key=key) if stop is not None else sorted(rows, key=key)
+        return self._tasks(rows[query.offset:stop])
+
+    def count_query(self, query: TaskQuery) -> int:
+        if query.predicate() is None:
+            return len(self._row)
+        return len(self._query_rows(query))
+
+    def count_statistics(self, today: date) -> dict:
+        ordinal = today.toordinal()
+        total = len(self._row)
+        # Gelöschte Zeilen haben done = 0 und due = 0
+        done = self._done.count(1)
+        due_today = self._due.count(ordinal)
+        if np is not None:
+            due = np.frombuffer(self._due, np.int32)
+            overdue = int(np.count_nonzero(
+                (due > 0) & (due < ordinal) & (np.frombuffer(self._done, np.uint8) == 0)
+            ))
+        else:
+            overdue = sum(1 for d, f in zip(self._due, self._done) if 0 < d < ordinal and not f)
+        return {
+            "total": total,
+            "done": done,
+            "open": total - done,
+            "overdue": overdue,
+            "due_today": due_today,
+        }
+
+    def count_by_category(self) -> Dict[str, int]:
+        if np is not None:
+            codes = np.frombuffer(self._category, np.uint32)[np.frombuffer(self._alive, np.uint8) == 1]
+            counts = np.bincount(codes, minlength=len(self._categories)).tolist()
+        else:
+            counts = [0] * len(self._categories)
+            for code, alive in zip(self._category, self._alive):
+                counts[code] += alive
+        return {self._categories[code]: n for code, n in enumerate(counts) if n}
+
+    def upsert(self, tasks: List[Task]) -> None:
+        tasks = list(tasks)
+        self._append_all(tasks)
+        self._persist(TaskChangeSet(upserts=tasks))
+
+    def delete(self, task_ids: List[str]) -> int:
+        deleted = []
+        for task_id in dict.fromkeys(task_ids):
+            row = self._row.get(task_id)
+            if row is not None:
+                self._remove_row(row)
+                deleted.append(task_id)
+        if deleted:
+            self._persist(TaskChangeSet(deletes=deleted))
+        return len(deleted)
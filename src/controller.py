@@ -1,9 +1,27 @@
 #Controller: Geschäftslogik für die TODO-App.
 #Verwaltet CRUD-Operationen und delegiert Persistenz an das Repository.
-from typing import List, Optional
-from datetime import date
+from dataclasses import replace
+from itertools import chain
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from datetime import date, timedelta
 from model import Task
-from repository import TaskRepositoryInterface, JSONTaskRepository
+from query import TaskQuery, STATUS_OPEN, STATUS_DONE, count, execute
+from indexes import (
+    TaskList,
+    StatusIndex,
+    CategoryIndex,
+    DueDateIndex,
+    SearchIndex,
+    StatisticsIndex,
+    tokenize,
+)
+from repository import (
+    TaskRepositoryInterface,
+    TaskQueryInterface,
+    TaskChangeSet,
+    TaskChangeSetInterface,
+    JSONTaskRepository,
+)
 
 
 class TaskController:
@@ -17,7 +35,41 @@ class TaskController:
         
         """
         self.repository = repository or JSONTaskRepository()
-        self.tasks: List[Task] = []
+        # Sekundärindizes, werden von der TaskList mitgeführt
+        self._status = StatusIndex()
+        self._categories = CategoryIndex()
+        self._due_open = DueDateIndex(done=False)
+        self._due_done = DueDateIndex(done=True)
+        self._search = SearchIndex()
+        self._stats = StatisticsIndex()
+        # Änderungszähler: steigt bei jeder Änderung am Bestand (z.B. für View-Caches)
+        self.version = 0
+        # Zählerstand der letzten Änderung je Task (sonst Stand beim Laden)
+        self._task_versions: Dict[str, int] = {}
+        self._loaded_version = 0
+        self._tasks = TaskList()
+        self.tasks = self._tasks
+        # Änderungen seit dem letzten save()/load() (geordnet nach Auftreten)
+        self._created: Dict[str, Task] = {}
+        self._modified: Dict[str, Task] = {}
+        self._deleted: Dict[str, None] = {}
+    
+    @property
+    def tasks(self) -> TaskList:
+        """Alle Tasks in Einfügereihenfolge, indiziert über die ID."""
+        return self._tasks
+    
+    @tasks.setter
+    def tasks(self, tasks: Iterable[Task]) -> None:
+        tasks = tasks if isinstance(tasks, TaskList) else TaskList(tasks)
+        for index in (self._status, self._categories, self._due_open,
+                      self._due_done, self._search, self._stats):
+            self._tasks.detach(index)
+            tasks.attach(index)
+        self._tasks = tasks
+        self.version += 1
+        self._loaded_version = self.version
+        self._task_versions.clear()
     
     #CRUD Operationen
     
@@ -33,22 +85,31 @@ class TaskController:
             category=category,
             due_date=due_date
         )
+        self.add_task(task)
+        return task
+    
+    def add_task(self, task: Task) -> Task:
+        """Fügt einen bereits erstellten Task hinzu (z.B. aus Factory oder Adapter)."""
         self.tasks.append(task)
+        self._deleted.pop(task.id, None)
+        self._created[task.id] = task
+        self._touch(task.id)
         return task
     
     def delete(self, task_id: str) -> bool:
         #Löscht einen Task anhand der ID
-        for i, task in enumerate(self.tasks):
-            if task.id == task_id:
-                self.tasks.pop(i)
-                return True
-        return False
+        if self.tasks.pop_id(task_id) is None:
+            return False
+        self._mark_deleted(task_id)
+        return True
     
     def toggle(self, task_id: str) -> bool:
         """Wechselt den Erledigt-Status eines Tasks."""
         task = self.get_by_id(task_id)
         if task:
-            task.toggle()
+            with self.tasks.changing(task):
+                task.toggle()
+            self._mark_modified(task)
             return True
         return False
     
@@ -64,6 +125,72 @@ class TaskController:
         if not task:
             return False
         
+        with self.tasks.changing(task):
+            self._apply_update(task, title, category, due_date)
+        self._mark_modified(task)
+        return True
+    
+    # Sammeloperationen (ein Durchlauf, ein save() durch den Aufrufer)
+    
+    def add_many(self, tasks: Iterable[Task]) -> List[Task]:
+        """Fügt mehrere bereits erstellte Tasks hinzu."""
+        tasks = list(tasks)
+        for task in tasks:
+            self.add_task(task)
+        return tasks
+    
+    def delete_many(self, task_ids: Iterable[str]) -> int:
+        """Löscht mehrere Tasks, gibt Anzahl gelöschter zurück."""
+        deleted = 0
+        for task_id in dict.fromkeys(task_ids):
+            if self.tasks.pop_id(task_id) is not None:
+                self._mark_deleted(task_id)
+                deleted += 1
+        return deleted
+    
+    def toggle_many(self, task_ids: Iterable[str]) -> int:
+        """Wechselt den Status mehrerer Tasks, gibt Anzahl geänderter zurück."""
+        return len(self._modify_many(task_ids, Task.toggle))
+    
+    def set_done_many(self, task_ids: Iterable[str], done: bool = True) -> int:
+        """Setzt den Status mehrerer Tasks, gibt Anzahl geänderter zurück."""
+        pending = []
+        for task_id in task_ids:
+            task = self.get_by_id(task_id)
+            if task is not None and task.done != done:
+                pending.append(task_id)
+        return len(self._modify_many(pending, Task.toggle))
+    
+    def update_many(self, task_ids: Iterable[str], title: str = None, category: str = None,
+                    due_date: Optional[date] = None) -> int:
+        """
+        Aktualisiert mehrere Tasks mit denselben Werten.
+        
+        Raises:
+            ValueError: Wenn der neue Titel leer ist (vor jeder Änderung)
+        """
+        if title is not None and not title.strip():
+            raise ValueError("Titel darf nicht leer sein")
+        return len(self._modify_many(
+            task_ids, lambda task: self._apply_update(task, title, category, due_date)
+        ))
+    
+    def _modify_many(self, task_ids: Iterable[str], change) -> List[Task]:
+        """Wendet change auf alle vorhandenen Tasks an (Duplikate einmal)."""
+        changed = []
+        for task_id in dict.fromkeys(task_ids):
+            task = self.tasks.get(task_id)
+            if task is None:
+                continue
+            with self.tasks.changing(task):
+                change(task)
+            self._mark_modified(task)
+            changed.append(task)
+        return changed
+    
+    def _apply_update(self, task: Task, title: str = None, category: str = None,
+                      due_date: Optional[date] = None) -> None:
+        """Übernimmt die gesetzten Felder in den Task."""
         if title is not None:
             if not title.strip():
                 raise ValueError("Titel darf nicht leer sein")
@@ -74,17 +201,12 @@ class TaskController:
         
         if due_date is not None:
             task.due_date = due_date
-        
-        return True
     
     # Abfragen
     
     def get_by_id(self, task_id: str) -> Optional[Task]:
         """Gibt Task anhand ID zurück."""
-        for task in self.tasks:
-            if task.id == task_id:
-                return task
-        return None
+        return self.tasks.get(task_id)
     
     def get_all(self) -> List[Task]:
         """Gibt alle Tasks zurück."""
@@ -92,52 +214,369 @@ class TaskController:
     
     def get_open(self) -> List[Task]:
         """Gibt offene Tasks zurück."""
-        return [t for t in self.tasks if not t.done]
+        return self.tasks.ordered(self._status.open.values())
     
     def get_done(self) -> List[Task]:
         """Gibt erledigte Tasks zurück."""
-        return [t for t in self.tasks if t.done]
+        return self.tasks.ordered(self._status.done.values())
     
     def get_categories(self) -> List[str]:
         """Gibt alle verwendeten Kategorien zurück (sortiert)."""
-        categories = set(t.category for t in self.tasks if t.category)
-        return sorted(list(categories))
+        return self._categories.categories()
     
     def get_by_category(self, category: str) -> List[Task]:
         """Filtert Tasks nach Kategorie."""
-        return [t for t in self.tasks if t.category == category]
+        return self.tasks.ordered(self._categories.get(category))
+    
+    def get_overdue(self, today: Optional[date] = None) -> List[Task]:
+        """Gibt überfällige Tasks zurück (nach Fälligkeit sortiert)."""
+        return self._due_range(None, today or date.today())
+    
+    def get_due_today(self, today: Optional[date] = None) -> List[Task]:
+        """Gibt heute fällige Tasks zurück (offene und erledigte)."""
+        today = today or date.today()
+        tomorrow = today + timedelta(days=1)
+        return self.tasks.ordered(
+            self._due_open.between(today, tomorrow) + self._due_done.between(today, tomorrow)
+        )
+    
+    def get_due_before(self, day: date) -> List[Task]:
+        """Gibt offene Tasks mit Fälligkeit vor day zurück (nach Fälligkeit sortiert)."""
+        return self._due_range(None, day)
+    
+    def get_due_between(self, start: date, end: date) -> List[Task]:
+        """Gibt offene Tasks mit start <= Fälligkeit <= end zurück (nach Fälligkeit sortiert)."""
+        return self._due_range(start, end + timedelta(days=1))
+    
+    def get_upcoming(self, days: int = 7, today: Optional[date] = None) -> List[Task]:
+        """Gibt offene Tasks zurück, die in den nächsten days Tagen (ab morgen) fällig sind."""
+        today = today or date.today()
+        return self.get_due_between(today + timedelta(days=1), today + timedelta(days=days))
     
-    def get_overdue(self) -> List[Task]:
-        """Gibt überfällige Tasks zurück."""
-        return [t for t in self.tasks if t.is_overdue()]
+    def search(self, text: str) -> List[Task]:
+        """
+        Volltextsuche im Titel: jedes Wort muss als Wortanfang vorkommen,
+        ohne Beachtung von Groß-/Kleinschreibung und Akzenten.
+        """
+        return self.tasks.ordered(self._search.search(text))
+    
+    def query(self, query: TaskQuery, today: Optional[date] = None) -> List[Task]:
+        """Führt eine Abfrage über die kleinste passende Kandidatenmenge aus."""
+        candidates, ordered, query = self._plan(query)
+        return execute(query, candidates, today or date.today(),
+                       None if ordered else self.tasks.ordered)
+    
+    def count(self, query: TaskQuery) -> int:
+        """Anzahl der Treffer einer Abfrage ohne limit/offset (z.B. für Seitenzahlen)."""
+        candidates, _, query = self._plan(query)
+        return count(query, candidates)
+    
+    def _plan(self, query: TaskQuery) -> Tuple[Iterable[Task], bool, TaskQuery]:
+        """
+        Wählt unter allen Tasks und den passenden Indizes den mit den
+        wenigsten Kandidaten. Gibt (Kandidaten, in Listenreihenfolge?,
+        verbleibende Abfrage) zurück.
+        """
+        # (Anzahl, Kandidaten erzeugen, geordnet)
+        options: List[Tuple[int, Callable[[], Iterable[Task]], bool]] = [
+            (len(self.tasks), lambda: self.tasks, True)
+        ]
+        if query.status is not None:
+            partition = self._status.done if query.status == STATUS_DONE else self._status.open
+            options.append((len(partition), partition.values, False))
+        if query.category is not None:
+            options.append((self._categories.count(query.category),
+                            lambda: self._categories.get(query.category), False))
+        if query.has_due_range:
+            start = query.due_from
+            end = query.due_to + timedelta(days=1) if query.due_to else None
+            indexes = {None: [self._due_open, self._due_done],
+                       STATUS_OPEN: [self._due_open],
+                       STATUS_DONE: [self._due_done]}[query.status]
+            options.append((sum(i.count_between(start, end) for i in indexes),
+                            lambda: chain.from_iterable(i.between(start, end) for i in indexes),
+                            False))
+        size, candidates, ordered = min(options, key=lambda option: option[0])
+        if tokenize(query.text):
+            # Text wird immer über den Suchindex aufgelöst; ohne Suchwörter
+            # (nur Emoji/Satzzeichen) filtert er wie matches_text() nicht
+            hits = self._search.search(query.text)
+            if len(hits) <= size:
+                return hits, False, replace(query, text="")
+            ids = {t.id for t in hits}
+            return ([t for t in candidates() if t.id in ids], ordered,
+                    replace(query, text=""))
+        return candidates(), ordered, query
+    
+    def _due_range(self, start: Optional[date], end: Optional[date]) -> List[Task]:
+        """Offene Tasks mit start <= Fälligkeit < end, bei gleichem Datum in Listenreihenfolge."""
+        return sorted(self.tasks.ordered(self._due_open.between(start, end)),
+                      key=lambda t: t.due_date)
+    
+    # Änderungsverfolgung
+    
+    def _touch(self, task_id: str) -> None:
+        """Zählt eine Änderung am Task (neue Task-Version)."""
+        self.version += 1
+        self._task_versions[task_id] = self.version
+    
+    def task_version(self, task_id: str) -> int:
+        """
+        Version eines Tasks: Zählerstand seiner letzten Änderung. Ändert
+        sich bei jeder Änderung des Tasks und bei jedem Neuladen.
+        """
+        return self._task_versions.get(task_id, self._loaded_version)
+    
+    def _mark_modified(self, task: Task) -> None:
+        self._touch(task.id)
+        if task.id not in self._created:
+            self._modified[task.id] = task
+    
+    def _mark_deleted(self, task_id: str) -> None:
+        self.version += 1
+        self._task_versions.pop(task_id, None)
+        if self._created.pop(task_id, None) is None:
+            # Nur bereits gespeicherte Tasks müssen gelöscht werden
+            self._modified.pop(task_id, None)
+            self._deleted[task_id] = None
     
-    def get_due_today(self) -> List[Task]:
-        """Gibt heute fällige Tasks zurück."""
-        return [t for t in self.tasks if t.is_due_today()]
+    def _clear_changes(self) -> None:
+        self._created.clear()
+        self._modified.clear()
+        self._deleted.clear()
+    
+    def has_changes(self) -> bool:
+        """Prüft ob es ungespeicherte Änderungen gibt."""
+        return bool(self._created or self._modified or self._deleted)
+    
+    def get_changes(self) -> TaskChangeSet:
+        """Gibt die Änderungen seit dem letzten save()/load() zurück."""
+        return TaskChangeSet(
+            upserts=list(self._created.values()) + list(self._modified.values()),
+            deletes=list(self._deleted),
+        )
+    
+    def take_changes(self) -> TaskChangeSet:
+        """Gibt die Änderungen zurück und setzt die Verfolgung zurück."""
+        changes = self.get_changes()
+        self._clear_changes()
+        return changes
+    
+    def restore_changes(self, changes: TaskChangeSet) -> None:
+        """Übernimmt nicht gespeicherte Änderungen wieder (z.B. nach Schreibfehler)."""
+        for task in changes.upserts:
+            if task.id not in self._deleted:
+                self._mark_modified(task)
+        for task_id in changes.deletes:
+            if task_id not in self._created:
+                self._deleted[task_id] = None
+    
+    def reapply_changes(self, changes: TaskChangeSet) -> None:
+        """
+        Wendet noch nicht gespeicherte Änderungen nach einem Neuladen erneut
+        an; pro Task gewinnt die eigene Änderung, alles andere kommt aus
+        dem neu geladenen Bestand.
+        """
+        for task in changes.upserts:
+            self.add_task(task)
+        for task_id in changes.deletes:
+            self.tasks.pop_id(task_id)
+            self._mark_deleted(task_id)
     
     # Persistenz (delegiert an Repository)
     
     def save(self) -> None:
-        """Speichert alle Tasks über das Repository."""
-        self.repository.save(self.tasks)
+        """
+        Speichert über das Repository. Unterstützt es Teil-Speicherung,
+        werden nur die Änderungen geschrieben, sonst alle Tasks.
+        """
+        changes = self.take_changes()
+        try:
+            self.persist(changes, self.tasks)
+        except Exception:
+            self.restore_changes(changes)
+            raise
     
-    def load(self) -> None:
-        """Lädt alle Tasks aus dem Repository."""
-        self.tasks = self.repository.load()
+    def persist(self, changes: TaskChangeSet, tasks: List[Task]) -> None:
+        """Schreibt Änderungen bzw. die Task-Liste über das Repository."""
+        if isinstance(self.repository, TaskChangeSetInterface):
+            if changes:
+                self.repository.save_changes(changes)
+        else:
+            self.repository.save(tasks)
+    
+    def load(self, streaming: bool = False) -> None:
+        """
+        Lädt alle Tasks aus dem Repository.
+        Mit streaming=True wird die Liste Task für Task über
+        repository.iter_load() gefüllt (spart Speicher bei großen Dateien).
+        """
+        if streaming:
+            try:
+                tasks = list(self.repository.iter_load())
+            except (ValueError, KeyError):
+                # Beschädigte Datei: regulärer Pfad behandelt den Fehler
+                tasks = self.repository.load()
+        else:
+            tasks = self.repository.load()
+        self.replace_all(tasks)
+    
+    def replace_all(self, tasks: List[Task]) -> None:
+        """Übernimmt einen geladenen Task-Bestand (ohne Änderungen vorzumerken)."""
+        self.tasks = tasks
+        self._clear_changes()
     
     # Statistiken
     
-    def get_statistics(self) -> dict:
-        """Gibt Statistiken über die Tasks zurück."""
-        total = len(self.tasks)
-        done = len(self.get_done())
-        open_count = len(self.get_open())
+    def get_statistics(self, today: Optional[date] = None) -> dict:
+        """Gibt Statistiken über die Tasks zurück (aus laufenden Zählern)."""
+        today = today or date.today()
+        stats = self._stats
+        total = stats.total
+        done = stats.done
         
         return {
             "total": total,
             "done": done,
-            "open": open_count,
+            "open": total - done,
             "progress": done / total if total > 0 else 0,
-            "overdue": len(self.get_overdue()),
-            "due_today": len(self.get_due_today())
+            "overdue": stats.overdue(today),
+            "due_today": stats.due_today(today)
         }
+    
+    def get_category_counts(self) -> Dict[str, int]:
+        """Gibt die Anzahl Tasks je Kategorie zurück ("" = ohne Kategorie)."""
+        return dict(self._stats.categories)
+
+
+class PushdownTaskController(TaskController):
+    """
+    Controller für abfragefähige Repositories (z.B. SQLiteTaskRepository).
+    Abfragen werden an das Repository delegiert, sodass nie alle Tasks
+    im Speicher liegen müssen. Änderungen werden sofort zeilenweise
+    geschrieben (write-through), save() und load() sind daher leer.
+    """
+    
+    def __init__(self, repository: TaskQueryInterface):
+        if not isinstance(repository, TaskQueryInterface):
+            raise TypeError("Repository unterstützt keine Abfragen")
+        super().__init__(repository)
+    
+    # CRUD Operationen (write-through)
+    
+    def add_task(self, task: Task) -> Task:
+        self.repository.upsert([task])
+        self._touch(task.id)
+        return task
+    
+    def delete(self, task_id: str) -> bool:
+        return self.delete_many([task_id]) > 0
+    
+    def toggle(self, task_id: str) -> bool:
+        task = self.get_by_id(task_id)
+        if not task:
+            return False
+        task.toggle()
+        self.repository.upsert([task])
+        self._touch(task.id)
+        return True
+    
+    def update(self, task_id: str, title: str = None, category: str = None,
+               due_date: Optional[date] = None) -> bool:
+        task = self.get_by_id(task_id)
+        if not task:
+            return False
+        self._apply_update(task, title, category, due_date)
+        self.repository.upsert([task])
+        self._touch(task.id)
+        return True
+    
+    def add_many(self, tasks: Iterable[Task]) -> List[Task]:
+        tasks = list(tasks)
+        self.repository.upsert(tasks)
+        for task in tasks:
+            self._touch(task.id)
+        return tasks
+    
+    def delete_many(self, task_ids: Iterable[str]) -> int:
+        task_ids = list(dict.fromkeys(task_ids))
+        deleted = self.repository.delete(task_ids)
+        if deleted:
+            self.version += 1
+            for task_id in task_ids:
+                self._task_versions.pop(task_id, None)
+        return deleted
+    
+    def _modify_many(self, task_ids: Iterable[str], change) -> List[Task]:
+        changed = []
+        for task_id in dict.fromkeys(task_ids):
+            task = self.get_by_id(task_id)
+            if task is not None:
+                change(task)
+                changed.append(task)
+        if changed:
+            self.repository.upsert(changed)
+            for task in changed:
+                self._touch(task.id)
+        return changed
+    
+    # Abfragen (Pushdown)
+    
+    def get_by_id(self, task_id: str) -> Optional[Task]:
+        return self.repository.find_by_id(task_id)
+    
+    def get_all(self) -> List[Task]:
+        return self.repository.load()
+    
+    def get_open(self) -> List[Task]:
+        return self.repository.find_open()
+    
+    def get_done(self) -> List[Task]:
+        return self.repository.find_done()
+    
+    def get_categories(self) -> List[str]:
+        return self.repository.find_categories()
+    
+    def get_by_category(self, category: str) -> List[Task]:
+        return self.repository.find_by_category(category)
+    
+    def get_overdue(self, today: Optional[date] = None) -> List[Task]:
+        return self.repository.find_overdue(today or date.today())
+    
+    def get_due_today(self, today: Optional[date] = None) -> List[Task]:
+        return self.repository.find_due_today(today or date.today())
+    
+    def _due_range(self, start: Optional[date], end: Optional[date]) -> List[Task]:
+        return self.repository.find_due_between(start, end)
+    
+    def search(self, text: str) -> List[Task]:
+        return self.query(TaskQuery(text=text))
+    
+    def query(self, query: TaskQuery, today: Optional[date] = None) -> List[Task]:
+        return self.repository.find_query(query, today or date.today())
+    
+    def count(self, query: TaskQuery) -> int:
+        return self.repository.count_query(query)
+    
+    # Persistenz
+    
+    def save(self) -> None:
+        """Nichts zu tun: Änderungen sind bereits geschrieben."""
+    
+    def load(self) -> None:
+        """Nichts zu tun: Abfragen lesen direkt aus dem Repository."""
+    
+    def get_statistics(self, today: Optional[date] = None) -> dict:
+        counts = self.repository.count_statistics(today or date.today())
+        total = counts["total"]
+        return {
+            "total": total,
+            "done": counts["done"],
+            "open": counts["open"],
+            "progress": counts["done"] / total if total > 0 else 0,
+            "overdue": counts["overdue"],
+            "due_today": counts["due_today"]
+        }
+    
+    def get_category_counts(self) -> Dict[str, int]:
+        return self.repository.count_by_category()
@@ -0,0 +1,108 @@
+#Flusher: Verzögertes, gebündeltes Speichern (Write-Behind).
+#Der UI-Thread markiert nur noch Änderungen; ein Hintergrund-Thread
+#schreibt sie gesammelt über den Controller weg.
+
+import atexit
+import threading
+import time
+import traceback
+from typing import Callable, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from controller import TaskController
+
+
+class WriteBehindFlusher:
+    """
+    Schreibt Änderungen eines Controllers im Hintergrund: spätestens
+    interval_ms nach der ersten ungespeicherten Änderung oder sobald
+    max_pending Änderungen anstehen. flush() schreibt sofort, beim
+    Beenden des Interpreters wird automatisch geflusht.
+
+    Verwendung:
+        flusher = WriteBehindFlusher(controller, interval_ms=500)
+        mediator = TaskMediator(controller, flusher=flusher)
+    """
+
+    def __init__(self, controller: "TaskController", interval_ms: int = 500,
+                 max_pending: int = 20, lock: Optional[threading.RLock] = None,
+                 on_flushed: Optional[Callable[[], None]] = None):
+        self.controller = controller
+        self.interval = interval_ms / 1000
+        self.max_pending = max_pending
+        # Schützt die Controller-Daten; Mediatoren ändern nur unter diesem Lock
+        self.lock = lock or threading.RLock()
+        self.on_flushed = on_flushed
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._pending = 0
+        self._first_dirty = 0.0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="task-flusher", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @property
+    def pending(self) -> int:
+        """Anzahl ungespeicherter Änderungen."""
+        return self._pending
+
+    def mark_dirty(self) -> None:
+        """Meldet eine Änderung an (kehrt sofort zurück)."""
+        with self._cond:
+            if self._pending == 0:
+                self._first_dirty = time.monotonic()
+            self._pending += 1
+            if self._pending == 1 or self._pending >= self.max_pending:
+                self._cond.notify()
+
+    def flush(self) -> None:
+        """Schreibt alle anstehenden Änderungen sofort."""
+        with self._io_lock:
+            with self._cond:
+                if self._pending == 0:
+                    return
+                self._pending = 0
+            with self.lock:
+                changes = self.controller.take_changes()
+                tasks = list(self.controller.tasks)
+            if not changes:
+                return
+            try:
+                self.controller.persist(changes, tasks)
+            except Exception:
+                with self.lock:
+                    self.controller.restore_changes(changes)
+                self.mark_dirty()
+                raise
+        if self.on_flushed:
+            self.on_flushed()
+
+    def close(self) -> None:
+        """Beendet den Hintergrund-Thread und schreibt ausstehende Änderungen."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self.flush()
+        atexit.unregister(self.close)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending == 0 and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                # Änderungen bündeln, bis Intervall abgelaufen oder Limit erreicht
+                deadline = self._first_dirty + self.interval
+                while not self._closed and self._pending < self.max_pending:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            try:
+                self.flush()
+            except Exception:
+                traceback.print_exc()
+                time.sleep(self.interval)
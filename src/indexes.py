@@ -0,0 +1,496 @@
+#Indizes: Datenstrukturen, mit denen der Controller Abfragen
+#ohne Durchlauf über alle Tasks beantworten kann.
+
+import re
+import unicodedata
+from abc import ABC, abstractmethod
+from bisect import bisect_left, insort
+from collections import Counter
+from collections.abc import MutableSequence
+from contextlib import contextmanager
+from itertools import islice
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from model import Task
+
+
+_WORD = re.compile(r"\w+")
+
+
+def normalize_text(text: str) -> str:
+    """Entfernt Akzente/Umlautpunkte und faltet Groß-/Kleinschreibung ("Übung" -> "ubung")."""
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def tokenize(text: str) -> List[str]:
+    """Zerlegt Text in normalisierte Wörter; Emoji und Satzzeichen fallen weg."""
+    return _WORD.findall(normalize_text(text))
+
+
+def matches_text(query: str, title: str) -> bool:
+    """Prüft, ob jedes Suchwort Präfix eines Titelworts ist (wie SearchIndex)."""
+    words = tokenize(title)
+    return all(any(word.startswith(token) for word in words) for token in tokenize(query))
+
+
+class TaskIndex(ABC):
+    """
+    Sekundärindex über eine TaskList.
+    Die Liste meldet jeden eingefügten bzw. entfernten Task.
+    """
+
+    @abstractmethod
+    def add(self, task: Task) -> None:
+        pass
+
+    @abstractmethod
+    def discard(self, task: Task) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    def rebuild(self, tasks: Iterable[Task]) -> None:
+        """Baut den Index aus allen Tasks neu auf (z.B. nach load())."""
+        self.clear()
+        for task in tasks:
+            self.add(task)
+
+
+class StatusIndex(TaskIndex):
+    """Teilt die Tasks in offene und erledigte (je ID -> Task)."""
+
+    def __init__(self):
+        self.open: Dict[str, Task] = {}
+        self.done: Dict[str, Task] = {}
+
+    def add(self, task: Task) -> None:
+        (self.done if task.done else self.open)[task.id] = task
+
+    def discard(self, task: Task) -> None:
+        self.open.pop(task.id, None)
+        self.done.pop(task.id, None)
+
+    def clear(self) -> None:
+        self.open.clear()
+        self.done.clear()
+
+
+class CategoryIndex(TaskIndex):
+    """
+    Kategorie -> Tasks. Die Anzahl der Tasks je Kategorie dient als
+    Referenzzähler: fällt sie auf 0, verschwindet die Kategorie.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[str, Dict[str, Task]] = {}
+        self._category_of: Dict[str, str] = {}
+        self._sorted: List[str] = []  # nicht-leere Kategorien
+
+    def add(self, task: Task) -> None:
+        self._add(task, insort)
+
+    def rebuild(self, tasks: Iterable[Task]) -> None:
+        # Einmal sortieren statt einzeln einfügen
+        self.clear()
+        for task in tasks:
+            self._add(task, list.append)
+        self._sorted.sort()
+
+    def _add(self, task: Task, insert) -> None:
+        category = task.category
+        bucket = self._tasks.get(category)
+        if bucket is None:
+            bucket = self._tasks[category] = {}
+            if category:
+                insert(self._sorted, category)
+        bucket[task.id] = task
+        self._category_of[task.id] = category
+
+    def discard(self, task: Task) -> None:
+        # Kategorie zum Zeitpunkt des Einfügens, nicht die aktuelle
+        category = self._category_of.pop(task.id, None)
+        if category is None:
+            return
+        bucket = self._tasks[category]
+        del bucket[task.id]
+        if not bucket:
+            del self._tasks[category]
+            if category:
+                del self._sorted[bisect_left(self._sorted, category)]
+
+    def clear(self) -> None:
+        self._tasks.clear()
+        self._category_of.clear()
+        self._sorted.clear()
+
+    def get(self, category: str) -> Iterable[Task]:
+        """Tasks einer Kategorie (ungeordnet)."""
+        return self._tasks.get(category, {}).values()
+
+    def count(self, category: str) -> int:
+        return len(self._tasks.get(category, ()))
+
+    def categories(self) -> List[str]:
+        """Alle verwendeten Kategorien (sortiert, ohne leere)."""
+        return list(self._sorted)
+
+
+class DueDateIndex(TaskIndex):
+    """
+    Nach Fälligkeit sortierter Index (per bisect gepflegt) über Tasks
+    eines Status. Tasks ohne Fälligkeit werden nicht aufgenommen.
+    Bereichsabfragen kosten O(log n + k).
+    """
+
+    def __init__(self, done: bool = False):
+        self.done = done
+        self._keys: List[Tuple[date, str]] = []
+        self._tasks: Dict[str, Task] = {}
+        self._key_of: Dict[str, Tuple[date, str]] = {}
+
+    def add(self, task: Task) -> None:
+        self._add(task, insort)
+
+    def rebuild(self, tasks: Iterable[Task]) -> None:
+        # Einmal sortieren statt einzeln einfügen
+        self.clear()
+        for task in tasks:
+            self._add(task, list.append)
+        self._keys.sort()
+
+    def _add(self, task: Task, insert) -> None:
+        if task.done != self.done or not task.due_date:
+            return
+        key = (task.due_date, task.id)
+        insert(self._keys, key)
+        self._tasks[task.id] = task
+        self._key_of[task.id] = key
+
+    def discard(self, task: Task) -> None:
+        key = self._key_of.pop(task.id, None)
+        if key is None:
+            return
+        del self._keys[bisect_left(self._keys, key)]
+        del self._tasks[task.id]
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._tasks.clear()
+        self._key_of.clear()
+
+    def between(self, start: Optional[date] = None,
+                end: Optional[date] = None) -> List[Task]:
+        """Tasks mit start <= Fälligkeit < end, nach Fälligkeit sortiert (None = offen)."""
+        keys = self._keys
+        lo = bisect_left(keys, (start, "")) if start else 0
+        hi = bisect_left(keys, (end, "")) if end else len(keys)
+        tasks = self._tasks
+        return [tasks[task_id] for _, task_id in keys[lo:hi]]
+
+    def count_between(self, start: Optional[date] = None,
+                      end: Optional[date] = None) -> int:
+        """Anzahl Tasks mit start <= Fälligkeit < end (O(log n))."""
+        keys = self._keys
+        lo = bisect_left(keys, (start, "")) if start else 0
+        hi = bisect_left(keys, (end, "")) if end else len(keys)
+        return max(hi - lo, 0)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class SearchIndex(TaskIndex):
+    """
+    Invertierter Index über die Titelwörter (normalisiert, siehe tokenize).
+    Jedes Suchwort passt als Präfix (Suche während der Eingabe),
+    mehrere Suchwörter werden UND-verknüpft.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, Task]] = {}
+        self._words_of: Dict[str, Tuple[str, ...]] = {}
+        self._vocabulary: List[str] = []  # sortiert, für Präfixbereiche
+
+    def add(self, task: Task) -> None:
+        self._add(task, insort)
+
+    def rebuild(self, tasks: Iterable[Task]) -> None:
+        # Einmal sortieren statt einzeln einfügen
+        self.clear()
+        for task in tasks:
+            self._add(task, list.append)
+        self._vocabulary.sort()
+
+    def _add(self, task: Task, insert) -> None:
+        words = tuple(set(tokenize(task.title)))
+        self._words_of[task.id] = words
+        for word in words:
+            posting = self._postings.get(word)
+            if posting is None:
+                posting = self._postings[word] = {}
+                insert(self._vocabulary, word)
+            posting[task.id] = task
+
+    def discard(self, task: Task) -> None:
+        for word in self._words_of.pop(task.id, ()):
+            posting = self._postings[word]
+            del posting[task.id]
+            if not posting:
+                del self._postings[word]
+                del self._vocabulary[bisect_left(self._vocabulary, word)]
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._words_of.clear()
+        self._vocabulary.clear()
+
+    def _prefix_matches(self, prefix: str) -> Dict[str, Task]:
+        vocabulary = self._vocabulary
+        i = bisect_left(vocabulary, prefix)
+        if i < len(vocabulary) and vocabulary[i] == prefix and (
+                i + 1 == len(vocabulary) or not vocabulary[i + 1].startswith(prefix)):
+            return self._postings[prefix]
+        found: Dict[str, Task] = {}
+        while i < len(vocabulary) and vocabulary[i].startswith(prefix):
+            found.update(self._postings[vocabulary[i]])
+            i += 1
+        return found
+
+    def search(self, text: str) -> List[Task]:
+        """Tasks, deren Titel alle Suchwörter (als Präfix) enthält (ungeordnet)."""
+        tokens = tokenize(text)
+        if not tokens:
+            return []
+        # Längste Suchwörter zuerst: meist die kleinste Treffermenge
+        tokens.sort(key=len, reverse=True)
+        first = self._prefix_matches(tokens[0])
+        ids: Optional[Set[str]] = None
+        for token in tokens[1:]:
+            ids = (first.keys() if ids is None else ids) & self._prefix_matches(token).keys()
+            if not ids:
+                return []
+        if ids is None:
+            return list(first.values())
+        return [first[task_id] for task_id in ids]
+
+
+class StatisticsIndex(TaskIndex):
+    """
+    Laufende Zähler für get_statistics(): jede Änderung kostet O(1).
+    Überfällige werden relativ zum zuletzt abgefragten Tag gezählt und
+    nur beim Datumswechsel neu berechnet (O(Anzahl Fälligkeitstage)).
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.done = 0
+        self.categories: Counter = Counter()
+        self._open_due: Counter = Counter()  # offene Tasks je Fälligkeit
+        self._due: Counter = Counter()       # alle Tasks je Fälligkeit
+        self._today: Optional[date] = None
+        self._overdue = 0
+        self._counted: Dict[str, Tuple[bool, str, Optional[date]]] = {}
+
+    def add(self, task: Task) -> None:
+        self._count(task.id, (task.done, task.category, task.due_date), 1)
+
+    def discard(self, task: Task) -> None:
+        # Mit den beim Einfügen gezählten Werten, nicht den aktuellen
+        values = self._counted.get(task.id)
+        if values is not None:
+            self._count(task.id, values, -1)
+
+    def _count(self, task_id: str, values: Tuple[bool, str, Optional[date]],
+               delta: int) -> None:
+        done, category, due = values
+        if delta > 0:
+            self._counted[task_id] = values
+        else:
+            del self._counted[task_id]
+        self.total += delta
+        self.done += delta if done else 0
+        self.categories[category] += delta
+        if not self.categories[category]:
+            del self.categories[category]
+        if due:
+            self._due[due] += delta
+            if not done:
+                self._open_due[due] += delta
+                if self._today is not None and due < self._today:
+                    self._overdue += delta
+
+    def clear(self) -> None:
+        self.total = self.done = self._overdue = 0
+        self.categories.clear()
+        self._open_due.clear()
+        self._due.clear()
+        self._counted.clear()
+
+    def overdue(self, today: date) -> int:
+        if today != self._today:
+            self._today = today
+            self._overdue = sum(n for due, n in self._open_due.items() if due < today)
+        return self._overdue
+
+    def due_today(self, today: date) -> int:
+        return self._due.get(today, 0)
+
+
+class TaskList(MutableSequence):
+    """
+    Geordnete Task-Liste mit Hash-Index über die ID.
+    Verhält sich wie eine list (Reihenfolge = Einfügereihenfolge),
+    aber Suchen, Anhängen und Entfernen per ID kosten O(1).
+    Zugriffe über die Position (tasks[i], insert) sind O(n).
+    IDs sind eindeutig: ein Task mit bereits vorhandener ID ersetzt
+    den alten an dessen Position.
+    Angehängte Sekundärindizes (TaskIndex) werden mitgeführt; Feldänderungen
+    an enthaltenen Tasks müssen in changing() erfolgen.
+    """
+
+    def __init__(self, tasks: Iterable[Task] = ()):
+        self._by_id: Dict[str, Task] = {}
+        # Laufende Nummer je ID, um Index-Ergebnisse in Listenreihenfolge zu bringen
+        self._seq: Dict[str, int] = {}
+        self._next_seq = 0
+        self._indexes: List[TaskIndex] = []
+        for task in tasks:
+            self.append(task)
+
+    # Sekundärindizes
+
+    def attach(self, index: TaskIndex) -> None:
+        """Hängt einen Index an und baut ihn aus dem aktuellen Bestand auf."""
+        if index in self._indexes:
+            return
+        index.rebuild(self._by_id.values())
+        self._indexes.append(index)
+
+    def detach(self, index: TaskIndex) -> None:
+        if index in self._indexes:
+            self._indexes.remove(index)
+
+    @contextmanager
+    def changing(self, task: Task):
+        """Hält die Indizes aktuell, während Felder eines Tasks geändert werden."""
+        indexed = self._by_id.get(task.id) is task
+        if indexed:
+            for index in self._indexes:
+                index.discard(task)
+        try:
+            yield task
+        finally:
+            if indexed:
+                for index in self._indexes:
+                    index.add(task)
+
+    def ordered(self, tasks: Iterable[Task]) -> List[Task]:
+        """Bringt Tasks (z.B. aus einem Index) in Listenreihenfolge."""
+        seq = self._seq
+        return sorted(tasks, key=lambda task: seq[task.id])
+
+    # Zugriff über die ID
+
+    def get(self, task_id: str) -> Optional[Task]:
+        """Gibt Task anhand ID zurück (O(1))."""
+        return self._by_id.get(task_id)
+
+    def pop_id(self, task_id: str) -> Optional[Task]:
+        """Entfernt Task anhand ID und gibt ihn zurück (O(1))."""
+        task = self._by_id.pop(task_id, None)
+        if task is not None:
+            del self._seq[task_id]
+            for index in self._indexes:
+                index.discard(task)
+        return task
+
+    # list-Verhalten
+
+    def append(self, task: Task) -> None:
+        old = self._by_id.get(task.id)
+        if old is not None:
+            for index in self._indexes:
+                index.discard(old)
+        else:
+            self._seq[task.id] = self._next_seq
+            self._next_seq += 1
+        self._by_id[task.id] = task
+        for index in self._indexes:
+            index.add(task)
+
+    def extend(self, tasks: Iterable[Task]) -> None:
+        for task in tasks:
+            self.append(task)
+
+    def remove(self, task: Task) -> None:
+        if self._by_id.get(getattr(task, "id", None)) != task:
+            raise ValueError("Task nicht in der Liste")
+        self.pop_id(task.id)
+
+    def pop(self, index: int = -1) -> Task:
+        if not self._by_id:
+            raise IndexError("pop aus leerer TaskList")
+        if index == -1:
+            task_id = next(reversed(self._by_id))
+        else:
+            task_id = self[index].id
+        return self.pop_id(task_id)
+
+    def clear(self) -> None:
+        self._by_id.clear()
+        self._seq.clear()
+        for index in self._indexes:
+            index.clear()
+
+    def copy(self) -> List[Task]:
+        return list(self._by_id.values())
+
+    def insert(self, index: int, task: Task) -> None:
+        tasks = [t for t in self._by_id.values() if t.id != task.id]
+        tasks.insert(index, task)
+        self._rebuild(tasks)
+
+    def _rebuild(self, tasks: List[Task]) -> None:
+        self.clear()
+        for task in tasks:
+            self.append(task)
+
+    def __getitem__(self, index):
+        if isinstance(index, int) and 0 <= index < len(self._by_id):
+            return next(islice(self._by_id.values(), index, None))
+        return list(self._by_id.values())[index]
+
+    def __setitem__(self, index, task) -> None:
+        tasks = list(self._by_id.values())
+        tasks[index] = task
+        self._rebuild(tasks)
+
+    def __delitem__(self, index) -> None:
+        tasks = self[index]
+        for task in tasks if isinstance(index, slice) else [tasks]:
+            self.pop_id(task.id)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[Task]:
+        return iter(self._by_id.values())
+
+    def __reversed__(self) -> Iterator[Task]:
+        return reversed(self._by_id.values())
+
+    def __contains__(self, task) -> bool:
+        return self._by_id.get(getattr(task, "id", None)) == task
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, TaskList)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"TaskList({list(self._by_id.values())!r})"
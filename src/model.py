@@ -1,32 +1,126 @@
-from dataclasses import dataclass, field
-from datetime import datetime, date
-from uuid import uuid4
-from typing import Optional
+import os
+import sys
+from datetime import datetime, date, timedelta
+from typing import Optional, Union
+
+_EPOCH = datetime(1970, 1, 1)
+_MICRO = timedelta(microseconds=1)
+
+
+def _created_to_micros(created_at: str) -> Optional[int]:
+    """Wandelt einen ISO-Zeitstempel verlustfrei in µs seit 1970 um."""
+    try:
+        dt = datetime.fromisoformat(created_at)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is not None or dt.isoformat() != created_at:
+        return None
+    return (dt - _EPOCH) // _MICRO
+
+
+def _new_id() -> str:
+    """8 Hex-Zeichen wie der Anfang einer uuid4."""
+    return os.urandom(4).hex()
 
 
-@dataclass
 class Task:
     #Repräsentiert eine Aufgabe
-    title: str
-    done: bool = False
-    category: str = ""
-    due_date: Optional[date] = None
-    id: str = field(default_factory=lambda: str(uuid4())[:8])
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    #__slots__ statt __dict__; category wird interniert, created_at liegt
+    #als µs seit 1970 vor (nicht verlustfrei darstellbare Strings bleiben roh).
+    __slots__ = ("title", "done", "_category", "due_date", "id", "_created")
+
+    def __init__(self, title: str, done: bool = False, category: str = "",
+                 due_date: Optional[date] = None, id: Optional[str] = None,
+                 created_at: Optional[str] = None):
+        self.title = title
+        self.done = done
+        self.category = category
+        self.due_date = due_date
+        self.id = _new_id() if id is None else id
+        if created_at is None:
+            self._created: Union[int, str] = (datetime.now() - _EPOCH) // _MICRO
+        else:
+            self.created_at = created_at
+
+    @property
+    def category(self) -> str:
+        return self._category
+
+    @category.setter
+    def category(self, value: str) -> None:
+        self._category = sys.intern(value) if type(value) is str else value
+
+    @property
+    def created_at(self) -> str:
+        created = self._created
+        if type(created) is int:
+            return (_EPOCH + created * _MICRO).isoformat()
+        return created
+
+    @created_at.setter
+    def created_at(self, value: str) -> None:
+        micros = _created_to_micros(value)
+        self._created = value if micros is None else micros
+
+    @property
+    def created_micros(self) -> Optional[int]:
+        """created_at als µs seit 1970 (None, wenn nur als String darstellbar)."""
+        created = self._created
+        return created if type(created) is int else None
+
+    @classmethod
+    def _restore(cls, title: str, done: bool, category: str, due_date: Optional[date],
+                 id: str, created: Union[int, str]) -> "Task":
+        """
+        Erzeugt einen Task aus gespeicherten Feldern ohne Umwege
+        (created: µs oder Rohstring).
+        """
+        task = cls.__new__(cls)
+        task.title = title
+        task.done = done
+        task.category = category
+        task.due_date = due_date
+        task.id = id
+        task._created = created
+        return task
+
+    def _fields(self) -> tuple:
+        """Gespeicherte Felder (created_at als µs oder Rohstring)."""
+        return (self.title, self.done, self._category, self.due_date, self.id, self._created)
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.id == other.id and self.title == other.title and self.done == other.done
+                and self._category == other._category and self._created == other._created
+                and self.due_date == other.due_date)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (f"Task(title={self.title!r}, done={self.done!r}, category={self.category!r}, "
+                f"due_date={self.due_date!r}, id={self.id!r}, created_at={self.created_at!r})")
+
+    def __getstate__(self) -> tuple:
+        return self._fields()
+
+    def __setstate__(self, state: tuple) -> None:
+        self.title, self.done, category, self.due_date, self.id, self._created = state
+        self.category = category
     
     def toggle(self) -> None:
         """Wechselt den Erledigt-Status."""
         self.done = not self.done
     
-    def is_overdue(self) -> bool:
-        """Prüft ob Task überfällig ist."""
+    def is_overdue(self, today: Optional[date] = None) -> bool:
+        """Prüft ob Task überfällig ist (today: Stichtag, Standard heute)."""
         if self.due_date and not self.done:
-            return self.due_date < date.today()
+            return self.due_date < (today or date.today())
         return False
     
-    def is_due_today(self) -> bool:
-        """Prüft ob Task heute fällig ist."""
-        return self.due_date == date.today() if self.due_date else False
+    def is_due_today(self, today: Optional[date] = None) -> bool:
+        """Prüft ob Task heute fällig ist (today: Stichtag, Standard heute)."""
+        return self.due_date == (today or date.today()) if self.due_date else False
     
     def to_dict(self) -> dict:
         """Konvertiert Task zu Dictionary für JSON-Serialisierung."""
@@ -41,12 +135,14 @@ class Task:
     
     @staticmethod
     def from_dict(data: dict) -> "Task":
-        """Erstellt Task aus Dictionary."""
-        return Task(
-            id=data["id"],
-            title=data["title"],
-            done=data["done"],
-            category=data.get("category", ""),
-            due_date=date.fromisoformat(data["due_date"]) if data.get("due_date") else None,
-            created_at=data.get("created_at", datetime.now().isoformat())
-        )
+        """
+        Erstellt Task aus Dictionary.
+        
+        Raises:
+            ValueError: Wenn due_date kein ISO-Datum ist
+        """
+        due = data.get("due_date")
+        task = Task._restore(data["title"], data["done"], data.get("category", ""),
+                             date.fromisoformat(due) if due else None, data["id"], 0)
+        task.created_at = data.get("created_at", datetime.now().isoformat())
+        return task
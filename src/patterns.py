@@ -1,10 +1,13 @@
+import threading
 from abc import ABC, abstractmethod
 from typing import Optional, List, TYPE_CHECKING
 from datetime import date
 from model import Task
+from query import TaskQuery
 
 if TYPE_CHECKING:
     from controller import TaskController
+    from flusher import WriteBehindFlusher
 
 
 # FACTORY PATTERN
@@ -144,10 +147,16 @@ class TaskMediator:
         mediator = TaskMediator(controller, repository)
         mediator.add_task("Neue Aufgabe", category="Arbeit")
         mediator.toggle_task(task_id)
+    
+    Mit einem WriteBehindFlusher wird nicht mehr synchron gespeichert,
+    sondern gebündelt im Hintergrund (flush() schreibt sofort).
     """
     
-    def __init__(self, controller: "TaskController"):
+    def __init__(self, controller: "TaskController",
+                 flusher: Optional["WriteBehindFlusher"] = None):
         self.controller = controller
+        self.flusher = flusher
+        self._lock = flusher.lock if flusher else threading.RLock()
         self._listeners: List[callable] = []
     
     def add_listener(self, callback: callable) -> None:
@@ -159,14 +168,27 @@ class TaskMediator:
         for listener in self._listeners:
             listener(event)
     
+    def _save(self) -> None:
+        """Speichert sofort oder meldet die Änderung dem Flusher."""
+        if self.flusher:
+            self.flusher.mark_dirty()
+        else:
+            self.controller.save()
+    
+    def flush(self) -> None:
+        """Schreibt ausstehende Änderungen sofort (nur im Write-Behind-Modus nötig)."""
+        if self.flusher:
+            self.flusher.flush()
+    
     # Task-Operationen (delegiert an Controller)
     
     def add_task(self, title: str, category: str = "", 
                  due_date: Optional[date] = None) -> Optional[Task]:
         """Fügt einen Task hinzu und benachrichtigt Listener."""
         try:
-            task = self.controller.add(title, category, due_date)
-            self.controller.save()
+            with self._lock:
+                task = self.controller.add(title, category, due_date)
+                self._save()
             self._notify("task_added")
             return task
         except ValueError:
@@ -174,17 +196,21 @@ class TaskMediator:
     
     def delete_task(self, task_id: str) -> bool:
         """Löscht einen Task und benachrichtigt Listener."""
-        result = self.controller.delete(task_id)
+        with self._lock:
+            result = self.controller.delete(task_id)
+            if result:
+                self._save()
         if result:
-            self.controller.save()
             self._notify("task_deleted")
         return result
     
     def toggle_task(self, task_id: str) -> bool:
         """Wechselt Task-Status und benachrichtigt Listener."""
-        result = self.controller.toggle(task_id)
+        with self._lock:
+            result = self.controller.toggle(task_id)
+            if result:
+                self._save()
         if result:
-            self.controller.save()
             self._notify("task_toggled")
         return result
     
@@ -192,14 +218,61 @@ class TaskMediator:
                     category: str = None, due_date: Optional[date] = None) -> bool:
         """Aktualisiert einen Task und benachrichtigt Listener."""
         try:
-            result = self.controller.update(task_id, title, category, due_date)
+            with self._lock:
+                result = self.controller.update(task_id, title, category, due_date)
+                if result:
+                    self._save()
             if result:
-                self.controller.save()
                 self._notify("task_updated")
             return result
         except ValueError:
             return False
     
+    # Sammeloperationen (ein Speichern, eine Benachrichtigung)
+    
+    def add_many(self, titles: List[str], category: str = "",
+                 due_date: Optional[date] = None) -> List[Task]:
+        """Fügt mehrere Tasks hinzu; leere Titel werden übersprungen."""
+        tasks = [Task(title=t.strip(), category=category, due_date=due_date)
+                 for t in titles if t and t.strip()]
+        if not tasks:
+            return []
+        with self._lock:
+            self.controller.add_many(tasks)
+            self._save()
+        self._notify("tasks_added")
+        return tasks
+    
+    def delete_many(self, task_ids: List[str]) -> int:
+        """Löscht mehrere Tasks, gibt Anzahl gelöschter zurück."""
+        return self._bulk("tasks_deleted", self.controller.delete_many, task_ids)
+    
+    def toggle_many(self, task_ids: List[str]) -> int:
+        """Wechselt den Status mehrerer Tasks."""
+        return self._bulk("tasks_toggled", self.controller.toggle_many, task_ids)
+    
+    def set_done_many(self, task_ids: List[str], done: bool = True) -> int:
+        """Setzt den Status mehrerer Tasks (nur abweichende werden geändert)."""
+        return self._bulk("tasks_toggled", self.controller.set_done_many, task_ids, done)
+    
+    def update_many(self, task_ids: List[str], title: str = None,
+                    category: str = None, due_date: Optional[date] = None) -> int:
+        """Aktualisiert mehrere Tasks; leerer Titel ändert nichts und gibt 0 zurück."""
+        try:
+            return self._bulk("tasks_updated", self.controller.update_many,
+                              task_ids, title, category, due_date)
+        except ValueError:
+            return 0
+    
+    def _bulk(self, event: str, operation, *args) -> int:
+        with self._lock:
+            count = operation(*args)
+            if count:
+                self._save()
+        if count:
+            self._notify(event)
+        return count
+    
     # Abfragen (delegiert an Controller)
     
     def get_all_tasks(self) -> List[Task]:
@@ -226,21 +299,59 @@ class TaskMediator:
         """Filtert Tasks nach Kategorie."""
         return self.controller.get_by_category(category)
     
+    def get_overdue_tasks(self) -> List[Task]:
+        """Gibt überfällige Tasks zurück (nach Fälligkeit sortiert)."""
+        return self.controller.get_overdue()
+    
+    def get_upcoming_tasks(self, days: int = 7) -> List[Task]:
+        """Gibt offene Tasks zurück, die in den nächsten days Tagen fällig sind."""
+        return self.controller.get_upcoming(days)
+    
+    def search_tasks(self, text: str) -> List[Task]:
+        """Sucht Tasks nach Wortanfängen im Titel."""
+        return self.controller.search(text)
+    
+    def query_tasks(self, query: TaskQuery) -> List[Task]:
+        """Führt eine zusammengesetzte Abfrage aus (Filter, Sortierung, Limit)."""
+        return self.controller.query(query)
+    
+    def count_tasks(self, query: TaskQuery) -> int:
+        """Zählt die Treffer einer Abfrage (ohne limit/offset)."""
+        return self.controller.count(query)
+    
+    def get_statistics(self) -> dict:
+        """Gibt Statistiken über die Tasks zurück."""
+        return self.controller.get_statistics()
+    
+    def get_version(self) -> int:
+        """Änderungszähler des Controllers (gleich = Bestand unverändert)."""
+        return self.controller.version
+    
+    def get_task_version(self, task_id: str) -> int:
+        """Version eines Tasks (ändert sich mit jeder Änderung am Task)."""
+        return self.controller.task_version(task_id)
+    
     # Factory-Integration
     
     def add_typed_task(self, task_type: str, title: str, **kwargs) -> Task:
         """Erstellt einen Task über die Factory und fügt ihn hinzu."""
         task = TaskFactory.create(task_type, title, **kwargs)
-        self.controller.tasks.append(task)
-        self.controller.save()
+        with self._lock:
+            self.controller.add_task(task)
+            self._save()
         self._notify("task_added")
         return task
     
     def import_external_tasks(self, externals: List[ExternalTaskFormat]) -> int:
         """Importiert externe Tasks über den Adapter."""
         tasks = TaskAdapter.adapt_many(externals)
-        for task in tasks:
-            self.controller.tasks.append(task)
-        self.controller.save()
+        with self._lock:
+            for task in tasks:
+                self.controller.add_task(task)
+            self._save()
         self._notify("tasks_imported")
         return len(tasks)
+    
+    def import_tasks(self, tasks: List[Task]) -> int:
+        """Übernimmt Tasks (z.B. aus einem Export); gleiche ID ersetzt den vorhandenen Task."""
+        return self._bulk("tasks_imported", lambda t: len(self.controller.add_many(t)), tasks)
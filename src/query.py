@@ -0,0 +1,120 @@
+#Query: Zusammensetzbare Abfragen über Tasks.
+#Der Controller wählt die Kandidaten über seine Indizes aus,
+#execute() filtert sie in einem Durchlauf, sortiert und schneidet zu.
+
+import heapq
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Iterable, List, Optional, Sized
+from model import Task
+from indexes import matches_text
+
+STATUS_OPEN = "open"
+STATUS_DONE = "done"
+
+SORT_INSERTION = "insertion"  # Reihenfolge des Anlegens
+SORT_SMART = "smart"          # Überfällig -> Heute -> Datum -> ohne Datum -> erledigt
+SORT_DUE = "due"              # Fälligkeit, ohne Datum zuletzt
+SORT_TITLE = "title"
+
+_STATUSES = (None, STATUS_OPEN, STATUS_DONE)
+_SORTS = (SORT_INSERTION, SORT_SMART, SORT_DUE, SORT_TITLE)
+
+
+@dataclass(frozen=True)
+class TaskQuery:
+    """
+    Beschreibt eine Abfrage; None bzw. "" bedeutet "kein Filter".
+    due_from und due_to sind inklusiv, Tasks ohne Fälligkeit fallen
+    bei gesetztem Bereich heraus. text sucht wie TaskController.search()
+    nach Wortanfängen im Titel; ein Text ohne Wörter (z.B. "🔨") filtert nicht.
+
+    Beispiel:
+        TaskQuery(status="open", category="Arbeit", sort="smart", limit=20)
+    """
+    status: Optional[str] = None
+    category: Optional[str] = None
+    due_from: Optional[date] = None
+    due_to: Optional[date] = None
+    text: str = ""
+    sort: str = SORT_INSERTION
+    limit: Optional[int] = None
+    offset: int = 0
+
+    def __post_init__(self):
+        if self.status not in _STATUSES:
+            raise ValueError(f"Unbekannter Status: {self.status}")
+        if self.sort not in _SORTS:
+            raise ValueError(f"Unbekannte Sortierung: {self.sort}")
+        if self.offset < 0 or (self.limit is not None and self.limit < 0):
+            raise ValueError("limit und offset dürfen nicht negativ sein")
+
+    @property
+    def has_due_range(self) -> bool:
+        return self.due_from is not None or self.due_to is not None
+
+    def predicate(self) -> Optional[Callable[[Task], bool]]:
+        """Prüffunktion für alle gesetzten Filter (None = kein Filter)."""
+        checks: List[Callable[[Task], bool]] = []
+        if self.status is not None:
+            done = self.status == STATUS_DONE
+            checks.append(lambda t: t.done == done)
+        if self.category is not None:
+            category = self.category
+            checks.append(lambda t: t.category == category)
+        if self.has_due_range:
+            start, end = self.due_from or date.min, self.due_to or date.max
+            checks.append(lambda t: t.due_date is not None and start <= t.due_date <= end)
+        if self.text:
+            text = self.text
+            checks.append(lambda t: matches_text(text, t.title))
+        if not checks:
+            return None
+        if len(checks) == 1:
+            return checks[0]
+        return lambda t: all(check(t) for check in checks)
+
+
+def sort_key(sort: str, today: date) -> Optional[Callable[[Task], tuple]]:
+    """Sortierschlüssel für einen Modus (None = Reihenfolge beibehalten)."""
+    if sort == SORT_SMART:
+        def key(t: Task) -> tuple:
+            if t.done: return (4, date.max)
+            due = t.due_date
+            if due is None: return (3, date.max)
+            if due < today: return (0, due)
+            if due == today: return (1, due)
+            return (2, due)
+        return key
+    if sort == SORT_DUE:
+        return lambda t: (t.due_date is None, t.due_date or date.max)
+    if sort == SORT_TITLE:
+        return lambda t: t.title.casefold()
+    return None
+
+
+def count(query: TaskQuery, candidates: Iterable[Task]) -> int:
+    """Zählt die Treffer unter den Kandidaten (ohne Sortierung, limit und offset)."""
+    match = query.predicate()
+    if match is None:
+        return len(candidates) if isinstance(candidates, Sized) else sum(1 for _ in candidates)
+    return sum(1 for t in candidates if match(t))
+
+
+def execute(query: TaskQuery, candidates: Iterable[Task], today: date,
+            order: Optional[Callable[[Iterable[Task]], List[Task]]] = None) -> List[Task]:
+    """
+    Filtert die Kandidaten in einem Durchlauf und sortiert stabil.
+    order bringt Treffer in Listenreihenfolge, falls die Kandidaten
+    ungeordnet sind (z.B. aus einem Index).
+    """
+    match = query.predicate()
+    hits = list(candidates) if match is None else [t for t in candidates if match(t)]
+    if order is not None:
+        hits = order(hits)
+    key = sort_key(query.sort, today)
+    stop = None if query.limit is None else query.offset + query.limit
+    if key is not None:
+        # nsmallest ist stabil wie sorted, aber günstiger bei kleinem Limit
+        hits = heapq.nsmallest(stop, hits, key=key) if stop is not None else sorted(hits, key=key)
+    return hits[query.offset:stop]
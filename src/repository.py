@@ -1,11 +1,35 @@
 #Repository: Persistenz-Schicht für die TODO-App.
 #Abstrahiert den Datenzugriff vom Rest der Anwendung.
 
+import codecs
 import json
+import logging
+import mmap
 import os
-from typing import List, Optional
+import re
+import sqlite3
+import threading
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date
+from typing import IO, Callable, Dict, Iterator, List, Optional, Tuple, Union
 from abc import ABC, abstractmethod
 from model import Task
+from indexes import matches_text, tokenize
+from query import (
+    TaskQuery, STATUS_OPEN, STATUS_DONE, SORT_SMART, SORT_DUE, SORT_TITLE,
+    count as count_matches, execute,
+)
+from codec import TaskCodec, decode_tasks
+from snapshot import encode_snapshot, read_snapshot
+
+try:
+    import fcntl
+except ImportError:  # Windows: kein fcntl, Saves laufen dann ohne Lock
+    fcntl = None
+
+logger = logging.getLogger(__name__)
 
 
 class TaskRepositoryInterface(ABC):
@@ -25,39 +49,1104 @@ class TaskRepositoryInterface(ABC):
     def clear(self) -> None:
         """Löscht alle Tasks."""
         pass
+    
+    def iter_load(self) -> Iterator[Task]:
+        """Lädt Tasks einzeln nacheinander (Standard: über load())."""
+        yield from self.load()
+
+
+@dataclass
+class TaskChangeSet:
+    """Änderungen seit dem letzten Speichern: geänderte/neue Tasks und gelöschte IDs."""
+    upserts: List[Task] = field(default_factory=list)
+    deletes: List[str] = field(default_factory=list)
+    
+    def __bool__(self) -> bool:
+        return bool(self.upserts or self.deletes)
+
+
+class TaskChangeSetInterface(ABC):
+    """
+    Optionale Schnittstelle für Repositories, die nur die geänderten
+    Tasks schreiben können (Teil-Speicherung statt Full-Save).
+    """
+    
+    @abstractmethod
+    def save_changes(self, changes: TaskChangeSet) -> None:
+        """Schreibt nur die übergebenen Änderungen."""
+        pass
+
+
+class TaskQueryInterface(ABC):
+    """
+    Optionale Schnittstelle für Repositories, die Abfragen selbst
+    ausführen können (Query-Pushdown) und zeilenweise schreiben.
+    """
+    
+    @abstractmethod
+    def find_by_id(self, task_id: str) -> Optional[Task]:
+        """Gibt Task anhand ID zurück."""
+        pass
+    
+    @abstractmethod
+    def find_open(self) -> List[Task]:
+        """Gibt offene Tasks zurück."""
+        pass
+    
+    @abstractmethod
+    def find_done(self) -> List[Task]:
+        """Gibt erledigte Tasks zurück."""
+        pass
+    
+    @abstractmethod
+    def find_by_category(self, category: str) -> List[Task]:
+        """Filtert Tasks nach Kategorie."""
+        pass
+    
+    @abstractmethod
+    def find_categories(self) -> List[str]:
+        """Gibt alle verwendeten Kategorien zurück (sortiert)."""
+        pass
+    
+    @abstractmethod
+    def find_overdue(self, today: date) -> List[Task]:
+        """Gibt offene Tasks mit Fälligkeit vor today zurück, nach Fälligkeit sortiert."""
+        pass
+    
+    @abstractmethod
+    def find_due_today(self, today: date) -> List[Task]:
+        """Gibt an today fällige Tasks zurück."""
+        pass
+    
+    def find_due_between(self, start: Optional[date], end: Optional[date]) -> List[Task]:
+        """
+        Gibt offene Tasks mit start <= Fälligkeit < end zurück, nach
+        Fälligkeit sortiert (None = unbegrenzt). Standard: Filter über find_open().
+        """
+        return sorted(
+            (t for t in self.find_open() if t.due_date
+             and (start is None or t.due_date >= start)
+             and (end is None or t.due_date < end)),
+            key=lambda t: t.due_date,
+        )
+    
+    def find_query(self, query: TaskQuery, today: date) -> List[Task]:
+        """
+        Führt eine Abfrage aus (Filter, Sortierung, limit/offset), Ergebnis
+        in Einfügereihenfolge vor der Sortierung. Standard: ein Filter über
+        find_by_category()/find_open()/find_done(), der Rest im Speicher.
+        """
+        return execute(query, self._query_candidates(query), today)
+    
+    def count_query(self, query: TaskQuery) -> int:
+        """Zählt die Treffer einer Abfrage (ohne limit/offset)."""
+        return count_matches(query, self._query_candidates(query))
+    
+    def _query_candidates(self, query: TaskQuery) -> List[Task]:
+        if query.category is not None:
+            return self.find_by_category(query.category)
+        if query.status == STATUS_OPEN:
+            return self.find_open()
+        if query.status == STATUS_DONE:
+            return self.find_done()
+        return self.load()
+    
+    @abstractmethod
+    def count_statistics(self, today: date) -> dict:
+        """Zählt total, done, open, overdue und due_today."""
+        pass
+    
+    def count_by_category(self) -> Dict[str, int]:
+        """Zählt Tasks je Kategorie ("" = ohne). Standard: über load()."""
+        counts: Dict[str, int] = {}
+        for task in self.load():
+            counts[task.category] = counts.get(task.category, 0) + 1
+        return counts
+    
+    @abstractmethod
+    def upsert(self, tasks: List[Task]) -> None:
+        """Fügt Tasks ein oder aktualisiert bestehende."""
+        pass
+    
+    @abstractmethod
+    def delete(self, task_ids: List[str]) -> int:
+        """Löscht Tasks anhand ihrer IDs, gibt Anzahl gelöschter zurück."""
+        pass
+
+
+@contextmanager
+def _exclusive_lock(lock_path: str):
+    """
+    Advisory-Lock (fcntl) über eine separate Lock-Datei.
+    Serialisiert Schreiber prozessübergreifend, Leser bleiben ungesperrt.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(lock_path, "a") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _move_corrupt(filepath: str, error: Exception) -> None:
+    """Verschiebt eine unlesbare Datei nach <filepath>.corrupt und protokolliert das."""
+    os.replace(filepath, filepath + ".corrupt")
+    logger.error("%s ist beschädigt (%s), nach %s.corrupt verschoben", filepath, error, filepath)
+
+
+def _create_temp(filepath: str, prefix: str) -> Tuple[int, str]:
+    """
+    Legt exklusiv eine Temp-Datei neben filepath an, die filepath per
+    os.replace ersetzen soll. Wie bei open() gilt 0666 abzüglich umask
+    (mkstemp nähme 0600); die Rechte einer vorhandenen Datei übernimmt
+    _write_atomic().
+    """
+    directory = os.path.dirname(os.path.abspath(filepath))
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    while True:
+        tmp_path = os.path.join(directory, f"{prefix}{os.urandom(6).hex()}.tmp")
+        try:
+            return os.open(tmp_path, flags, 0o666), tmp_path
+        except FileExistsError:
+            continue
+
+
+def _write_atomic(filepath: str, write: Callable[[IO], None], binary: bool = False,
+                  fsync: bool = True, prefix: str = ".tasks-") -> None:
+    """
+    Schreibt über write(f) in eine Temp-Datei im selben Verzeichnis,
+    synchronisiert sie (fsync) und ersetzt das Ziel atomar. Ein Absturz
+    hinterlässt so entweder die alte oder die neue Datei, nie eine halb
+    geschriebene. Die Rechte einer vorhandenen Datei bleiben erhalten.
+    """
+    fd, tmp_path = _create_temp(filepath, prefix)
+    try:
+        with os.fdopen(fd, "wb" if binary else "w", encoding=None if binary else "utf-8") as f:
+            write(f)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        try:
+            os.chmod(tmp_path, os.stat(filepath).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _write_json_atomic(filepath: str, data: Union[list, dict, str]) -> None:
+    """
+    Schreibt JSON atomar (siehe _write_atomic).
+    Ein String wird als bereits kodiertes JSON unverändert geschrieben.
+    """
+    if isinstance(data, str):
+        _write_atomic(filepath, lambda f: f.write(data))
+    else:
+        _write_atomic(filepath, lambda f: json.dump(data, f, ensure_ascii=False, indent=2))
+
+
+_JSON_SEPARATORS = re.compile(r"[\s,]*")
+
+
+def _iter_json_array(buffer, chunk_size: int = 1 << 16) -> Iterator[dict]:
+    """
+    Parst ein JSON-Array aus einem Byte-Puffer (z.B. mmap) stückweise
+    und liefert die Elemente einzeln. Im Speicher liegt nur der gerade
+    dekodierte Ausschnitt, nie die ganze Datei als String.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    size = len(buffer)
+    text, pos, offset = "", 0, 0
+    in_array = False
+    while True:
+        pos = _JSON_SEPARATORS.match(text, pos).end()
+        if pos < len(text):
+            if not in_array:
+                if text[pos] != "[":
+                    raise json.JSONDecodeError("JSON-Array erwartet", text, pos)
+                in_array = True
+                pos += 1
+                continue
+            if text[pos] == "]":
+                return
+            try:
+                obj, pos = decoder.raw_decode(text, pos)
+            except json.JSONDecodeError:
+                if offset >= size:
+                    raise
+            else:
+                yield obj
+                continue
+        elif offset >= size:
+            raise json.JSONDecodeError("Unerwartetes Dateiende", text, pos)
+        # Nächsten Block nachladen, unverarbeiteten Rest behalten
+        chunk = buffer[offset:offset + chunk_size]
+        offset += len(chunk)
+        text, pos = text[pos:] + utf8.decode(chunk, offset >= size), 0
 
 
 class JSONTaskRepository(TaskRepositoryInterface):
     """
     Repository-Implementierung mit JSON-Datei als Persistenz.
     Kapselt alle Datei-Operationen.
-    Zum testen
+    Speichern ist atomar (Temp-Datei + os.replace) und durch ein
+    Lock auf <filepath>.lock gegen parallele Schreiber geschützt.
+    Mit use_snapshot=True wird beim Laden ein binärer Snapshot
+    (<filepath>.snap) genutzt; save() schreibt ihn gleich mit, ein von
+    außen veränderter Snapshot wird beim Laden neu erzeugt.
+    Unveränderte Tasks werden beim Speichern nicht neu kodiert (TaskCodec).
     """
     
-    def __init__(self, filepath: str = "tasks.json"):
+    def __init__(self, filepath: str = "tasks.json", use_snapshot: bool = False):
         self.filepath = filepath
+        self.lock_path = filepath + ".lock"
+        self.use_snapshot = use_snapshot
+        self.snapshot_path = filepath + ".snap"
+        self._codec = TaskCodec()
     
     def save(self, tasks: List[Task]) -> None:
         """Speichert Tasks persistent in JSON-Datei."""
-        with open(self.filepath, "w", encoding="utf-8") as f:
-            json.dump([t.to_dict() for t in tasks], f, ensure_ascii=False, indent=2)
+        text = self._codec.encode(tasks)
+        with _exclusive_lock(self.lock_path):
+            _write_json_atomic(self.filepath, text)
+            if self.use_snapshot:
+                # Unter dem Lock: die Datei kann sich zwischen replace und stat nicht ändern
+                self._write_snapshot(tasks, os.stat(self.filepath))
     
     def load(self) -> List[Task]:
-        """Lädt Tasks aus JSON-Datei."""
+        """
+        Lädt Tasks aus JSON-Datei.
+        Eine beschädigte Datei wird nach <filepath>.corrupt verschoben,
+        damit der nächste save() sie nicht kommentarlos überschreibt.
+        """
         if not os.path.exists(self.filepath):
             return []
+        if self.use_snapshot:
+            return self._load_with_snapshot()
         try:
-            with open(self.filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return [Task.from_dict(d) for d in data]
+            return self._read()
         except (json.JSONDecodeError, KeyError):
+            pass
+        return self._recover()
+    
+    def _load_with_snapshot(self) -> List[Task]:
+        """Lädt aus dem Snapshot oder erzeugt ihn aus der JSON-Datei neu."""
+        try:
+            stat = os.stat(self.filepath)
+        except FileNotFoundError:
             return []
+        tasks = read_snapshot(self.snapshot_path, stat)
+        if tasks is not None:
+            return tasks
+        try:
+            tasks = self._read()
+        except (json.JSONDecodeError, KeyError):
+            return self._recover()
+        except FileNotFoundError:
+            return []
+        self._write_snapshot(tasks, stat)
+        return tasks
+    
+    def _write_snapshot(self, tasks: List[Task], stat: os.stat_result) -> None:
+        blob = encode_snapshot(tasks, stat)
+        if blob is None:
+            return
+        try:
+            # Ohne fsync: der Snapshot ist nur ein Cache
+            _write_atomic(self.snapshot_path, lambda f: f.write(blob), binary=True,
+                          fsync=False, prefix=".snapshot-")
+        except OSError:
+            pass
+    
+    def _recover(self) -> List[Task]:
+        with _exclusive_lock(self.lock_path):
+            # Erneut prüfen: ein anderer Prozess könnte inzwischen gespeichert haben
+            try:
+                return self._read()
+            except FileNotFoundError:
+                return []
+            except (json.JSONDecodeError, KeyError) as e:
+                _move_corrupt(self.filepath, e)
+                return []
+    
+    def _read(self) -> List[Task]:
+        with open(self.filepath, "r", encoding="utf-8") as f:
+            return decode_tasks(json.load(f))
+    
+    def iter_load(self, chunk_size: int = 1 << 16) -> Iterator[Task]:
+        """
+        Lädt Tasks einzeln aus der memory-gemappten JSON-Datei.
+        Spart den Zwischenschritt über die komplette Dict-Liste und
+        liefert den ersten Task, bevor die Datei ganz gelesen ist.
+        
+        Raises:
+            ValueError: Wenn die Datei kein gültiges JSON-Array enthält
+        """
+        if not os.path.exists(self.filepath) or os.path.getsize(self.filepath) == 0:
+            return
+        with open(self.filepath, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for record in _iter_json_array(mm, chunk_size):
+                    yield Task.from_dict(record)
     
     def clear(self) -> None:
         """Löscht alle Tasks (leert die Datei)."""
         self.save([])
 
 
+class JournalTaskRepository(TaskRepositoryInterface, TaskChangeSetInterface):
+    """
+    Repository mit Append-only-Journal.
+    Jede Änderung wird als NDJSON-Zeile an <filepath>.journal angehängt,
+    statt die ganze Datei neu zu schreiben. load() liest den Snapshot
+    (<filepath>, gleiches Format wie JSONTaskRepository) und spielt das
+    Journal darauf ab; ein beschädigter Snapshot wird nach
+    <filepath>.corrupt verschoben, damit die nächste Kompaktierung ihn
+    nicht kommentarlos überschreibt. Überschreitet das Journal compact_threshold Bytes,
+    wird es im Hintergrund in einen neuen Snapshot kompaktiert.
+    """
+    
+    def __init__(self, filepath: str = "tasks.json",
+                 compact_threshold: int = 1_000_000, fsync: bool = False):
+        self.filepath = filepath
+        self.journal_path = filepath + ".journal"
+        self.compact_threshold = compact_threshold
+        self.fsync = fsync
+        # Zuletzt persistierter Zustand: id -> to_dict()-Record (in Reihenfolge)
+        self._records: Optional[Dict[str, dict]] = None
+        self._journal_size = 0
+        self._lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+    
+    @property
+    def _compacting_path(self) -> str:
+        return self.journal_path + ".compacting"
+    
+    def save(self, tasks: List[Task]) -> None:
+        """Hängt nur die Unterschiede zum letzten Stand an das Journal an."""
+        with self._lock:
+            if self._records is None:
+                self._records = self._replay()
+            current: Dict[str, dict] = {}
+            entries = []
+            for task in tasks:
+                record = task.to_dict()
+                current[task.id] = record
+                if self._records.get(task.id) != record:
+                    entries.append({"op": "put", "task": record})
+            for task_id in self._records:
+                if task_id not in current:
+                    entries.append({"op": "del", "id": task_id})
+            self._append(entries)
+            self._records = current
+            self._maybe_compact()
+    
+    def save_changes(self, changes: TaskChangeSet) -> None:
+        """Hängt genau die übergebenen Änderungen an das Journal an."""
+        with self._lock:
+            if self._records is None:
+                self._records = self._replay()
+            entries = []
+            for task in changes.upserts:
+                record = task.to_dict()
+                self._records[task.id] = record
+                entries.append({"op": "put", "task": record})
+            for task_id in changes.deletes:
+                if self._records.pop(task_id, None) is not None:
+                    entries.append({"op": "del", "id": task_id})
+            self._append(entries)
+            self._maybe_compact()
+    
+    def load(self) -> List[Task]:
+        """Lädt Snapshot und spielt das Journal darauf ab."""
+        self.wait_for_compaction()
+        with self._lock:
+            self._records = self._replay()
+            if os.path.exists(self._compacting_path):
+                # Abgebrochene Kompaktierung (z.B. Absturz) nachholen
+                _write_json_atomic(self.filepath, list(self._records.values()))
+                self._remove(self._compacting_path)
+                self._remove(self.journal_path)
+                self._journal_size = 0
+            return decode_tasks(self._records.values())
+    
+    def clear(self) -> None:
+        """Löscht Snapshot und Journal."""
+        self.wait_for_compaction()
+        with self._lock:
+            _write_json_atomic(self.filepath, [])
+            self._remove(self.journal_path)
+            self._records = {}
+            self._journal_size = 0
+    
+    def wait_for_compaction(self, timeout: Optional[float] = None) -> None:
+        """Wartet, bis eine laufende Hintergrund-Kompaktierung fertig ist."""
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join(timeout)
+    
+    # Journal
+    
+    def _append(self, entries: List[dict]) -> None:
+        if not entries:
+            return
+        lines = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entries)
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(lines)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+            self._journal_size = f.tell()
+    
+    def _replay(self) -> Dict[str, dict]:
+        """Baut den Zustand aus Snapshot + Journal(en) auf."""
+        records: Dict[str, dict] = {}
+        if os.path.exists(self.filepath):
+            try:
+                with open(self.filepath, "r", encoding="utf-8") as f:
+                    for record in json.load(f):
+                        records[record["id"]] = record
+            except (json.JSONDecodeError, KeyError, TypeError) as e:
+                _move_corrupt(self.filepath, e)
+                records = {}
+        for path in (self._compacting_path, self.journal_path):
+            self._replay_file(path, records)
+        self._journal_size = (os.path.getsize(self.journal_path)
+                              if os.path.exists(self.journal_path) else 0)
+        return records
+    
+    @staticmethod
+    def _replay_file(path: str, records: Dict[str, dict]) -> None:
+        if not os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    if entry["op"] == "put":
+                        records[entry["task"]["id"]] = entry["task"]
+                    elif entry["op"] == "del":
+                        records.pop(entry["id"], None)
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    # Abgeschnittene letzte Zeile nach Absturz überspringen
+                    continue
+    
+    # Kompaktierung
+    
+    def _maybe_compact(self) -> None:
+        """Startet die Kompaktierung im Hintergrund (Lock muss gehalten werden)."""
+        if self._journal_size < self.compact_threshold:
+            return
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        # Neue Änderungen landen ab jetzt in einem frischen Journal
+        os.replace(self.journal_path, self._compacting_path)
+        self._journal_size = 0
+        snapshot = list(self._records.values())
+        self._compactor = threading.Thread(
+            target=self._compact, args=(snapshot,), daemon=True
+        )
+        self._compactor.start()
+    
+    def _compact(self, snapshot: List[dict]) -> None:
+        _write_json_atomic(self.filepath, snapshot)
+        self._remove(self._compacting_path)
+    
+    @staticmethod
+    def _remove(path: str) -> None:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    done INTEGER NOT NULL DEFAULT 0,
+    category TEXT NOT NULL DEFAULT '',
+    due_date TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_done ON tasks(done);
+CREATE INDEX IF NOT EXISTS idx_tasks_category ON tasks(category);
+CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks(due_date);
+"""
+
+_SQLITE_COLUMNS = "id, title, done, category, due_date, created_at"
+
+
+class SQLiteTaskRepository(TaskRepositoryInterface, TaskQueryInterface,
+                           TaskChangeSetInterface):
+    """
+    Repository mit SQLite-Datenbank (WAL-Modus) als Persistenz.
+    Indizes auf done, category und due_date erlauben es, Abfragen
+    direkt in SQL auszuführen, ohne alle Tasks zu laden. Textsuche und
+    Titel-Sortierung laufen über Python-Funktionen in SQLite
+    (matches_text, casefold), damit sie dem Controller gleichen.
+    """
+    
+    def __init__(self, filepath: str = "tasks.db"):
+        self.filepath = filepath
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(filepath, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SQLITE_SCHEMA)
+        self._conn.create_function("matches_text", 2, matches_text, deterministic=True)
+        self._conn.create_function("casefold", 1, str.casefold, deterministic=True)
+    
+    def save(self, tasks: List[Task]) -> None:
+        """Gleicht die Tabelle mit der übergebenen Task-Liste ab."""
+        with self._lock, self._conn:
+            keep = {t.id for t in tasks}
+            stale = [(row[0],) for row in self._conn.execute("SELECT id FROM tasks")
+                     if row[0] not in keep]
+            self._conn.executemany("DELETE FROM tasks WHERE id = ?", stale)
+            self._upsert(tasks)
+    
+    def save_changes(self, changes: TaskChangeSet) -> None:
+        """Schreibt Änderungen in einer Transaktion."""
+        with self._lock, self._conn:
+            self._upsert(changes.upserts)
+            self._conn.executemany(
+                "DELETE FROM tasks WHERE id = ?", [(i,) for i in changes.deletes]
+            )
+    
+    def load(self) -> List[Task]:
+        """Lädt alle Tasks (in Einfügereihenfolge)."""
+        return self._select("1")
+    
+    def clear(self) -> None:
+        """Löscht alle Tasks."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM tasks")
+    
+    def close(self) -> None:
+        """Schließt die Datenbankverbindung."""
+        self._conn.close()
+    
+    # Abfragen (Pushdown)
+    
+    def find_by_id(self, task_id: str) -> Optional[Task]:
+        tasks = self._select("id = ?", (task_id,))
+        return tasks[0] if tasks else None
+    
+    def find_open(self) -> List[Task]:
+        return self._select("done = 0")
+    
+    def find_done(self) -> List[Task]:
+        return self._select("done = 1")
+    
+    def find_by_category(self, category: str) -> List[Task]:
+        return self._select("category = ?", (category,))
+    
+    def find_categories(self) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT category FROM tasks WHERE category != '' ORDER BY category"
+            ).fetchall()
+        return [row[0] for row in rows]
+    
+    def find_overdue(self, today: date) -> List[Task]:
+        return self._select("done = 0 AND due_date < ?", (today.isoformat(),),
+                            order="due_date, seq")
+    
+    def find_due_today(self, today: date) -> List[Task]:
+        return self._select("due_date = ?", (today.isoformat(),))
+    
+    def find_due_between(self, start: Optional[date], end: Optional[date]) -> List[Task]:
+        where, params = "done = 0 AND due_date IS NOT NULL", []
+        if start is not None:
+            where += " AND due_date >= ?"
+            params.append(start.isoformat())
+        if end is not None:
+            where += " AND due_date < ?"
+            params.append(end.isoformat())
+        return self._select(where, tuple(params), order="due_date, seq")
+    
+    def find_query(self, query: TaskQuery, today: date) -> List[Task]:
+        where, params = self._query_where(query)
+        order = "seq"
+        if query.sort == SORT_SMART:
+            iso = today.isoformat()
+            # Gruppen wie query.sort_key(): überfällig, heute, später, ohne Datum, erledigt
+            order = ("CASE WHEN done THEN 4 WHEN due_date IS NULL THEN 3 "
+                     "WHEN due_date < ? THEN 0 WHEN due_date = ? THEN 1 ELSE 2 END, "
+                     "CASE WHEN done = 0 THEN due_date END, seq")
+            params += [iso, iso]
+        elif query.sort == SORT_DUE:
+            order = "due_date IS NULL, due_date, seq"
+        elif query.sort == SORT_TITLE:
+            order = "casefold(title), seq"
+        order += " LIMIT ? OFFSET ?"
+        params += [-1 if query.limit is None else query.limit, query.offset]
+        return self._select(where, tuple(params), order=order)
+    
+    def count_query(self, query: TaskQuery) -> int:
+        where, params = self._query_where(query)
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT COUNT(*) FROM tasks WHERE {where}", params
+            ).fetchone()[0]
+    
+    @staticmethod
+    def _query_where(query: TaskQuery) -> Tuple[str, list]:
+        """WHERE-Klausel und Parameter für die Filter einer Abfrage."""
+        conditions, params = ["1"], []
+        if query.status is not None:
+            conditions.append("done = ?")
+            params.append(int(query.status == STATUS_DONE))
+        if query.category is not None:
+            conditions.append("category = ?")
+            params.append(query.category)
+        if query.has_due_range:
+            conditions.append("due_date IS NOT NULL")
+            if query.due_from is not None:
+                conditions.append("due_date >= ?")
+                params.append(query.due_from.isoformat())
+            if query.due_to is not None:
+                conditions.append("due_date <= ?")
+                params.append(query.due_to.isoformat())
+        if tokenize(query.text):
+            conditions.append("matches_text(?, title)")
+            params.append(query.text)
+        return " AND ".join(conditions), params
+    
+    def count_statistics(self, today: date) -> dict:
+        iso = today.isoformat()
+        with self._lock:
+            total, done, overdue, due_today = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(done), 0), "
+                "COALESCE(SUM(done = 0 AND due_date < ?), 0), "
+                "COALESCE(SUM(due_date = ?), 0) FROM tasks",
+                (iso, iso),
+            ).fetchone()
+        return {
+            "total": total,
+            "done": done,
+            "open": total - done,
+            "overdue": overdue,
+            "due_today": due_today,
+        }
+    
+    def count_by_category(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT category, COUNT(*) FROM tasks GROUP BY category"
+            ).fetchall()
+        return dict(rows)
+    
+    # Zeilenweises Schreiben
+    
+    def upsert(self, tasks: List[Task]) -> None:
+        with self._lock, self._conn:
+            self._upsert(tasks)
+    
+    def delete(self, task_ids: List[str]) -> int:
+        with self._lock, self._conn:
+            cursor = self._conn.executemany(
+                "DELETE FROM tasks WHERE id = ?", [(i,) for i in task_ids]
+            )
+            return cursor.rowcount
+    
+    def _upsert(self, tasks: List[Task]) -> None:
+        self._conn.executemany(
+            f"INSERT INTO tasks ({_SQLITE_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET title = excluded.title, "
+            "done = excluded.done, category = excluded.category, "
+            "due_date = excluded.due_date, created_at = excluded.created_at",
+            [
+                (t.id, t.title, int(t.done), t.category,
+                 t.due_date.isoformat() if t.due_date else None, t.created_at)
+                for t in tasks
+            ],
+        )
+    
+    def _select(self, where: str, params: tuple = (), order: str = "seq") -> List[Task]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_SQLITE_COLUMNS} FROM tasks WHERE {where} ORDER BY {order}",
+                params,
+            ).fetchall()
+        return [
+            Task(
+                id=row[0],
+                title=row[1],
+                done=bool(row[2]),
+                category=row[3],
+                due_date=date.fromisoformat(row[4]) if row[4] else None,
+                created_at=row[5],
+            )
+            for row in rows
+        ]
+
+
+def migrate_json_to_sqlite(json_path: str, db_path: str) -> int:
+    """
+    Einmalige Migration einer tasks.json in eine SQLite-Datenbank.
+    Bereits vorhandene Tasks (gleiche ID) werden überschrieben.
+    Gibt die Anzahl migrierter Tasks zurück.
+    """
+    tasks = JSONTaskRepository(json_path).load()
+    repository = SQLiteTaskRepository(db_path)
+    try:
+        repository.upsert(tasks)
+    finally:
+        repository.close()
+    return len(tasks)
+
+
+def _shard_by_category(task: Task) -> str:
+    return task.category
+
+
+def _shard_by_due_month(task: Task) -> str:
+    return task.due_date.strftime("%Y-%m") if task.due_date else ""
+
+
+def _hash_bucket(task_id: str, buckets: int = 16) -> str:
+    return str(zlib.crc32(task_id.encode("utf-8")) % buckets)
+
+
+def _shard_by_hash(task: Task) -> str:
+    return _hash_bucket(task.id)
+
+
+SHARD_KEYS: Dict[str, Callable[[Task], str]] = {
+    "category": _shard_by_category,
+    "due_month": _shard_by_due_month,
+    "hash": _shard_by_hash,
+}
+
+
+def _shard_counts(records: Iterator[dict]) -> dict:
+    """
+    Zählwerte eines Shards für das Manifest: Anzahl, erledigt, Kategorien
+    und je Fälligkeitstag [offen, erledigt]. Reicht für count_statistics()
+    zu jedem Stichtag, ohne die Tasks zu laden.
+    """
+    total = done = 0
+    categories: Dict[str, int] = {}
+    due: Dict[str, List[int]] = {}
+    for record in records:
+        is_done = bool(record["done"])
+        total += 1
+        done += is_done
+        category = record.get("category") or ""
+        categories[category] = categories.get(category, 0) + 1
+        if record.get("due_date"):
+            due.setdefault(record["due_date"], [0, 0])[is_done] += 1
+    return {"total": total, "done": done, "categories": categories, "due": due}
+
+
+class ShardedTaskRepository(TaskRepositoryInterface, TaskQueryInterface,
+                            TaskChangeSetInterface):
+    """
+    Repository, das Tasks nach einem Schlüssel (Kategorie, Fälligkeitsmonat
+    oder Hash der ID) auf mehrere JSON-Dateien in directory verteilt.
+    Ein kleines Manifest (manifest.json) listet die Shards samt Zählwerten;
+    Statistik und Kategorien kommen aus dem Manifest, die Shards selbst
+    werden erst geladen, wenn eine Abfrage sie braucht, und nur geänderte
+    Shards werden zurückgeschrieben.
+    """
+    
+    MANIFEST = "manifest.json"
+    
+    def __init__(self, directory: str = "tasks", shard_key: str = "category"):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.RLock()
+        self._manifest_path = os.path.join(directory, self.MANIFEST)
+        manifest = self._read_manifest()
+        if manifest and manifest.get("key") != shard_key:
+            raise ValueError(
+                f"Shards wurden nach '{manifest.get('key')}' angelegt, nicht nach '{shard_key}'"
+            )
+        if shard_key not in SHARD_KEYS:
+            raise ValueError(f"Unbekannter Shard-Schlüssel: {shard_key}")
+        self.shard_key = shard_key
+        self._key_of = SHARD_KEYS[shard_key]
+        # Shard-Schlüssel -> Dateiname (aus dem Manifest)
+        self._files: Dict[str, str] = manifest.get("shards", {}) if manifest else {}
+        # Shard-Schlüssel -> Zählwerte (siehe _shard_counts); fehlen sie im
+        # Manifest (Version 1), werden sie einmalig aus dem Shard berechnet
+        self._counts: Dict[str, dict] = manifest.get("counts", {}) if manifest else {}
+        # Geladene Shards: Schlüssel -> (id -> to_dict()-Record)
+        self._shards: Dict[str, Dict[str, dict]] = {}
+        self._shard_of: Dict[str, str] = {}
+    
+    @property
+    def loaded_shards(self) -> List[str]:
+        """Schlüssel der aktuell geladenen Shards."""
+        return list(self._shards)
+    
+    # TaskRepositoryInterface
+    
+    def save(self, tasks: List[Task]) -> None:
+        """Verteilt alle Tasks neu, schreibt aber nur geänderte Shards."""
+        with self._lock:
+            grouped: Dict[str, Dict[str, dict]] = {}
+            for task in tasks:
+                grouped.setdefault(self._key_of(task), {})[task.id] = task.to_dict()
+            dirty = [key for key, records in grouped.items()
+                     if key not in self._shards or self._shards[key] != records]
+            for key in self._files:
+                if key not in grouped:
+                    grouped[key] = {}
+                    dirty.append(key)
+            self._shards = grouped
+            self._shard_of = {task_id: key for key, records in grouped.items()
+                              for task_id in records}
+            self._write(dirty)
+    
+    def load(self) -> List[Task]:
+        """Lädt alle Shards."""
+        with self._lock:
+            self._shards.clear()
+            self._shard_of.clear()
+            return self._tasks_from(list(self._files))
+    
+    def clear(self) -> None:
+        """Löscht alle Shards und das Manifest."""
+        with self._lock:
+            for filename in self._files.values():
+                path = os.path.join(self.directory, filename)
+                if os.path.exists(path):
+                    os.remove(path)
+            self._files.clear()
+            self._counts.clear()
+            self._shards.clear()
+            self._shard_of.clear()
+            self._write_manifest()
+    
+    # TaskChangeSetInterface
+    
+    def save_changes(self, changes: TaskChangeSet) -> None:
+        """Schreibt nur die von den Änderungen betroffenen Shards."""
+        with self._lock:
+            dirty = set()
+            for task in changes.upserts:
+                key = self._key_of(task)
+                # Nur bekannte Shards prüfen: neue Tasks sollen keine Shards nachladen
+                old_key = self._locate(task.id, hint=key, scan=False)
+                if old_key is not None and old_key != key:
+                    del self._shards[old_key][task.id]
+                    dirty.add(old_key)
+                self._shard(key)[task.id] = task.to_dict()
+                self._shard_of[task.id] = key
+                dirty.add(key)
+            for task_id in changes.deletes:
+                key = self._locate(task_id)
+                if key is not None:
+                    del self._shards[key][task_id]
+                    del self._shard_of[task_id]
+                    dirty.add(key)
+            self._write(sorted(dirty))
+    
+    # TaskQueryInterface
+    
+    def find_by_id(self, task_id: str) -> Optional[Task]:
+        with self._lock:
+            key = self._locate(task_id)
+            return Task.from_dict(self._shards[key][task_id]) if key is not None else None
+    
+    def find_open(self) -> List[Task]:
+        return [t for t in self._all() if not t.done]
+    
+    def find_done(self) -> List[Task]:
+        return [t for t in self._all() if t.done]
+    
+    def find_by_category(self, category: str) -> List[Task]:
+        with self._lock:
+            if self.shard_key == "category":
+                return self._tasks_from([category]) if category in self._files else []
+            return [t for t in self._all() if t.category == category]
+    
+    def find_categories(self) -> List[str]:
+        # Direkt aus dem Manifest, ohne Shards zu laden
+        return sorted(category for category in self.count_by_category() if category)
+    
+    def find_overdue(self, today: date) -> List[Task]:
+        with self._lock:
+            if self.shard_key == "due_month":
+                month = today.strftime("%Y-%m")
+                keys = [key for key in self._files if key and key <= month]
+                tasks = self._tasks_from(keys)
+            else:
+                tasks = self._all()
+        return sorted((t for t in tasks if not t.done and t.due_date and t.due_date < today),
+                      key=lambda t: t.due_date)
+    
+    def find_due_today(self, today: date) -> List[Task]:
+        with self._lock:
+            if self.shard_key == "due_month":
+                month = today.strftime("%Y-%m")
+                tasks = self._tasks_from([month]) if month in self._files else []
+            else:
+                tasks = self._all()
+        return [t for t in tasks if t.due_date == today]
+    
+    def find_due_between(self, start: Optional[date], end: Optional[date]) -> List[Task]:
+        with self._lock:
+            if self.shard_key == "due_month":
+                # Nur Monats-Shards im Bereich laden
+                first = start.strftime("%Y-%m") if start else None
+                last = end.strftime("%Y-%m") if end else None
+                keys = [key for key in self._files if key
+                        and (first is None or key >= first)
+                        and (last is None or key <= last)]
+                tasks = self._tasks_from(keys)
+            else:
+                tasks = self._all()
+        return sorted(
+            (t for t in tasks if not t.done and t.due_date
+             and (start is None or t.due_date >= start)
+             and (end is None or t.due_date < end)),
+            key=lambda t: t.due_date,
+        )
+    
+    def count_statistics(self, today: date) -> dict:
+        iso = today.isoformat()
+        total = done = overdue = due_today = 0
+        with self._lock:
+            for key in list(self._files):
+                counts = self._counts_of(key)
+                total += counts["total"]
+                done += counts["done"]
+                for day, (still_open, finished) in counts["due"].items():
+                    if day < iso:
+                        overdue += still_open
+                    elif day == iso:
+                        due_today += still_open + finished
+        return {
+            "total": total,
+            "done": done,
+            "open": total - done,
+            "overdue": overdue,
+            "due_today": due_today,
+        }
+    
+    def count_by_category(self) -> Dict[str, int]:
+        result: Dict[str, int] = {}
+        with self._lock:
+            for key in list(self._files):
+                for category, n in self._counts_of(key)["categories"].items():
+                    result[category] = result.get(category, 0) + n
+        return result
+    
+    def upsert(self, tasks: List[Task]) -> None:
+        self.save_changes(TaskChangeSet(upserts=list(tasks)))
+    
+    def delete(self, task_ids: List[str]) -> int:
+        with self._lock:
+            existing = [i for i in task_ids if self._locate(i) is not None]
+            self.save_changes(TaskChangeSet(deletes=existing))
+            return len(existing)
+    
+    # Shard-Verwaltung
+    
+    def _all(self) -> List[Task]:
+        with self._lock:
+            return self._tasks_from(list(self._files))
+    
+    def _tasks_from(self, keys: List[str]) -> List[Task]:
+        tasks = []
+        for key in keys:
+            tasks.extend(Task.from_dict(r) for r in self._shard(key).values())
+        return tasks
+    
+    def _shard(self, key: str) -> Dict[str, dict]:
+        """Gibt den Shard zurück und lädt ihn bei Bedarf (lazy)."""
+        records = self._shards.get(key)
+        if records is None:
+            records = {}
+            filename = self._files.get(key)
+            if filename:
+                path = os.path.join(self.directory, filename)
+                if os.path.exists(path):
+                    with open(path, "r", encoding="utf-8") as f:
+                        records = {r["id"]: r for r in json.load(f)}
+            self._shards[key] = records
+            for task_id in records:
+                self._shard_of[task_id] = key
+        return records
+    
+    def _locate(self, task_id: str, hint: Optional[str] = None,
+                scan: bool = True) -> Optional[str]:
+        """
+        Findet den Shard eines Tasks: zuerst in geladenen Shards, dann im
+        Hinweis-Shard und nur mit scan=True in allen übrigen Shards.
+        """
+        key = self._shard_of.get(task_id)
+        if key is not None:
+            return key
+        if self.shard_key == "hash":
+            # Hash-Shard ist über die ID eindeutig bestimmt
+            hint, scan = _hash_bucket(task_id), False
+        if hint is not None and task_id in self._shard(hint):
+            return hint
+        if scan:
+            for candidate in list(self._files):
+                if candidate not in self._shards and task_id in self._shard(candidate):
+                    return candidate
+        return None
+    
+    def _counts_of(self, key: str) -> dict:
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = _shard_counts(self._shard(key).values())
+        return counts
+    
+    def _shard_filename(self, key: str) -> str:
+        slug = re.sub(r"[^A-Za-z0-9_-]", "_", key)[:40] or "_"
+        return f"shard-{slug}-{zlib.crc32(key.encode('utf-8')):08x}.json"
+    
+    def _write(self, keys: List[str]) -> None:
+        """Schreibt die angegebenen Shards und das Manifest mit ihren Zählwerten."""
+        manifest_changed = bool(keys)
+        for key in keys:
+            records = self._shards.get(key, {})
+            if not records:
+                filename = self._files.pop(key, None)
+                self._shards.pop(key, None)
+                self._counts.pop(key, None)
+                if filename:
+                    manifest_changed = True
+                    path = os.path.join(self.directory, filename)
+                    if os.path.exists(path):
+                        os.remove(path)
+                continue
+            if key not in self._files:
+                self._files[key] = self._shard_filename(key)
+            self._counts[key] = _shard_counts(records.values())
+            _write_json_atomic(os.path.join(self.directory, self._files[key]),
+                               list(records.values()))
+        if manifest_changed or not os.path.exists(self._manifest_path):
+            self._write_manifest()
+    
+    def _read_manifest(self) -> Optional[dict]:
+        if not os.path.exists(self._manifest_path):
+            return None
+        with open(self._manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    
+    def _write_manifest(self) -> None:
+        _write_json_atomic(self._manifest_path, {
+            "version": 2,
+            "key": self.shard_key,
+            "shards": self._files,
+            "counts": {key: self._counts_of(key) for key in self._files},
+        })
+
+
 class InMemoryTaskRepository(TaskRepositoryInterface):
     """
     In-Memory Repository für Tests.
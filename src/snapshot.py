@@ -0,0 +1,136 @@
+#Snapshot: Kompaktes Binärformat für schnellen Kaltstart.
+#Liegt als Cache neben der tasks.json und wird bei Änderung der
+#JSON-Datei automatisch neu erzeugt.
+#
+#Aufbau (Little Endian):
+#   Header      magic, version, anzahl, mtime_ns, size, inode der Quelle
+#   Strings     anzahl, byte-länge, utf-8 mit "\0" getrennt (ids, titel, kategorien)
+#   Spalten     flags (B), due ordinal (i), created µs (q),
+#               id-, titel-, kategorie-index (I) - je eine Spalte pro Feld
+
+import os
+import struct
+import sys
+from array import array
+from datetime import date
+from typing import Dict, List, Optional
+from model import Task
+
+MAGIC = b"TSNP"
+SNAPSHOT_VERSION = 1
+
+_HEADER = struct.Struct("<4sHxxIqqq")
+_STRINGS = struct.Struct("<II")
+
+FLAG_DONE = 1
+FLAG_RAW_CREATED = 2  # created_at nicht als Zeitstempel darstellbar -> String-Tabelle
+
+# (typecode, Feldname) in Dateireihenfolge
+_COLUMNS = [("B", "flags"), ("i", "due"), ("q", "created"),
+            ("I", "id"), ("I", "title"), ("I", "category")]
+
+
+def _source_key(stat: os.stat_result) -> tuple:
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def encode_snapshot(tasks: List[Task], source_stat: os.stat_result) -> Optional[bytes]:
+    """
+    Kodiert einen Snapshot für die Tasks (Schreiben: repository.py).
+    Gibt None zurück, wenn die Tasks nicht darstellbar sind (z.B. "\\0" im Titel
+    oder ein Feld, das kein String ist).
+    """
+    strings: Dict[str, int] = {}
+    columns = {name: array(code) for code, name in _COLUMNS}
+
+    def intern(value: str) -> int:
+        index = strings.get(value)
+        if index is None:
+            index = strings[value] = len(strings)
+        return index
+
+    for task in tasks:
+        flags = FLAG_DONE if task.done else 0
+        created = task.created_micros
+        if created is None:
+            flags |= FLAG_RAW_CREATED
+            created = intern(task.created_at)
+        columns["flags"].append(flags)
+        columns["due"].append(task.due_date.toordinal() if task.due_date else 0)
+        columns["created"].append(created)
+        columns["id"].append(intern(task.id))
+        columns["title"].append(intern(task.title))
+        columns["category"].append(intern(task.category))
+
+    # Nur Strings ohne "\0" sind darstellbar (Altdaten z.B. mit "category": null nicht)
+    if any(type(s) is not str or "\0" in s for s in strings):
+        return None
+    blob = "\0".join(strings).encode("utf-8")
+
+    if sys.byteorder == "big":
+        for column in columns.values():
+            column.byteswap()
+
+    parts = [_HEADER.pack(MAGIC, SNAPSHOT_VERSION, len(tasks), *_source_key(source_stat)),
+             _STRINGS.pack(len(strings), len(blob)), blob]
+    parts.extend(columns[name].tobytes() for _, name in _COLUMNS)
+    return b"".join(parts)
+
+
+def read_snapshot(path: str, source_stat: os.stat_result) -> Optional[List[Task]]:
+    """
+    Lädt Tasks aus dem Snapshot.
+    Gibt None zurück, wenn er fehlt, veraltet oder beschädigt ist.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, count, *source = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != SNAPSHOT_VERSION:
+            return None
+        if tuple(source) != _source_key(source_stat):
+            return None
+
+        offset = _HEADER.size
+        n_strings, blob_size = _STRINGS.unpack_from(data, offset)
+        offset += _STRINGS.size
+        strings = data[offset:offset + blob_size].decode("utf-8").split("\0")
+        offset += blob_size
+        if len(strings) != n_strings and not (n_strings == 0 and strings == [""]):
+            return None
+
+        columns = {}
+        for code, name in _COLUMNS:
+            column = array(code)
+            end = offset + column.itemsize * count
+            column.frombytes(data[offset:end])
+            offset = end
+            if sys.byteorder == "big":
+                column.byteswap()
+            columns[name] = column
+        if offset != len(data):
+            return None
+    except (OSError, struct.error, UnicodeDecodeError, ValueError):
+        return None
+
+    # Positionale Argumente in Feldreihenfolge: title, done, category, due_date, id, created
+    tasks = []
+    append = tasks.append
+    restore = Task._restore
+    fromordinal = date.fromordinal
+    try:
+        for flags, due, created, id_idx, title_idx, cat_idx in zip(
+            columns["flags"], columns["due"], columns["created"],
+            columns["id"], columns["title"], columns["category"],
+        ):
+            append(restore(
+                strings[title_idx],
+                flags & FLAG_DONE == FLAG_DONE,
+                strings[cat_idx],
+                fromordinal(due) if due else None,
+                strings[id_idx],
+                strings[created] if flags & FLAG_RAW_CREATED else created,
+            ))
+    except (IndexError, OverflowError, ValueError):
+        return None
+    return tasks
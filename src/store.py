@@ -0,0 +1,145 @@
+#Store: Prozessweit geteilter Task-Bestand für alle Streamlit-Sessions.
+#Pro Datendatei gibt es genau einen Controller; Sessions erhalten
+#leichtgewichtige Mediator-Handles, die unter einem gemeinsamen Lock arbeiten.
+
+import functools
+import os
+from collections.abc import MutableSequence
+import threading
+from typing import Callable, Dict, Optional
+from controller import TaskController
+from repository import TaskRepositoryInterface, JSONTaskRepository
+from patterns import TaskMediator
+from flusher import WriteBehindFlusher
+
+
+_stores: Dict[str, "SharedTaskStore"] = {}
+_registry_lock = threading.Lock()
+
+
+class SharedTaskStore:
+    """
+    Geteilter, thread-sicherer Task-Bestand für eine Datendatei.
+    Lädt nur neu, wenn sich mtime, Größe oder Inode der Datei ändern
+    (z.B. durch einen anderen Prozess). Mit write_behind=True teilen sich
+    alle Sessions einen WriteBehindFlusher.
+
+    Verwendung:
+        store = SharedTaskStore.for_path("data/tasks.json")
+        mediator = store.session()
+    """
+
+    def __init__(self, filepath: str,
+                 repository_factory: Optional[Callable[[str], TaskRepositoryInterface]] = None,
+                 write_behind: bool = False):
+        self.filepath = filepath
+        self.lock = threading.RLock()
+        factory = repository_factory or JSONTaskRepository
+        self.controller = TaskController(factory(filepath))
+        self.flusher: Optional[WriteBehindFlusher] = None
+        if write_behind:
+            self.flusher = WriteBehindFlusher(
+                self.controller, lock=self.lock, on_flushed=self.mark_saved
+            )
+        self._file_key: Optional[tuple] = None
+        self._loaded = False
+        self.refresh()
+
+    @classmethod
+    def for_path(cls, filepath: str,
+                 repository_factory: Optional[Callable[[str], TaskRepositoryInterface]] = None,
+                 write_behind: bool = False) -> "SharedTaskStore":
+        """Gibt den Store für die Datei zurück (einmal pro Prozess erzeugt)."""
+        key = os.path.abspath(filepath)
+        with _registry_lock:
+            store = _stores.get(key)
+            if store is None:
+                store = _stores[key] = cls(key, repository_factory, write_behind)
+            return store
+
+    def _stat_key(self) -> Optional[tuple]:
+        try:
+            stat = os.stat(self.filepath)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def refresh(self) -> bool:
+        """
+        Lädt die Tasks neu, falls die Datei von außen geändert wurde (z.B.
+        über die CLI). Noch nicht geschriebene eigene Änderungen (Write-
+        Behind) werden danach erneut angewendet und gewinnen pro Task.
+        """
+        with self.lock:
+            key = self._stat_key()
+            if self._loaded and key == self._file_key:
+                return False
+            pending = self.controller.get_changes()
+            self.controller.load()
+            if pending:
+                self.controller.reapply_changes(pending)
+            self._file_key = key
+            self._loaded = True
+            return True
+
+    def mark_saved(self) -> None:
+        """Merkt sich den Dateistand nach einem eigenen Speichern."""
+        with self.lock:
+            self._file_key = self._stat_key()
+
+    def session(self) -> "SharedTaskMediator":
+        """Erzeugt ein Handle für eine Session (eigene Listener, gemeinsame Daten)."""
+        return SharedTaskMediator(self)
+
+
+class SharedTaskMediator(TaskMediator):
+    """
+    Mediator-Handle auf einen SharedTaskStore.
+    Jede Operation läuft unter dem Store-Lock auf aktuellem Dateistand.
+    """
+
+    def __init__(self, store: SharedTaskStore):
+        super().__init__(store.controller, store.flusher)
+        self.store = store
+        self._lock = store.lock
+
+
+def _reading(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.store.lock:
+            self.store.refresh()
+            result = method(self, *args, **kwargs)
+            # Kopie, damit andere Threads die Liste nicht während der Iteration ändern
+            return list(result) if isinstance(result, MutableSequence) else result
+    return wrapper
+
+
+def _writing(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.store.lock:
+            self.store.refresh()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self.store.mark_saved()
+    return wrapper
+
+
+# Mediator-Operationen, die synchronisiert werden
+_READ_OPERATIONS = (
+    "get_all_tasks", "get_open_tasks", "get_done_tasks", "get_task_by_id",
+    "get_categories", "get_by_category", "get_overdue_tasks", "get_upcoming_tasks",
+    "search_tasks", "query_tasks", "count_tasks", "get_statistics", "get_version", "get_task_version",
+)
+_WRITE_OPERATIONS = (
+    "add_task", "delete_task", "toggle_task", "update_task",
+    "add_typed_task", "import_external_tasks", "import_tasks",
+    "add_many", "delete_many", "toggle_many", "set_done_many", "update_many",
+)
+
+for _name in _READ_OPERATIONS:
+    setattr(SharedTaskMediator, _name, _reading(getattr(TaskMediator, _name)))
+for _name in _WRITE_OPERATIONS:
+    setattr(SharedTaskMediator, _name, _writing(getattr(TaskMediator, _name)))
@@ -1,10 +1,16 @@
 import streamlit as st
+from streamlit.errors import StreamlitAPIException
+from dataclasses import replace
 from datetime import date
-from typing import List
+from typing import List, Optional
 from model import Task
 from patterns import TaskMediator
+from query import TaskQuery, STATUS_OPEN, STATUS_DONE, SORT_SMART, SORT_INSERTION
+from viewmodel import RenderCache, TaskRow, ViewModel, get_view_model, render_row_html
 
 
+PAGE_SIZE = 50  # Tasks pro Seite
+ROW_HTML_ENTRIES = 1000  # zwischengespeicherte Zeilen (HTML) pro Sitzung
 
 COLORS = {
     "primary": "#2563EB",
@@ -211,17 +217,30 @@ div[data-testid="stVerticalBlockBorderWrapper"] {{
 
 
 
+def _rerun_fragment():
+    """Führt nur das laufende Fragment erneut aus (außerhalb eines Fragment-Laufs die ganze Seite)."""
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
+
+
 class TodoView:
     
-    def __init__(self, mediator: TaskMediator):
+    def __init__(self, mediator: TaskMediator, page_size: int = PAGE_SIZE):
         self.mediator = mediator
+        self.page_size = page_size
         self._init_session_state()
     
     def _init_session_state(self):
-        defaults = {"edit_id": None, "categories": ["Arbeit", "Privat", "Einkauf", "Sonstiges"], "smart_sort": True}
+        defaults = {"edit_id": None, "categories": ["Arbeit", "Privat", "Einkauf", "Sonstiges"], "smart_sort": True,
+                    "page": 0, "page_query": None, "view_model": None, "changed_id": None}
         for key, val in defaults.items():
             if key not in st.session_state:
                 st.session_state[key] = val
+        # Zeilen-HTML pro Sitzung: Task-Versionen zählt jeder Controller selbst
+        if "row_html" not in st.session_state:
+            st.session_state.row_html = RenderCache(ROW_HTML_ENTRIES)
     
     def _header(self, text: str):
         """zentrierte Überschrift"""
@@ -251,8 +270,13 @@ class TodoView:
                 </div>
                 ''', unsafe_allow_html=True)
     
+    @st.fragment
     def render_add_task_form(self):
-        """Formular zum Hinzufügen neuer Tasks (neu sortiert)."""
+        """
+        Formular zum Hinzufügen neuer Tasks (neu sortiert).
+        Als Fragment: Eingaben führen nur das Formular aus; Erstellen und
+        Kategorien ändern die Liste und laden die ganze Seite neu.
+        """
         with st.container(border=True):
             self._header("➕ Neue Aufgabe")
 
@@ -331,77 +355,203 @@ class TodoView:
                             st.rerun()
 
     
+    @st.fragment
     def render_task_section(self):
-        """Filter + Task-Liste mit integrierter Statistik."""
+        """
+        Filter + Task-Liste mit integrierter Statistik.
+        Als Fragment: Filter, Blättern und Sammelaktionen führen nur diese
+        Sektion erneut aus, nicht CSS, Sidebar und Kopf.
+        """
         with st.container(border=True):
             self._header("📋 Meine Aufgaben")
 
-            # Kompakte Inline-Statistik
-            stats = self.mediator.controller.get_statistics()
-            if stats["total"] > 0:
-                pct = int(stats['progress'] * 100)
-                st.markdown(f'''
-                <div class="stats-row">
-                    <span class="stats-item">📝 <b>{stats["total"]}</b> Gesamt</span>
-                    <span class="stats-item">⏳ <b>{stats["open"]}</b> Offen</span>
-                    <span class="stats-item">✅ <b>{stats["done"]}</b> Erledigt</span>
-                </div>
-                <div style="max-width:260px; margin:0.4rem auto 0.6rem auto;">
-                    <div class="progress-bar">
-                        <div class="progress-fill" style="width:{pct}%;"></div>
-                    </div>
-                    <p style="text-align:center; font-size:0.75rem; color:{COLORS['muted']}; margin:0.2rem 0 0 0;">{pct}% erledigt</p>
-                </div>
-                ''', unsafe_allow_html=True)
+            # Filterwerte stehen vor dem Zeichnen der Widgets im Session State,
+            # so lässt sich der Schnappschuss vor den Widgets berechnen
+            vm = self._view_model()
+            # Ganzer Lauf: Zeilen und Statistik sind ohnehin aktuell
+            st.session_state.changed_id = None
+
+            # Kompakte Inline-Statistik (Platzhalter, Zeilen-Fragmente aktualisieren ihn)
+            self._stats_slot = st.empty()
+            self._render_stats(vm.stats)
 
             c1, c2, c3 = st.columns([2, 2, 1])
             with c1:
-                status = st.segmented_control("Status", ["Alle", "Offen", "Erledigt"], default="Alle", label_visibility="collapsed", key="status_filter")
-                if status is None:
-                    status = "Alle"
+                st.segmented_control("Status", ["Alle", "Offen", "Erledigt"], default="Alle", label_visibility="collapsed", key="status_filter")
             with c2:
-                cats = ["Alle"] + self.mediator.get_categories()
-                cat = st.selectbox("Filter", cats, label_visibility="collapsed")
+                st.selectbox("Filter", ("Alle",) + vm.categories, label_visibility="collapsed", key="category_filter")
             with c3:
-                st.session_state.smart_sort = st.toggle("🎯", value=st.session_state.smart_sort, help="Smart-Sort: Dringende zuerst")
+                st.toggle("🎯", help="Smart-Sort: Dringende zuerst", key="smart_sort")
+            st.text_input("Suche", placeholder="🔍 Aufgaben durchsuchen…", label_visibility="collapsed", key="search_text")
 
             st.divider()
 
             if st.session_state.smart_sort:
                 st.markdown('<p class="smart-info">🎯 Sortiert: Überfällig → Heute → Datum</p>', unsafe_allow_html=True)
 
-            tasks = self._get_tasks(status, cat)
-            if not tasks:
+            if vm.total == 0:
                 st.markdown('<div class="empty-list">🎉 Keine Aufgaben – erstelle eine neue!</div>', unsafe_allow_html=True)
             else:
-                for i, task in enumerate(tasks):
+                self._render_bulk_actions(vm)
+                for i, row in enumerate(vm.rows):
                     if i > 0:
                         st.markdown('<hr class="task-sep">', unsafe_allow_html=True)
-                    if st.session_state.edit_id == task.id:
-                        self._render_edit_form(task)
-                    else:
-                        self._render_task_item(task)
+                    self._task_row(row.id)
+                self._render_pagination(vm)
+    
+    def _view_model(self) -> ViewModel:
+        """
+        Schnappschuss für diesen Lauf aus den Filtern im Session State;
+        wiederverwendet, solange Controller-Version, Filter und Seite gleich sind.
+        """
+        state = st.session_state
+        query = self._build_query()
+        if state.page_query != query:
+            # Neue Filter beginnen bei Seite 1
+            state.page_query = query
+            state.page = 0
+        vm = get_view_model(self.mediator, query, state.page, self.page_size, previous=state.view_model)
+        if query.category is not None and query.category not in vm.categories:
+            # Gewählte Kategorie existiert nicht mehr
+            state.category_filter = "Alle"
+            state.page_query = query = replace(query, category=None)
+            vm = get_view_model(self.mediator, query, 0, self.page_size)
+        state.view_model = vm
+        state.page = vm.page
+        return vm
+    
+    def _render_stats(self, stats: dict):
+        """Schreibt die Inline-Statistik in ihren Platzhalter."""
+        if stats["total"] == 0:
+            self._stats_slot.empty()
+            return
+        pct = int(stats['progress'] * 100)
+        self._stats_slot.markdown(f'''
+        <div class="stats-row">
+            <span class="stats-item">📝 <b>{stats["total"]}</b> Gesamt</span>
+            <span class="stats-item">⏳ <b>{stats["open"]}</b> Offen</span>
+            <span class="stats-item">✅ <b>{stats["done"]}</b> Erledigt</span>
+        </div>
+        <div style="max-width:260px; margin:0.4rem auto 0.6rem auto;">
+            <div class="progress-bar">
+                <div class="progress-fill" style="width:{pct}%;"></div>
+            </div>
+            <p style="text-align:center; font-size:0.75rem; color:{COLORS['muted']}; margin:0.2rem 0 0 0;">{pct}% erledigt</p>
+        </div>
+        ''', unsafe_allow_html=True)
+    
+    def _render_pagination(self, vm: ViewModel):
+        """Blättern zwischen den Seiten (nur bei mehr als einer Seite)."""
+        page, pages, total = vm.page, vm.pages, vm.total
+        if pages <= 1:
+            return
+        # Callbacks setzen die Seite vor dem Lauf, so genügt ein Lauf pro Klick
+        c1, c2, c3 = st.columns([1, 2, 1])
+        with c1:
+            st.button("◀ Zurück", key="page_prev", disabled=page == 0, use_container_width=True,
+                      on_click=self._set_page, args=(page - 1,))
+        with c2:
+            st.markdown(f'<p class="smart-info">Seite {page + 1} von {pages} · {total} Aufgaben</p>',
+                        unsafe_allow_html=True)
+        with c3:
+            st.button("Weiter ▶", key="page_next", disabled=page >= pages - 1, use_container_width=True,
+                      on_click=self._set_page, args=(page + 1,))
+    
+    @staticmethod
+    def _set_page(page: int):
+        st.session_state.page = page
+    
+    def _render_bulk_actions(self, vm: ViewModel):
+        """Sammelaktionen für alle Tasks des aktuellen Filters (nicht nur der Seite)."""
+        query, open_count, done_count = vm.query, vm.open_count, vm.done_count
+        with st.expander(f"⚡ Sammelaktionen ({vm.total} Aufgaben)", expanded=False):
+            c1, c2 = st.columns(2)
+            with c1:
+                if st.button(f"✅ Alle erledigen ({open_count})", key="bulk_done",
+                             disabled=not open_count, use_container_width=True):
+                    self.mediator.set_done_many(self._matching_ids(query, STATUS_OPEN))
+                    _rerun_fragment()
+            with c2:
+                if st.button(f"🗑️ Erledigte löschen ({done_count})", key="bulk_delete",
+                             disabled=not done_count, use_container_width=True):
+                    self.mediator.delete_many(self._matching_ids(query, STATUS_DONE))
+                    _rerun_fragment()
+            c1, c2 = st.columns([3, 2])
+            with c1:
+                targets = ["Keine"] + st.session_state.categories
+                target = st.selectbox("Verschieben nach", targets, key="bulk_target",
+                                      label_visibility="collapsed")
+            with c2:
+                if st.button("📁 Verschieben", key="bulk_move", use_container_width=True):
+                    self.mediator.update_many(self._matching_ids(query),
+                                              category="" if target == "Keine" else target)
+                    _rerun_fragment()
+    
+    def _matching_ids(self, query: TaskQuery, status: str = None) -> List[str]:
+        """IDs aller Treffer der Abfrage, optional auf einen Status eingeschränkt."""
+        if status is not None:
+            query = replace(query, status=status)
+        return [t.id for t in self.mediator.query_tasks(replace(query, sort=SORT_INSERTION))]
+    
+    def _build_query(self) -> TaskQuery:
+        """Abfrage für die aktuellen Filter (ohne Seite) aus dem Session State."""
+        state = st.session_state
+        category = state.get("category_filter", "Alle")
+        return TaskQuery(
+            status={"Offen": STATUS_OPEN, "Erledigt": STATUS_DONE}.get(state.get("status_filter")),
+            category=None if category == "Alle" else category,
+            text=state.get("search_text", "").strip(),
+            sort=SORT_SMART if state.smart_sort else SORT_INSERTION,
+        )
+    
+    @st.fragment
+    def _task_row(self, task_id: str):
+        """
+        Eine Zeile als Fragment: Abhaken, Bearbeiten und Löschen führen nur
+        diese Zeile (und die Statistik) erneut aus. Die Zeile kommt aus dem
+        Schnappschuss, solange er aktuell ist, sonst frisch aus dem Task;
+        gelöschte Tasks verschwinden.
+        """
+        if st.session_state.changed_id == task_id:
+            # Checkbox-Callback lief vor diesem Lauf
+            st.session_state.changed_id = None
+            self._after_change(task_id)
+        row = self._current_row(task_id)
+        if row is None:
+            return
+        if st.session_state.edit_id == row.id:
+            task = self.mediator.get_task_by_id(row.id)
+            self._render_edit_form(task)
+        else:
+            self._render_task_item(row)
+    
+    def _set_done(self, task_id: str, key: str):
+        """Callback der Checkbox: setzt den angeklickten Status (kein Umschalten)."""
+        self.mediator.set_done_many([task_id], st.session_state[key])
+        st.session_state.changed_id = task_id
     
-    def _get_tasks(self, status: str, category: str) -> List[Task]:
-        """Gibt gefilterte Task-Liste zurück."""
-        if status == "Offen": tasks = self.mediator.get_open_tasks()
-        elif status == "Erledigt": tasks = self.mediator.get_done_tasks()
-        else: tasks = self.mediator.get_all_tasks()
-        
-        if category != "Alle":
-            tasks = [t for t in tasks if t.category == category]
-        
-        if st.session_state.smart_sort:
-            def key(t):
-                if t.done: return (4, date.max)
-                if t.is_overdue(): return (0, t.due_date)
-                if t.is_due_today(): return (1, t.due_date)
-                if t.due_date: return (2, t.due_date)
-                return (3, date.max)
-            tasks = sorted(tasks, key=key)
-        return tasks
+    def _current_row(self, task_id: str) -> Optional[TaskRow]:
+        vm = st.session_state.view_model
+        if vm.version == self.mediator.get_version():
+            return vm.row(task_id)
+        task = self.mediator.get_task_by_id(task_id)
+        return self._row_for(task) if task is not None else None
     
-    def _render_task_item(self, task: Task):
+    def _row_for(self, task: Task) -> TaskRow:
+        return TaskRow.from_task(task, date.today(), self.mediator.get_task_version(task.id))
+    
+    def _after_change(self, task_id: str):
+        """
+        Nach einer Änderung an einer Zeile: Statistik aktualisieren; passt
+        der Task nicht mehr zum Filter, wird die ganze Seite neu ausgeführt.
+        """
+        self._render_stats(self.mediator.get_statistics())
+        task = self.mediator.get_task_by_id(task_id)
+        match = st.session_state.view_model.query.predicate()
+        if task is not None and match is not None and not match(task):
+            st.rerun()
+    
+    def _render_task_item(self, row: TaskRow):
         """
         Rendert ein Task-Item:
         Checkbox | Titel + Meta (Kategorie + Datum) | Edit | Delete
@@ -410,61 +560,40 @@ class TodoView:
         # Reduzierte, ruhigere Spaltenstruktur
         c1, c2, c3, c4 = st.columns([0.5, 4.5, 0.7, 0.7], gap="small")
 
-        # Checkbox
+        # Checkbox: Schlüssel mit Task-Version, damit nach Änderungen anderer
+        # Sessions (oder der CLI) kein alter Widget-Zustand übrig bleibt
         with c1:
-            checked = st.checkbox(
+            key = f"cb_{row.id}_{row.version}"
+            st.checkbox(
                 "done",
-                value=task.done,
-                key=f"cb_{task.id}",
-                label_visibility="collapsed"
+                value=row.done,
+                key=key,
+                label_visibility="collapsed",
+                on_change=self._set_done,
+                args=(row.id, key)
             )
-            if checked != task.done:
-                self.mediator.toggle_task(task.id)
-                st.rerun()
 
         # Titel + Meta
         with c2:
-            title_class = "task-done" if task.done else ""
-            st.markdown(
-                f'<div class="{title_class}">{task.title}</div>',
-                unsafe_allow_html=True
+            # Fertiges HTML pro (Task, Version, Tag) aus dem Cache
+            title_html, meta_html = st.session_state.row_html.get_or_build(
+                (row.id, row.version, date.today()), lambda: render_row_html(row)
             )
+            st.markdown(title_html, unsafe_allow_html=True)
 
             # Meta-Zeile (Kategorie · Datum)
-            meta_parts = []
-
-            if task.category:
-                meta_parts.append(
-                    f'<span class="category-badge">{task.category}</span>'
-                )
-
-            if task.due_date and not task.done:
-                if task.is_overdue():
-                    meta_parts.append(
-                        f'<span class="date-overdue">⚠️ {task.due_date.strftime("%d.%m.")}</span>'
-                    )
-                elif task.is_due_today():
-                    meta_parts.append(
-                        '<span class="date-today">📅 Heute</span>'
-                    )
-                else:
-                    meta_parts.append(
-                        f'<span class="date-normal">📅 {task.due_date.strftime("%d.%m.")}</span>'
-                    )
-
-            if meta_parts:
-                st.markdown(
-                    '<div style="margin-top:2px; display:flex; gap:8px; align-items:center;">'
-                    + "".join(meta_parts) +
-                    '</div>',
-                    unsafe_allow_html=True
-                )
+            if meta_html:
+                st.markdown(meta_html, unsafe_allow_html=True)
 
         # Edit
         with c3:
-            if st.button("✏️", key=f"edit_{task.id}", use_container_width=True):
-                st.session_state.edit_id = task.id
-                st.rerun()
+            if st.button("✏️", key=f"edit_{row.id}", use_container_width=True):
+                # Ein anderes offenes Formular schließt nur ein ganzer Lauf
+                other_open = st.session_state.edit_id is not None
+                st.session_state.edit_id = row.id
+                if other_open:
+                    st.rerun()
+                _rerun_fragment()
 
         # Delete
         with c4:
@@ -473,14 +602,15 @@ class TodoView:
                     '<p class="delete-warning">⚠️ Wirklich endgültig löschen?</p>',
                     unsafe_allow_html=True
                 )
-                st.caption(f'"{task.title}"')
+                st.caption(f'"{row.title}"')
                 if st.button(
                     "🗑️ Ja, löschen",
-                    key=f"confirm_del_{task.id}",
+                    key=f"confirm_del_{row.id}",
                     use_container_width=True
                 ):
-                    self.mediator.delete_task(task.id)
-                    st.rerun()
+                    self.mediator.delete_task(row.id)
+                    self._after_change(row.id)
+                    _rerun_fragment()
 
     
     def _render_edit_form(self, task: Task):
@@ -502,11 +632,12 @@ class TodoView:
                 if st.button("💾 Speichern", key=f"save_{task.id}", type="primary", use_container_width=True):
                     self.mediator.update_task(task.id, title=title, category=cat, due_date=due)
                     st.session_state.edit_id = None
-                    st.rerun()
+                    self._after_change(task.id)
+                    _rerun_fragment()
             with c2:
                 if st.button("❌ Abbruch", key=f"cancel_{task.id}", use_container_width=True):
                     st.session_state.edit_id = None
-                    st.rerun()
+                    _rerun_fragment()
     
     def render_statistics(self):
         """Kompakte Statistik-Sektion mit Fortschritt."""
@@ -514,7 +645,7 @@ class TodoView:
             self._header("📊 Fortschritt")
 
 
-            stats = self.mediator.controller.get_statistics()
+            stats = self.mediator.get_statistics()
             if stats["total"] == 0:
                 return
             
@@ -0,0 +1,172 @@
+#ViewModel: Alles, was ein Rerun der View anzeigt, in einem Durchgang
+#aus dem Mediator berechnet (Seite der Task-Liste mit fertigen Datums-
+#Labels, Trefferzahlen, Statistik, Kategorien). Die View liest nur noch
+#daraus. Solange sich der Änderungszähler des Controllers, die Abfrage,
+#die Seite und der Tag nicht ändern, wird der Schnappschuss wiederverwendet.
+#Das fertige HTML einer Zeile hält ein RenderCache pro (Task, Task-Version, Tag).
+
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from datetime import date
+from typing import Callable, Hashable, Optional, Tuple
+from model import Task
+from query import TaskQuery, STATUS_OPEN, STATUS_DONE
+
+# CSS-Klassen der Datumsanzeige (siehe view.CSS)
+DUE_OVERDUE = "date-overdue"
+DUE_TODAY = "date-today"
+DUE_NORMAL = "date-normal"
+
+
+@dataclass(frozen=True)
+class TaskRow:
+    """
+    Anzeigefertige Zeile; due_class ist leer, wenn kein Datum angezeigt wird.
+    version ist die Task-Version (TaskMediator.get_task_version).
+    """
+    id: str
+    title: str
+    done: bool
+    category: str
+    version: int
+    due_class: str = ""
+    due_label: str = ""
+
+    @staticmethod
+    def from_task(task: Task, today: date, version: int) -> "TaskRow":
+        due = task.due_date
+        if due is None or task.done:
+            due_class, due_label = "", ""
+        elif due < today:
+            due_class, due_label = DUE_OVERDUE, f"⚠️ {due:%d.%m.}"
+        elif due == today:
+            due_class, due_label = DUE_TODAY, "📅 Heute"
+        else:
+            due_class, due_label = DUE_NORMAL, f"📅 {due:%d.%m.}"
+        return TaskRow(task.id, task.title, task.done, task.category, version, due_class, due_label)
+
+
+def render_row_html(row: TaskRow) -> Tuple[str, str]:
+    """HTML für Titel und Meta-Zeile (Kategorie · Datum); Meta ist leer, wenn es nichts anzuzeigen gibt."""
+    title_class = "task-done" if row.done else ""
+    title_html = f'<div class="{title_class}">{row.title}</div>'
+
+    meta_parts = []
+    if row.category:
+        meta_parts.append(f'<span class="category-badge">{row.category}</span>')
+    if row.due_class:
+        meta_parts.append(f'<span class="{row.due_class}">{row.due_label}</span>')
+    meta_html = ""
+    if meta_parts:
+        meta_html = ('<div style="margin-top:2px; display:flex; gap:8px; align-items:center;">'
+                     + "".join(meta_parts) + '</div>')
+    return title_html, meta_html
+
+
+class RenderCache:
+    """
+    LRU-Cache für fertiges HTML, begrenzt auf max_entries Einträge.
+    Der Schlüssel muss alles enthalten, wovon das HTML abhängt (z.B.
+    Task-Id, Task-Version und Tag); veraltete Einträge werden nie mehr
+    getroffen und fallen nach und nach heraus. Nicht thread-sicher:
+    gedacht für einen Cache pro Sitzung.
+    """
+
+    def __init__(self, max_entries: int = 2000):
+        if max_entries < 1:
+            raise ValueError("max_entries muss mindestens 1 sein")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, object]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_build(self, key: Hashable, build: Callable[[], object]):
+        """Gibt den Eintrag zu key zurück; fehlt er, wird er mit build() erzeugt."""
+        entries = self._entries
+        value = entries.get(key)
+        if value is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = entries[key] = build()
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Verwirft alle Einträge."""
+        self._entries.clear()
+
+
+@dataclass(frozen=True)
+class ViewModel:
+    """Schnappschuss für einen Rerun (page ist auf die letzte Seite begrenzt)."""
+    version: int
+    today: date
+    query: TaskQuery
+    page: int
+    page_size: int
+    rows: Tuple[TaskRow, ...]
+    total: int          # Treffer des Filters über alle Seiten
+    open_count: int     # davon offen
+    stats: dict
+    categories: Tuple[str, ...]
+
+    @property
+    def done_count(self) -> int:
+        return self.total - self.open_count
+
+    @property
+    def pages(self) -> int:
+        return (self.total + self.page_size - 1) // self.page_size
+
+    def row(self, task_id: str) -> Optional[TaskRow]:
+        """Zeile der aktuellen Seite oder None."""
+        return next((row for row in self.rows if row.id == task_id), None)
+
+    def is_current(self, version: int, query: TaskQuery, page: int,
+                   page_size: int, today: date) -> bool:
+        return (self.version == version and self.query == query and self.page == page
+                and self.page_size == page_size and self.today == today)
+
+
+def build_view_model(mediator, query: TaskQuery, page: int, page_size: int,
+                     today: Optional[date] = None) -> ViewModel:
+    """Berechnet den Schnappschuss (je eine Abfrage für Seite, Zählungen, Statistik, Kategorien)."""
+    today = today or date.today()
+    # Zähler zuerst lesen: eine parallele Änderung macht den Schnappschuss höchstens zu früh ungültig
+    version = mediator.get_version()
+    total = mediator.count_tasks(query)
+    page = max(0, min(page, (total - 1) // page_size))
+    tasks = mediator.query_tasks(replace(query, limit=page_size, offset=page * page_size)) if total else []
+    if query.status == STATUS_DONE:
+        open_count = 0
+    elif query.status == STATUS_OPEN:
+        open_count = total
+    else:
+        open_count = mediator.count_tasks(replace(query, status=STATUS_OPEN))
+    return ViewModel(
+        version=version,
+        today=today,
+        query=query,
+        page=page,
+        page_size=page_size,
+        rows=tuple(TaskRow.from_task(task, today, mediator.get_task_version(task.id)) for task in tasks),
+        total=total,
+        open_count=open_count,
+        stats=mediator.get_statistics(),
+        categories=tuple(mediator.get_categories()),
+    )
+
+
+def get_view_model(mediator, query: TaskQuery, page: int, page_size: int,
+                   previous: Optional[ViewModel] = None, today: Optional[date] = None) -> ViewModel:
+    """Gibt previous zurück, solange es aktuell ist, sonst einen neuen Schnappschuss."""
+    today = today or date.today()
+    if previous is not None and previous.is_current(mediator.get_version(), query, page, page_size, today):
+        return previous
+    return build_view_model(mediator, query, page, page_size, today)
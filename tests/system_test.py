@@ -6,12 +6,15 @@ Testet das gesamte System technisch, kontrolliert.
 Ausführung mit Coverage:
     pytest system_test.py -v --cov=. --cov-report=term-missing
 """
+import os
+import threading
 import pytest
 from datetime import date, timedelta
 from model import Task
 from controller import TaskController
 from repository import JSONTaskRepository, InMemoryTaskRepository
 from patterns import TaskMediator, TaskFactory, ExternalTaskFormat
+from snapshot import encode_snapshot, read_snapshot
 
 
 class TestTodoSystem:
@@ -90,6 +93,170 @@ class TestTodoSystem:
         assert stats["done"] == 1
         assert stats["open"] == 2
     
+    def test_save_is_atomic(self, tmp_path):
+        """Speichern hinterlässt keine Temp-Dateien und ersetzt die Datei."""
+        filepath = str(tmp_path / "tasks.json")
+        repo = JSONTaskRepository(filepath)
+        ctrl = TaskController(repository=repo)
+        ctrl.add("Atomar")
+        ctrl.save()
+        
+        leftovers = [n for n in os.listdir(tmp_path) if n.endswith(".tmp")]
+        assert leftovers == []
+        assert [t.title for t in repo.load()] == ["Atomar"]
+    
+    @pytest.mark.skipif(os.name == "nt", reason="POSIX-Dateirechte")
+    def test_save_keeps_file_mode(self, tmp_path):
+        """Atomares Speichern behält die Rechte der Datei (mkstemp legt 0600 an)."""
+        filepath = tmp_path / "tasks.json"
+        filepath.write_text("[]", encoding="utf-8")
+        os.chmod(filepath, 0o644)
+        repo = JSONTaskRepository(str(filepath), use_snapshot=True)
+        
+        repo.save([Task(title="Rechte")])
+        repo.load()
+        (tmp_path / "neu.json").write_text("[]", encoding="utf-8")
+        expected_new = os.stat(tmp_path / "neu.json").st_mode & 0o777
+        
+        assert os.stat(filepath).st_mode & 0o777 == 0o644
+        assert os.stat(repo.snapshot_path).st_mode & 0o777 == expected_new
+    
+    @pytest.mark.skipif(os.name == "nt", reason="POSIX-Dateirechte")
+    def test_new_file_follows_current_umask(self, tmp_path):
+        """Neue Dateien bekommen 0666 abzüglich der aktuellen umask, wie bei open()."""
+        filepath = str(tmp_path / "tasks.json")
+        repo = JSONTaskRepository(filepath, use_snapshot=True)
+        old_umask = os.umask(0o027)
+        try:
+            repo.save([Task(title="Neu")])
+        finally:
+            os.umask(old_umask)
+        
+        assert os.stat(filepath).st_mode & 0o777 == 0o640
+        assert os.stat(repo.snapshot_path).st_mode & 0o777 == 0o640
+    
+    def test_corrupt_file_is_preserved(self, tmp_path):
+        """Beschädigte Datei wird nicht kommentarlos überschrieben."""
+        filepath = tmp_path / "tasks.json"
+        filepath.write_text('[{"id": "abc", "tit', encoding="utf-8")
+        repo = JSONTaskRepository(str(filepath))
+        
+        loaded = repo.load()
+        repo.save([Task(title="Neu")])
+        
+        assert loaded == []
+        assert (tmp_path / "tasks.json.corrupt").read_text(encoding="utf-8").startswith('[{"id"')
+    
+    def test_concurrent_writers_leave_valid_file(self, tmp_path):
+        """Parallele Schreiber erzeugen immer eine gültige Datei."""
+        filepath = str(tmp_path / "tasks.json")
+        
+        def writer(n):
+            repo = JSONTaskRepository(filepath)
+            for _ in range(10):
+                repo.save([Task(title=f"Writer {n}") for _ in range(50)])
+        
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        loaded = JSONTaskRepository(filepath).load()
+        assert len(loaded) == 50
+        assert len({t.title for t in loaded}) == 1
+    
+    def test_iter_load_matches_load(self, tmp_path):
+        """Streaming-Loader liefert dieselben Tasks wie load()."""
+        filepath = str(tmp_path / "tasks.json")
+        repo = JSONTaskRepository(filepath)
+        ctrl = TaskController(repository=repo)
+        for i in range(20):
+            ctrl.add(f"Größe {i} 🛒", category="Einkauf", due_date=date.today())
+        ctrl.save()
+        
+        streamed = list(repo.iter_load(chunk_size=7))
+        
+        assert [t.to_dict() for t in streamed] == [t.to_dict() for t in repo.load()]
+    
+    def test_iter_load_corrupt_raises(self, tmp_path):
+        """Abgeschnittene Datei führt beim Streaming zu ValueError."""
+        filepath = tmp_path / "tasks.json"
+        filepath.write_text('[{"id": "a", "title": "x", "done": false}, {"id"', encoding="utf-8")
+        
+        with pytest.raises(ValueError):
+            list(JSONTaskRepository(str(filepath)).iter_load())
+    
+    def test_controller_streaming_load(self, tmp_path):
+        """Controller füllt seine Liste aus dem Stream."""
+        filepath = str(tmp_path / "tasks.json")
+        ctrl1 = TaskController(repository=JSONTaskRepository(filepath))
+        ctrl1.add("Eins")
+        ctrl1.add("Zwei")
+        ctrl1.save()
+        
+        ctrl2 = TaskController(repository=JSONTaskRepository(filepath))
+        ctrl2.load(streaming=True)
+        
+        assert [t.title for t in ctrl2.get_all()] == ["Eins", "Zwei"]
+    
+    def test_snapshot_roundtrip(self, tmp_path):
+        """Binärer Snapshot enthält alle Felder verlustfrei."""
+        source = tmp_path / "tasks.json"
+        source.write_text("[]", encoding="utf-8")
+        tasks = [
+            Task(title="Arzttermin 💪", category="Privat", due_date=date.today()),
+            Task(title="Erledigt", done=True, created_at="gestern"),
+            Task(title="Ohne Kategorie"),
+        ]
+        path = tmp_path / "tasks.json.snap"
+        
+        path.write_bytes(encode_snapshot(tasks, os.stat(source)))
+        loaded = read_snapshot(str(path), os.stat(source))
+        
+        assert [t.to_dict() for t in loaded] == [t.to_dict() for t in tasks]
+    
+    def test_snapshot_stale_after_external_change(self, tmp_path):
+        """Snapshot wird nach Änderung der JSON-Datei von außen neu erzeugt."""
+        filepath = str(tmp_path / "tasks.json")
+        repo = JSONTaskRepository(filepath, use_snapshot=True)
+        repo.save([Task(title="Alt")])
+        assert read_snapshot(repo.snapshot_path, os.stat(filepath)) is not None
+        
+        JSONTaskRepository(filepath).save([Task(title="Neu")])
+        assert read_snapshot(repo.snapshot_path, os.stat(filepath)) is None
+        
+        assert [t.title for t in repo.load()] == ["Neu"]
+        assert [t.title for t in read_snapshot(repo.snapshot_path, os.stat(filepath))] == ["Neu"]
+    
+    def test_load_after_save_uses_snapshot(self, tmp_path, monkeypatch):
+        """save() schreibt den Snapshot mit: der nächste Start parst kein JSON."""
+        filepath = str(tmp_path / "tasks.json")
+        repo = JSONTaskRepository(filepath, use_snapshot=True)
+        repo.save([Task(title="Alt")])
+        tasks = repo.load()
+        tasks.append(Task(title="Neu"))
+        repo.save(tasks)
+        
+        def no_json(self):
+            raise AssertionError("JSON-Datei geparst")
+        
+        monkeypatch.setattr(JSONTaskRepository, "_read", no_json)
+        loaded = JSONTaskRepository(filepath, use_snapshot=True).load()
+        
+        assert [t.title for t in loaded] == ["Alt", "Neu"]
+    
+    def test_corrupt_snapshot_falls_back_to_json(self, tmp_path):
+        """Beschädigter Snapshot wird ignoriert."""
+        filepath = str(tmp_path / "tasks.json")
+        repo = JSONTaskRepository(filepath, use_snapshot=True)
+        repo.save([Task(title="Sicher")])
+        repo.load()
+        with open(repo.snapshot_path, "r+b") as f:
+            f.truncate(40)
+        
+        assert [t.title for t in repo.load()] == ["Sicher"]
+
 
 
 if __name__ == "__main__":
@@ -5,9 +5,32 @@ Testet das Zusammenspiel von Controller und Repository.
 Ausführung:
     pytest test_integration.py -v
 """
+import asyncio
+import json
+import os
+import subprocess
+import sys
 import pytest
-from controller import TaskController
-from repository import InMemoryTaskRepository
+from datetime import date, timedelta
+from async_api import AsyncTaskMediator, AsyncTaskRepository
+import cli
+import columnar
+import repository
+from columnar import ColumnarTaskRepository
+from controller import TaskController, PushdownTaskController
+from repository import (
+    InMemoryTaskRepository,
+    JSONTaskRepository,
+    JournalTaskRepository,
+    SQLiteTaskRepository,
+    ShardedTaskRepository,
+    migrate_json_to_sqlite,
+)
+from patterns import TaskMediator, ExternalTaskFormat
+from query import TaskQuery
+from model import Task
+from store import SharedTaskStore
+from viewmodel import build_view_model
 
 
 class TestIntegration:
@@ -60,5 +83,931 @@ class TestIntegration:
         assert len(loaded) == 0
 
 
+class TestJournalRepository:
+    """Controller mit Append-only-Journal als Persistenz."""
+    
+    # 1. Änderungen werden angehängt und beim Laden abgespielt
+    def test_changes_replayed_on_load(self, tmp_path):
+        # Arrange
+        filepath = str(tmp_path / "tasks.json")
+        ctrl = TaskController(repository=JournalTaskRepository(filepath))
+        keep = ctrl.add("Bleibt", category="Arbeit")
+        gone = ctrl.add("Wird gelöscht")
+        ctrl.save()
+        
+        # Act
+        ctrl.toggle(keep.id)
+        ctrl.delete(gone.id)
+        ctrl.save()
+        ctrl2 = TaskController(repository=JournalTaskRepository(filepath))
+        ctrl2.load()
+        
+        # Assert
+        assert [t.id for t in ctrl2.tasks] == [keep.id]
+        assert ctrl2.tasks[0].done == True
+    
+    # 2. Nur geänderte Tasks landen im Journal
+    def test_only_changes_appended(self, tmp_path):
+        # Arrange
+        filepath = str(tmp_path / "tasks.json")
+        repo = JournalTaskRepository(filepath)
+        ctrl = TaskController(repository=repo)
+        for i in range(5):
+            ctrl.add(f"Task {i}")
+        ctrl.save()
+        
+        # Act
+        ctrl.toggle(ctrl.tasks[2].id)
+        ctrl.save()
+        
+        # Assert
+        with open(repo.journal_path, encoding="utf-8") as f:
+            lines = f.readlines()
+        assert len(lines) == 6
+    
+    # 3. Abgeschnittene letzte Journal-Zeile wird ignoriert
+    def test_truncated_journal_line_ignored(self, tmp_path):
+        # Arrange
+        filepath = str(tmp_path / "tasks.json")
+        repo = JournalTaskRepository(filepath)
+        ctrl = TaskController(repository=repo)
+        ctrl.add("Sicher")
+        ctrl.save()
+        with open(repo.journal_path, "a", encoding="utf-8") as f:
+            f.write('{"op": "put", "task": {"id": "ab')
+        
+        # Act
+        loaded = JournalTaskRepository(filepath).load()
+        
+        # Assert
+        assert [t.title for t in loaded] == ["Sicher"]
+    
+    # 4. Journal wird ab Schwellwert in den Snapshot kompaktiert
+    def test_compaction_writes_snapshot(self, tmp_path):
+        # Arrange
+        filepath = str(tmp_path / "tasks.json")
+        repo = JournalTaskRepository(filepath, compact_threshold=200)
+        ctrl = TaskController(repository=repo)
+        
+        # Act
+        for i in range(10):
+            ctrl.add(f"Task {i}")
+            ctrl.save()
+        repo.wait_for_compaction()
+        
+        # Assert
+        assert len(JSONTaskRepository(filepath).load()) > 0
+        assert len(JournalTaskRepository(filepath).load()) == 10
+    
+    # 5. Bestehende tasks.json wird als Snapshot übernommen
+    def test_reads_existing_json_file(self, tmp_path):
+        # Arrange
+        filepath = str(tmp_path / "tasks.json")
+        ctrl = TaskController(repository=JSONTaskRepository(filepath))
+        ctrl.add("Alt")
+        ctrl.save()
+        
+        # Act
+        loaded = JournalTaskRepository(filepath).load()
+        
+        # Assert
+        assert [t.title for t in loaded] == ["Alt"]
+    
+    # 6. Beschädigter Snapshot wird beiseitegelegt statt bei der Kompaktierung überschrieben
+    def test_corrupt_snapshot_is_preserved(self, tmp_path, caplog):
+        # Arrange
+        filepath = tmp_path / "tasks.json"
+        filepath.write_text('[{"id": "abc", "tit', encoding="utf-8")
+        repo = JournalTaskRepository(str(filepath), compact_threshold=1)
+        
+        # Act
+        loaded = repo.load()
+        repo.save([Task(title="Neu")])
+        repo.wait_for_compaction()
+        
+        # Assert
+        assert loaded == []
+        assert (tmp_path / "tasks.json.corrupt").read_text(encoding="utf-8").startswith('[{"id"')
+        assert [t.title for t in JournalTaskRepository(str(filepath)).load()] == ["Neu"]
+        assert "tasks.json.corrupt" in caplog.text
+
+
+class TestSQLiteRepository:
+    """SQLite-Repository mit Query-Pushdown."""
+    
+    @pytest.fixture
+    def repo(self, tmp_path):
+        repository = SQLiteTaskRepository(str(tmp_path / "tasks.db"))
+        yield repository
+        repository.close()
+    
+    # 1. Speichern und Laden erhält Reihenfolge und Felder
+    def test_save_load_roundtrip(self, repo):
+        # Arrange
+        ctrl = TaskController(repository=repo)
+        ctrl.add("Erste", category="Arbeit", due_date=date.today())
+        ctrl.add("Zweite")
+        ctrl.save()
+        
+        # Act
+        loaded = repo.load()
+        
+        # Assert
+        assert [t.to_dict() for t in loaded] == [t.to_dict() for t in ctrl.tasks]
+    
+    # 2. Full-Save entfernt gelöschte Tasks
+    def test_save_removes_deleted(self, repo):
+        # Arrange
+        ctrl = TaskController(repository=repo)
+        task = ctrl.add("Weg")
+        ctrl.add("Bleibt")
+        ctrl.save()
+        
+        # Act
+        ctrl.delete(task.id)
+        ctrl.save()
+        
+        # Assert
+        assert [t.title for t in repo.load()] == ["Bleibt"]
+    
+    # 3. Controller schreibt nur Änderungen (save_changes)
+    def test_controller_saves_changes_only(self, repo):
+        # Arrange
+        ctrl = TaskController(repository=repo)
+        first = ctrl.add("Eins")
+        second = ctrl.add("Zwei")
+        ctrl.save()
+        
+        # Act
+        ctrl.update(first.id, title="Eins geändert")
+        ctrl.delete(second.id)
+        ctrl.add("Drei")
+        ctrl.save()
+        
+        # Assert
+        assert [t.title for t in repo.load()] == ["Eins geändert", "Drei"]
+    
+    # 4. Pushdown-Controller beantwortet Abfragen per SQL
+    def test_pushdown_queries(self, repo):
+        # Arrange
+        ctrl = PushdownTaskController(repo)
+        mediator = TaskMediator(ctrl)
+        yesterday = date.today() - timedelta(days=1)
+        late = mediator.add_task("Überfällig", category="Arbeit", due_date=yesterday)
+        mediator.add_task("Heute", category="Privat", due_date=date.today())
+        done = mediator.add_task("Fertig", category="Arbeit")
+        
+        # Act
+        mediator.toggle_task(done.id)
+        mediator.update_task(late.id, title="Sehr überfällig")
+        
+        # Assert
+        assert ctrl.tasks == []
+        assert [t.title for t in ctrl.get_open()] == ["Sehr überfällig", "Heute"]
+        assert [t.title for t in ctrl.get_done()] == ["Fertig"]
+        assert len(ctrl.get_by_category("Arbeit")) == 2
+        assert ctrl.get_categories() == ["Arbeit", "Privat"]
+        assert [t.id for t in ctrl.get_overdue()] == [late.id]
+        assert len(ctrl.get_due_today()) == 1
+        stats = ctrl.get_statistics()
+        assert (stats["total"], stats["done"], stats["overdue"]) == (3, 1, 1)
+    
+    # 5. Pushdown-Controller löscht zeilenweise
+    def test_pushdown_delete(self, repo):
+        # Arrange
+        mediator = TaskMediator(PushdownTaskController(repo))
+        task = mediator.add_typed_task("work", "Meeting")
+        
+        # Act
+        result = mediator.delete_task(task.id)
+        
+        # Assert
+        assert result == True
+        assert repo.load() == []
+        assert mediator.delete_task(task.id) == False
+    
+    # 6. Migration aus tasks.json
+    def test_migrate_json(self, tmp_path):
+        # Arrange
+        json_path = str(tmp_path / "tasks.json")
+        db_path = str(tmp_path / "tasks.db")
+        ctrl = TaskController(repository=JSONTaskRepository(json_path))
+        ctrl.add("Alt 1", category="Arbeit")
+        ctrl.add("Alt 2", due_date=date.today())
+        ctrl.save()
+        
+        # Act
+        count = migrate_json_to_sqlite(json_path, db_path)
+        
+        # Assert
+        repo = SQLiteTaskRepository(db_path)
+        assert count == 2
+        assert [t.to_dict() for t in repo.load()] == [t.to_dict() for t in ctrl.tasks]
+        repo.close()
+    
+    # 7. Fälligkeitsbereiche werden in SQL abgefragt
+    @pytest.mark.parametrize("repo_factory", [
+        lambda path: SQLiteTaskRepository(str(path / "tasks.db")),
+        lambda path: ShardedTaskRepository(str(path / "shards"), "due_month"),
+    ])
+    def test_pushdown_due_ranges(self, tmp_path, repo_factory):
+        # Arrange
+        today = date.today()
+        mediator = TaskMediator(PushdownTaskController(repo_factory(tmp_path)))
+        mediator.add_task("In 3 Tagen", due_date=today + timedelta(days=3))
+        mediator.add_task("Morgen", due_date=today + timedelta(days=1))
+        mediator.add_task("In 40 Tagen", due_date=today + timedelta(days=40))
+        done = mediator.add_task("Erledigt", due_date=today + timedelta(days=2))
+        mediator.toggle_task(done.id)
+        
+        # Act
+        upcoming = mediator.get_upcoming_tasks(7)
+        
+        # Assert
+        assert [t.title for t in upcoming] == ["Morgen", "In 3 Tagen"]
+    
+    # 8. Zusammengesetzte Abfrage über den Pushdown-Controller
+    def test_pushdown_query(self, repo):
+        # Arrange
+        mediator = TaskMediator(PushdownTaskController(repo))
+        mediator.add_task("Ohne Datum", category="Arbeit")
+        mediator.add_task("Heute", category="Arbeit", due_date=date.today())
+        mediator.add_task("Privat", category="Privat", due_date=date.today())
+        
+        # Act
+        result = mediator.query_tasks(TaskQuery(category="Arbeit", status="open", sort="smart"))
+        
+        # Assert
+        assert [t.title for t in result] == ["Heute", "Ohne Datum"]
+    
+    # 9. Sammeloperationen schreiben in einem Aufruf
+    def test_pushdown_bulk(self, repo):
+        # Arrange
+        mediator = TaskMediator(PushdownTaskController(repo))
+        tasks = mediator.add_many(["A", "B", "C"], category="Alt")
+        
+        # Act
+        mediator.set_done_many([tasks[0].id, tasks[1].id])
+        mediator.update_many([t.id for t in tasks], category="Neu")
+        deleted = mediator.delete_many([t.id for t in mediator.get_done_tasks()])
+        
+        # Assert
+        assert deleted == 2
+        assert [(t.title, t.category) for t in repo.load()] == [("C", "Neu")]
+    
+    # 10. Controller ohne Abfrage-Repository wird abgelehnt
+    def test_pushdown_requires_query_repository(self):
+        with pytest.raises(TypeError):
+            PushdownTaskController(InMemoryTaskRepository())
+    
+    # 11. Seitenweise Abfragen laufen ganz in SQL und gleichen dem Controller
+    @pytest.mark.parametrize("query", [
+        TaskQuery(),
+        TaskQuery(status="open", sort="smart", limit=5),
+        TaskQuery(status="done", category="A", sort="due"),
+        TaskQuery(category="B", sort="title", limit=3, offset=2),
+        TaskQuery(due_from=date.today() - timedelta(days=1), due_to=date.today() + timedelta(days=2)),
+        TaskQuery(text="ubung", sort="smart", offset=1),
+        TaskQuery(status="open", text="🔨", sort="title", limit=4),
+        TaskQuery(offset=35),
+    ])
+    def test_query_matches_controller(self, repo, monkeypatch, query):
+        # Arrange
+        today = date.today()
+        tasks = [Task(["Übung", "abend", "Zebra", "älter"][i % 4] + f" {i}", done=i % 3 == 0,
+                      category=["", "A", "B"][i % 3],
+                      due_date=today + timedelta(days=i % 7 - 3) if i % 2 else None)
+                 for i in range(40)]
+        memory = TaskController(repository=InMemoryTaskRepository())
+        memory.replace_all([Task.from_dict(t.to_dict()) for t in tasks])
+        ctrl = PushdownTaskController(repo)
+        ctrl.add_many(tasks)
+        for name in ("load", "find_open", "find_done", "find_by_category"):
+            monkeypatch.setattr(repo, name, lambda *args: pytest.fail("lädt die ganze Partition"))
+        
+        # Act / Assert
+        assert [t.id for t in ctrl.query(query, today)] == [t.id for t in memory.query(query, today)]
+        assert ctrl.count(query) == memory.count(query)
+    
+    # 12. Überfällige Tasks kommen nach Fälligkeit sortiert wie beim Controller
+    def test_overdue_sorted_by_due_date(self, repo):
+        # Arrange
+        today = date.today()
+        ctrl = PushdownTaskController(repo)
+        ctrl.add("late2", due_date=today - timedelta(days=1))
+        ctrl.add("late1", due_date=today - timedelta(days=5))
+        ctrl.add("late2b", due_date=today - timedelta(days=1))
+        
+        # Act
+        overdue = ctrl.get_overdue(today)
+        
+        # Assert
+        assert [t.title for t in overdue] == ["late1", "late2", "late2b"]
+
+
+class TestShardedRepository:
+    """Sharded Repository mit lazy geladenen Shards."""
+    
+    # 1. Speichern und Laden über alle Shards
+    def test_roundtrip(self, tmp_path):
+        # Arrange
+        repo = ShardedTaskRepository(str(tmp_path / "shards"))
+        ctrl = TaskController(repository=repo)
+        ctrl.add("Arbeit 1", category="Arbeit")
+        ctrl.add("Privat 1", category="Privat")
+        ctrl.add("Ohne")
+        ctrl.save()
+        
+        # Act
+        loaded = ShardedTaskRepository(str(tmp_path / "shards")).load()
+        
+        # Assert
+        assert sorted(t.title for t in loaded) == ["Arbeit 1", "Ohne", "Privat 1"]
+    
+    # 2. Kategorie-Abfrage liest nur den passenden Shard
+    def test_category_query_loads_single_shard(self, tmp_path):
+        # Arrange
+        directory = str(tmp_path / "shards")
+        ctrl = TaskController(repository=ShardedTaskRepository(directory))
+        for cat in ("Arbeit", "Privat", "Einkauf"):
+            ctrl.add(f"{cat} Task", category=cat)
+        ctrl.save()
+        repo = ShardedTaskRepository(directory)
+        
+        # Act
+        tasks = PushdownTaskController(repo).get_by_category("Privat")
+        
+        # Assert
+        assert [t.title for t in tasks] == ["Privat Task"]
+        assert repo.loaded_shards == ["Privat"]
+        assert repo.find_categories() == ["Arbeit", "Einkauf", "Privat"]
+    
+    # 3. Änderungen schreiben nur betroffene Shards
+    def test_only_dirty_shards_written(self, tmp_path):
+        # Arrange
+        directory = tmp_path / "shards"
+        repo = ShardedTaskRepository(str(directory))
+        ctrl = TaskController(repository=repo)
+        work = ctrl.add("Arbeit", category="Arbeit")
+        ctrl.add("Privat", category="Privat")
+        ctrl.save()
+        inodes = {p.name: p.stat().st_ino for p in directory.glob("shard-*")}
+        
+        # Act
+        ctrl.toggle(work.id)
+        ctrl.save()
+        
+        # Assert
+        changed = [p.name for p in directory.glob("shard-*") if p.stat().st_ino != inodes[p.name]]
+        assert len(changed) == 1 and "Arbeit" in changed[0]
+    
+    # 4. Kategoriewechsel verschiebt den Task zwischen Shards
+    def test_category_change_moves_task(self, tmp_path):
+        # Arrange
+        directory = str(tmp_path / "shards")
+        mediator = TaskMediator(PushdownTaskController(ShardedTaskRepository(directory)))
+        task = mediator.add_task("Wandert", category="Arbeit")
+        
+        # Act
+        mediator.update_task(task.id, category="Privat")
+        
+        # Assert
+        repo = ShardedTaskRepository(directory)
+        assert repo.find_by_category("Arbeit") == []
+        assert [t.id for t in repo.find_by_category("Privat")] == [task.id]
+    
+    # 5. Andere Schlüssel: Fälligkeitsmonat und Hash
+    @pytest.mark.parametrize("shard_key", ["due_month", "hash"])
+    def test_other_shard_keys(self, tmp_path, shard_key):
+        # Arrange
+        directory = str(tmp_path / "shards")
+        mediator = TaskMediator(PushdownTaskController(ShardedTaskRepository(directory, shard_key)))
+        yesterday = date.today() - timedelta(days=1)
+        late = mediator.add_task("Überfällig", due_date=yesterday)
+        mediator.add_task("Heute", due_date=date.today())
+        gone = mediator.add_task("Weg")
+        
+        # Act
+        mediator.delete_task(gone.id)
+        ctrl = PushdownTaskController(ShardedTaskRepository(directory, shard_key))
+        
+        # Assert
+        assert [t.id for t in ctrl.get_overdue()] == [late.id]
+        assert [t.title for t in ctrl.get_due_today()] == ["Heute"]
+        assert ctrl.get_statistics()["total"] == 2
+        assert ctrl.get_by_id(late.id).title == "Überfällig"
+    
+    # 6. Anderer Schlüssel als im Manifest wird abgelehnt
+    def test_shard_key_mismatch_raises(self, tmp_path):
+        directory = str(tmp_path / "shards")
+        ShardedTaskRepository(directory).save([])
+        with pytest.raises(ValueError):
+            ShardedTaskRepository(directory, shard_key="hash")
+    
+    # 7. Überfällige Tasks über mehrere Shards nach Fälligkeit sortiert
+    @pytest.mark.parametrize("shard_key", ["category", "due_month", "hash"])
+    def test_overdue_sorted_by_due_date(self, tmp_path, shard_key):
+        # Arrange
+        today = date.today()
+        ctrl = PushdownTaskController(ShardedTaskRepository(str(tmp_path / "shards"), shard_key))
+        ctrl.add("late2", category="B", due_date=today - timedelta(days=1))
+        ctrl.add("late1", category="A", due_date=today - timedelta(days=40))
+        ctrl.add("late3", category="A", due_date=today - timedelta(days=1))
+        
+        # Act
+        overdue = ctrl.get_overdue(today)
+        
+        # Assert
+        assert [t.title for t in overdue][0] == "late1"
+        assert sorted(t.title for t in overdue[1:]) == ["late2", "late3"]
+    
+    # 8. Gefilterte Ansicht liest nur den Shard der Kategorie, Statistik kommt aus dem Manifest
+    def test_filtered_view_reads_single_shard(self, tmp_path, monkeypatch):
+        # Arrange
+        directory = str(tmp_path / "shards")
+        today = date.today()
+        ctrl = TaskController(repository=ShardedTaskRepository(directory))
+        for cat in ("Arbeit", "Privat", "Einkauf"):
+            ctrl.add(f"{cat} offen", category=cat, due_date=today - timedelta(days=1))
+            ctrl.toggle(ctrl.add(f"{cat} erledigt", category=cat, due_date=today).id)
+        ctrl.save()
+        expected = ctrl.get_statistics(today)
+        reads = []
+        real_open = open
+        
+        def counting_open(path, *args, **kwargs):
+            if os.path.basename(str(path)).startswith("shard-"):
+                reads.append(os.path.basename(str(path)))
+            return real_open(path, *args, **kwargs)
+        
+        monkeypatch.setattr(repository, "open", counting_open, raising=False)
+        pushdown = PushdownTaskController(ShardedTaskRepository(directory))
+        
+        # Act
+        vm = build_view_model(TaskMediator(pushdown), TaskQuery(category="Privat"), 0, 10, today)
+        counts = pushdown.get_category_counts()
+        
+        # Assert
+        assert [row.title for row in vm.rows] == ["Privat offen", "Privat erledigt"]
+        assert vm.stats == expected
+        assert vm.categories == ("Arbeit", "Einkauf", "Privat")
+        assert counts == {"Arbeit": 2, "Privat": 2, "Einkauf": 2}
+        assert len(reads) == 1 and "Privat" in reads[0]
+
+
+class TestColumnarRepository:
+    """Spaltenorientierter Bestand hinter dem Pushdown-Controller."""
+    
+    @pytest.fixture(params=["numpy", "array"])
+    def vectorized(self, request, monkeypatch):
+        """Beide Pfade testen: mit NumPy (falls installiert) und ohne."""
+        if request.param == "numpy":
+            pytest.importorskip("numpy")
+        else:
+            monkeypatch.setattr(columnar, "np", None)
+    
+    # 1. Änderungen landen im Quell-Repository und überstehen Neustarts
+    @pytest.mark.parametrize("source_class", [JSONTaskRepository, JournalTaskRepository])
+    def test_write_through_roundtrip(self, tmp_path, vectorized, source_class):
+        # Arrange
+        path = str(tmp_path / "tasks.json")
+        mediator = TaskMediator(PushdownTaskController(ColumnarTaskRepository(source_class(path))))
+        keep = mediator.add_task("Bleibt", category="Arbeit", due_date=date.today())
+        gone = mediator.add_task("Weg")
+        
+        # Act
+        mediator.toggle_task(keep.id)
+        mediator.delete_task(gone.id)
+        reopened = ColumnarTaskRepository(source_class(path))
+        
+        # Assert
+        assert [t.to_dict() for t in reopened.load()] == [
+            mediator.get_task_by_id(keep.id).to_dict()]
+        assert reopened.find_done()[0].id == keep.id
+    
+    # 2. Vektorisierte Zählungen stimmen mit dem Controller überein
+    def test_statistics_match_controller(self, vectorized):
+        # Arrange
+        today = date.today()
+        tasks = [Task(f"Task {i}", done=i % 3 == 0, category=["", "A", "B"][i % 3],
+                      due_date=today + timedelta(days=i % 7 - 3) if i % 2 else None)
+                 for i in range(60)]
+        memory = TaskController(repository=InMemoryTaskRepository())
+        memory.replace_all([Task.from_dict(t.to_dict()) for t in tasks])
+        repo = ColumnarTaskRepository(InMemoryTaskRepository())
+        repo.save(tasks)
+        ctrl = PushdownTaskController(repo)
+        
+        # Act
+        repo.delete([t.id for t in tasks[:40:4]])
+        for task_id in [t.id for t in tasks[:40:4]]:
+            memory.delete(task_id)
+        
+        # Assert
+        assert ctrl.get_statistics() == memory.get_statistics()
+        assert ctrl.get_category_counts() == memory.get_category_counts()
+        assert ctrl.get_categories() == memory.get_categories()
+        assert [t.id for t in ctrl.get_overdue()] == [t.id for t in memory.get_overdue()]
+        assert [t.id for t in ctrl.get_due_today()] == [t.id for t in memory.get_due_today()]
+        assert [t.id for t in ctrl.get_open()] == [t.id for t in memory.get_open()]
+    
+    # 3. Kompaktierung nach vielen Löschungen erhält Reihenfolge und Felder
+    def test_compaction_keeps_rows(self, vectorized):
+        # Arrange
+        repo = ColumnarTaskRepository(InMemoryTaskRepository())
+        tasks = [Task(f"Task {i}", created_at="kein Datum" if i == 7 else Task("x").created_at)
+                 for i in range(10)]
+        repo.upsert(tasks)
+        
+        # Act
+        repo.delete([t.id for t in tasks[:6]])
+        
+        # Assert
+        assert [t.to_dict() for t in repo.load()] == [t.to_dict() for t in tasks[6:]]
+        assert repo.find_by_id(tasks[7].id).created_at == "kein Datum"
+    
+    # 4. Abfragen stimmen mit dem Controller überein
+    @pytest.mark.parametrize("query", [
+        TaskQuery(),
+        TaskQuery(status="open", sort="smart", limit=5),
+        TaskQuery(status="done", category="A", sort="due"),
+        TaskQuery(category="B", sort="title", limit=3, offset=2),
+        TaskQuery(due_from=date.today() - timedelta(days=1), due_to=date.today() + timedelta(days=2)),
+        TaskQuery(text="task 1", sort="smart", offset=1),
+        TaskQuery(status="open", text="🔨"),
+        TaskQuery(category="fehlt"),
+    ])
+    def test_query_matches_controller(self, vectorized, query):
+        # Arrange
+        today = date.today()
+        tasks = [Task(f"Task {i}", done=i % 3 == 0, category=["", "A", "B"][i % 3],
+                      due_date=today + timedelta(days=i % 7 - 3) if i % 2 else None)
+                 for i in range(40)]
+        memory = TaskController(repository=InMemoryTaskRepository())
+        memory.replace_all([Task.from_dict(t.to_dict()) for t in tasks])
+        ctrl = PushdownTaskController(ColumnarTaskRepository(InMemoryTaskRepository()))
+        ctrl.add_many(tasks)
+        
+        # Act / Assert
+        assert [t.id for t in ctrl.query(query)] == [t.id for t in memory.query(query)]
+        assert ctrl.count(query) == memory.count(query)
+    
+    # 5. Nur die Zeilen der angefragten Seite werden zu Task-Objekten
+    def test_query_materializes_only_page(self, vectorized, monkeypatch):
+        # Arrange
+        repo = ColumnarTaskRepository(InMemoryTaskRepository())
+        repo.upsert([Task(f"Task {i}", done=i % 2 == 0) for i in range(100)])
+        ctrl = PushdownTaskController(repo)
+        built = []
+        build = repo._task
+        monkeypatch.setattr(repo, "_task", lambda row: built.append(row) or build(row))
+        
+        # Act
+        page = ctrl.query(TaskQuery(status="open", sort="title", limit=10, offset=20))
+        total = ctrl.count(TaskQuery(status="open"))
+        
+        # Assert
+        assert len(page) == 10
+        assert total == 50
+        assert len(built) == 10
+    
+    # 6. Versionen gelöschter Tasks werden nicht aufgehoben
+    def test_deleted_task_versions_pruned(self):
+        ctrl = PushdownTaskController(ColumnarTaskRepository(InMemoryTaskRepository()))
+        tasks = ctrl.add_many([Task(f"Task {i}") for i in range(5)])
+        
+        ctrl.delete_many([t.id for t in tasks])
+        
+        assert ctrl._task_versions == {}
+
+
+class TestSharedStore:
+    """Prozessweit geteilter Store mit Session-Handles."""
+    
+    # 1. Ein Store pro Datei, Sessions sehen dieselben Daten
+    def test_sessions_share_data(self, tmp_path):
+        # Arrange
+        filepath = str(tmp_path / "tasks.json")
+        session1 = SharedTaskStore.for_path(filepath).session()
+        session2 = SharedTaskStore.for_path(filepath).session()
+        
+        # Act
+        task = session1.add_task("Geteilt")
+        
+        # Assert
+        assert SharedTaskStore.for_path(filepath) is session1.store
+        assert [t.id for t in session2.get_all_tasks()] == [task.id]
+    
+    # 2. Listener bleiben pro Session getrennt
+    def test_listeners_per_session(self, tmp_path):
+        # Arrange
+        store = SharedTaskStore.for_path(str(tmp_path / "tasks.json"))
+        session1, session2 = store.session(), store.session()
+        events = []
+        session2.add_listener(events.append)
+        
+        # Act
+        session1.add_task("Nur Session 1")
+        
+        # Assert
+        assert events == []
+    
+    # 3. Änderung der Datei von außen löst Neuladen aus
+    def test_reload_on_external_change(self, tmp_path):
+        # Arrange
+        filepath = str(tmp_path / "tasks.json")
+        session = SharedTaskStore.for_path(filepath).session()
+        session.add_task("Intern")
+        
+        # Act
+        other = TaskController(repository=JSONTaskRepository(filepath))
+        other.load()
+        other.add("Extern")
+        other.save()
+        
+        # Assert
+        assert [t.title for t in session.get_all_tasks()] == ["Intern", "Extern"]
+    
+    # 4. Eigenes Speichern führt zu keinem Neuladen
+    def test_no_reload_after_own_save(self, tmp_path):
+        # Arrange
+        store = SharedTaskStore.for_path(str(tmp_path / "tasks.json"))
+        session = store.session()
+        session.add_task("Eins")
+        
+        # Act
+        reloaded = store.refresh()
+        
+        # Assert
+        assert reloaded == False
+    
+    # 5. Externe Änderung und eigene, noch nicht geschriebene Änderung bleiben beide erhalten
+    def test_external_change_merged_with_pending_changes(self, tmp_path):
+        # Arrange
+        filepath = str(tmp_path / "tasks.json")
+        JSONTaskRepository(filepath).save([Task("App"), Task("CLI")])
+        store = SharedTaskStore(filepath, write_behind=True)
+        session = store.session()
+        app_task, cli_task = session.get_all_tasks()
+        session.toggle_task(app_task.id)
+        
+        # Act
+        cli.main(["--data", filepath, "done", cli_task.id])
+        session.get_all_tasks()
+        session.flush()
+        
+        # Assert
+        assert [t.done for t in JSONTaskRepository(filepath).load()] == [True, True]
+
+
+def _fields(tasks):
+    """Vergleichbare Felder (ohne zufällige ID und Zeitstempel)."""
+    return [(t.title, t.done, t.category, t.due_date) for t in tasks]
+
+
+class TestAsyncParity:
+    """Async-API verhält sich wie die synchrone API."""
+    
+    @pytest.mark.parametrize("repo_class", [JSONTaskRepository, JournalTaskRepository])
+    def test_same_results_as_sync(self, tmp_path, repo_class):
+        # Arrange
+        sync_path = str(tmp_path / "sync.json")
+        async_path = str(tmp_path / "async.json")
+        due = date.today() + timedelta(days=2)
+        sync = TaskMediator(TaskController(repository=repo_class(sync_path)))
+        
+        # Act (synchron)
+        a = sync.add_task("Eins", category="Arbeit", due_date=due)
+        b = sync.add_task("Zwei")
+        sync_results = [
+            sync.add_task(""),
+            sync.toggle_task(a.id),
+            sync.update_task(b.id, title="Zwei neu", category="Privat"),
+            sync.update_task(b.id, title=""),
+            sync.delete_task("nicht-vorhanden"),
+            sync.add_typed_task("urgent", "Dringend").title,
+            sync.import_external_tasks([ExternalTaskFormat("Extern", 1, "API")]),
+        ]
+        
+        # Act (asynchron)
+        async def scenario():
+            mediator = AsyncTaskMediator(TaskController(repository=repo_class(async_path)))
+            a = await mediator.add_task("Eins", category="Arbeit", due_date=due)
+            b = await mediator.add_task("Zwei")
+            return [
+                await mediator.add_task(""),
+                await mediator.toggle_task(a.id),
+                await mediator.update_task(b.id, title="Zwei neu", category="Privat"),
+                await mediator.update_task(b.id, title=""),
+                await mediator.delete_task("nicht-vorhanden"),
+                (await mediator.add_typed_task("urgent", "Dringend")).title,
+                await mediator.import_external_tasks([ExternalTaskFormat("Extern", 1, "API")]),
+            ], await mediator.get_statistics()
+        async_results, async_stats = asyncio.run(scenario())
+        
+        # Assert
+        assert async_results == sync_results
+        assert async_stats == sync.get_statistics()
+        assert _fields(repo_class(async_path).load()) == _fields(repo_class(sync_path).load())
+    
+    def test_async_load_and_delete(self, tmp_path):
+        # Arrange
+        filepath = str(tmp_path / "tasks.json")
+        ctrl = TaskController(repository=JSONTaskRepository(filepath))
+        task = ctrl.add("Geladen")
+        ctrl.add("Bleibt")
+        ctrl.save()
+        
+        # Act
+        async def scenario():
+            mediator = AsyncTaskMediator(TaskController(repository=JSONTaskRepository(filepath)))
+            await mediator.load()
+            deleted = await mediator.delete_task(task.id)
+            return deleted, await mediator.get_all_tasks()
+        deleted, remaining = asyncio.run(scenario())
+        
+        # Assert
+        assert deleted == True
+        assert [t.title for t in remaining] == ["Bleibt"]
+        assert [t.title for t in JSONTaskRepository(filepath).load()] == ["Bleibt"]
+    
+    def test_concurrent_adds_are_all_saved(self, tmp_path):
+        # Arrange
+        filepath = str(tmp_path / "tasks.json")
+        mediator = AsyncTaskMediator(TaskController(repository=JournalTaskRepository(filepath)))
+        
+        # Act
+        async def scenario():
+            await asyncio.gather(*(mediator.add_task(f"Task {i}") for i in range(20)))
+            return await AsyncTaskRepository(JournalTaskRepository(filepath)).load()
+        loaded = asyncio.run(scenario())
+        
+        # Assert
+        assert len(loaded) == 20
+
+
+
+class TestCli:
+    """Kommandozeile (cli.py) auf einer JSON-Datei."""
+    
+    @pytest.fixture
+    def run(self, tmp_path, capsys):
+        filepath = str(tmp_path / "tasks.json")
+        
+        def run(*args):
+            code = cli.main(["--data", filepath] + list(args))
+            return code, capsys.readouterr().out
+        run.filepath = filepath
+        return run
+    
+    def test_add_done_list(self, run):
+        # Arrange
+        _, task_id = run("add", "Steuer", "--category", "Privat", "--due", "2026-05-31")
+        run("add", "Einkaufen")
+        
+        # Act
+        code, _ = run("done", task_id.strip())
+        _, out = run("list", "--status", "done")
+        
+        # Assert
+        assert code == 0
+        assert out == f"{task_id.strip()}  [x] Steuer  (Privat, fällig 2026-05-31)\n"
+        assert [t.done for t in JSONTaskRepository(run.filepath).load()] == [True, False]
+    
+    def test_unknown_id_fails(self, run):
+        run("add", "Bleibt")
+        
+        code, _ = run("delete", "unbekannt")
+        
+        assert code == 1
+        assert len(JSONTaskRepository(run.filepath).load()) == 1
+    
+    def test_export_import_roundtrip(self, run, tmp_path):
+        # Arrange
+        run("add", "A", "--category", "Arbeit")
+        run("add", "B")
+        export_path = str(tmp_path / "export.json")
+        run("export", export_path)
+        target = str(tmp_path / "other.json")
+        
+        # Act
+        code = cli.main(["--data", target, "import", export_path])
+        cli.main(["--data", target, "import", export_path])
+        
+        # Assert
+        assert code == 0
+        with open(export_path, encoding="utf-8") as f:
+            assert json.load(f) == [t.to_dict() for t in JSONTaskRepository(target).load()]
+    
+    def test_import_rejects_invalid_due_date(self, run, tmp_path):
+        path = tmp_path / "import.json"
+        path.write_text('[{"id": "a", "title": "x", "done": false, "due_date": "morgen"}]', encoding="utf-8")
+        
+        code, _ = run("import", str(path))
+        
+        assert code == 1
+        assert JSONTaskRepository(run.filepath).load() == []
+    
+    def test_negative_limit_rejected(self, run):
+        with pytest.raises(SystemExit) as exit_info:
+            run("list", "--limit", "-1")
+        
+        assert exit_info.value.code == 2
+    
+    def test_stats_json(self, run):
+        run("add", "A")
+        run("add", "B")
+        _, task_id = run("add", "C")
+        run("done", task_id.strip())
+        
+        _, out = run("stats", "--json")
+        
+        assert json.loads(out)["open"] == 2
+    
+    def test_does_not_import_streamlit(self, run):
+        # Eigener Prozess: im Testlauf ist streamlit evtl. schon geladen
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        script = ("import sys, todo; todo.main(['--data', sys.argv[1], 'stats']); "
+                  "assert 'streamlit' not in sys.modules")
+        
+        result = subprocess.run([sys.executable, "-c", script, run.filepath], cwd=root,
+                                capture_output=True, text=True)
+        
+        assert result.returncode == 0, result.stderr
+
+
+
+def _shared_store_app(filepath):
+    import streamlit as st
+    from store import SharedTaskStore
+    from view import TodoView
+    if "mediator" not in st.session_state:
+        st.session_state.mediator = SharedTaskStore.for_path(filepath).session()
+    st.session_state.smart_sort = False
+    TodoView(st.session_state.mediator).render()
+
+
+class TestSharedSessions:
+    """Zwei Sessions (AppTest) auf einem SharedTaskStore."""
+    
+    @pytest.fixture
+    def sessions(self, tmp_path):
+        testing = pytest.importorskip("streamlit.testing.v1")
+        filepath = str(tmp_path / "tasks.json")
+        JSONTaskRepository(filepath).save([Task(f"Task {i}", category="Privat") for i in range(5)])
+        apps = []
+        for _ in range(2):
+            app = testing.AppTest.from_function(_shared_store_app, args=(filepath,), default_timeout=30)
+            app.run()
+            apps.append(app)
+        return apps + [filepath]
+    
+    @staticmethod
+    def _checkbox(app, task_id):
+        return next(c for c in app.checkbox if c.key.startswith(f"cb_{task_id}_"))
+    
+    def test_toggle_survives_rerun_of_other_session(self, sessions):
+        # Arrange
+        a, b, _ = sessions
+        task_id = a.session_state.mediator.get_all_tasks()[0].id
+        
+        # Act
+        self._checkbox(a, task_id).check().run()
+        b.run()
+        b.run()
+        
+        # Assert
+        assert not b.exception
+        assert b.session_state.mediator.get_task_by_id(task_id).done
+        assert self._checkbox(b, task_id).value
+    
+    def test_bulk_done_with_stale_rows(self, sessions):
+        # Arrange
+        a, b, _ = sessions
+        first = a.session_state.mediator.get_all_tasks()[0].id
+        self._checkbox(a, first).check().run()
+        
+        # Act
+        b.button(key="bulk_done").click().run()
+        a.run()
+        b.run()
+        
+        # Assert
+        assert b.session_state.mediator.get_statistics()["done"] == 5
+    
+    def test_cli_change_not_reverted(self, sessions):
+        # Arrange
+        a, b, filepath = sessions
+        task_id = a.session_state.mediator.get_all_tasks()[2].id
+        
+        # Act
+        cli.main(["--data", filepath, "done", task_id])
+        a.run()
+        a.run()
+        
+        # Assert
+        assert [t.done for t in JSONTaskRepository(filepath).load()] == [False, False, True, False, False]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -1,13 +1,22 @@
 #Arrange Act Assert
 #Testet einzelene Funktionen
+import json
+import random
+import time
 import pytest
 from datetime import date, timedelta
 from controller import TaskController
-from repository import InMemoryTaskRepository
+from indexes import TaskList
+from flusher import WriteBehindFlusher
+from repository import InMemoryTaskRepository, JSONTaskRepository, TaskChangeSet, TaskChangeSetInterface
 from patterns import (
     ExternalTaskFormat, 
     TaskMediator
 )
+from model import Task
+from query import TaskQuery
+from codec import TaskCodec, decode_tasks
+from viewmodel import RenderCache, TaskRow, build_view_model, get_view_model, render_row_html
 
 class TestTodoApp:
     
@@ -76,6 +85,643 @@ class TestTodoApp:
         assert task.category == "Neu"
 
 
+class TestTaskModel:
+
+    def test_wire_format_roundtrip(self):
+        # Arrange
+        data = {"id": "abc12345", "title": "Bericht", "done": True, "category": "Arbeit",
+                "due_date": "2024-05-01", "created_at": "2024-04-30T08:15:00.123456"}
+
+        # Act
+        task = Task.from_dict(data)
+
+        # Assert
+        assert task.to_dict() == data
+        assert task.created_micros is not None
+
+    def test_created_at_not_representable_stays_raw(self):
+        # Arrange / Act
+        raw = Task("a", created_at="2024-04-30T08:15:00+02:00")
+        text = Task("b", created_at="gestern")
+
+        # Assert
+        assert raw.created_at == "2024-04-30T08:15:00+02:00"
+        assert text.created_at == "gestern"
+        assert raw.created_micros is None
+
+    def test_slots_and_interned_category(self):
+        # Arrange
+        a = Task("a", category="".join(["Arb", "eit"]))
+        b = Task("b", category="".join(["Arbe", "it"]))
+
+        # Act
+        b.category = "".join(["Pri", "vat"])
+        a.category = "".join(["Priv", "at"])
+
+        # Assert
+        assert not hasattr(a, "__dict__")
+        assert a.category is b.category
+
+    def test_equality_and_defaults(self):
+        # Arrange
+        task = Task("a", category="Sport", due_date=date(2024, 1, 1))
+
+        # Act
+        copy = Task.from_dict(task.to_dict())
+
+        # Assert
+        assert copy == task
+        assert len(task.id) == 8
+        assert Task("a").id != Task("a").id
+        assert "category='Sport'" in repr(task)
+
+
+class TestCodec:
+
+    @pytest.fixture
+    def tasks(self):
+        return [
+            Task('Zitat "A" und Umlaut ü\n', category="Arbeit", due_date=date(2024, 5, 1)),
+            Task("Erledigt", done=True, created_at="gestern"),
+            Task("Ohne alles"),
+        ]
+
+    def test_encode_matches_json_dump(self, tasks):
+        # Arrange
+        expected = json.dumps([t.to_dict() for t in tasks], ensure_ascii=False, indent=2)
+
+        # Act / Assert
+        assert TaskCodec().encode(tasks) == expected
+        assert TaskCodec().encode([]) == json.dumps([], indent=2)
+
+    def test_cache_reencodes_only_changed_tasks(self, tasks):
+        # Arrange
+        codec = TaskCodec()
+        codec.encode(tasks)
+
+        # Act
+        tasks[0].toggle()
+        tasks[2].due_date = date(2024, 6, 1)
+        text = codec.encode(tasks)
+
+        # Assert
+        assert (codec.hits, codec.misses) == (1, 5)
+        assert json.loads(text) == [t.to_dict() for t in tasks]
+
+    def test_cache_drops_deleted_tasks(self, tasks):
+        # Arrange
+        codec = TaskCodec()
+        codec.encode(tasks)
+
+        # Act
+        text = codec.encode(tasks[1:])
+
+        # Assert
+        assert len(codec._cache) == 2
+        assert [r["id"] for r in json.loads(text)] == [t.id for t in tasks[1:]]
+
+    def test_decode_roundtrip(self, tasks):
+        # Arrange
+        records = json.loads(TaskCodec().encode(tasks))
+
+        # Act
+        decoded = decode_tasks(records)
+
+        # Assert
+        assert decoded == tasks
+        assert decoded[0].due_date == date(2024, 5, 1)
+
+    def test_decode_rejects_invalid_due_date(self):
+        with pytest.raises(ValueError):
+            decode_tasks([{"id": "a", "title": "x", "done": False, "due_date": "morgen"}])
+
+    def test_encode_non_string_fields_like_json_dump(self):
+        # Arrange: Altdaten mit "category": null, Zahl als Titel und fehlendem created_at
+        records = [{"id": "a", "title": 42, "done": 1, "category": None, "due_date": None,
+                    "created_at": None}]
+        tasks = [Task.from_dict(r) for r in records]
+
+        # Act / Assert
+        assert TaskCodec().encode(tasks) == json.dumps(records, ensure_ascii=False, indent=2)
+
+    def test_save_and_reload_non_string_fields(self, tmp_path):
+        filepath = str(tmp_path / "tasks.json")
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump([{"id": "a", "title": "Alt", "done": False, "category": None}], f)
+        repo = JSONTaskRepository(filepath, use_snapshot=True)
+
+        tasks = repo.load()
+        repo.save(tasks)
+
+        assert [t.category for t in repo.load()] == [None]
+
+    def test_decode_requires_id(self):
+        with pytest.raises(KeyError):
+            decode_tasks([{"title": "ohne id", "done": False}])
+
+
+class TestIdIndex:
+    """Tests für den ID-Index (TaskList) im Controller."""
+    
+    @pytest.fixture
+    def controller(self):
+        return TaskController(repository=InMemoryTaskRepository())
+    
+    def test_tasklist_behaves_like_list(self):
+        """Reihenfolge, Indexzugriff und Vergleich wie bei einer list."""
+        a, b, c = Task("A"), Task("B"), Task("C")
+        tasks = TaskList([a, b])
+        tasks.insert(0, c)
+        
+        assert tasks == [c, a, b]
+        assert tasks[1] is a and tasks[-1] is b
+        assert tasks[:2] == [c, a]
+        assert a in tasks and Task("D") not in tasks
+        assert tasks.pop() is b
+        tasks.remove(c)
+        assert tasks.copy() == [a]
+    
+    def test_duplicate_id_replaces_in_place(self):
+        """Gleiche ID ersetzt den vorhandenen Task an seiner Position."""
+        first, other = Task("Alt", id="x"), Task("Andere")
+        tasks = TaskList([first, other])
+        replacement = Task("Neu", id="x")
+        tasks.append(replacement)
+        
+        assert len(tasks) == 2
+        assert tasks[0] is replacement
+        assert tasks.get("x") is replacement
+    
+    def test_index_follows_mutations(self, controller):
+        """get_by_id bleibt nach add, delete und load konsistent."""
+        keep = controller.add("Bleibt")
+        gone = controller.add("Weg")
+        controller.delete(gone.id)
+        
+        assert controller.get_by_id(keep.id) is keep
+        assert controller.get_by_id(gone.id) is None
+        assert controller.delete(gone.id) == False
+        
+        controller.save()
+        controller.load()
+        assert controller.get_by_id(keep.id) is not None
+    
+    def test_index_covers_factory_and_adapter(self, controller):
+        """Tasks aus Factory, Adapter und direktem append sind auffindbar."""
+        mediator = TaskMediator(controller)
+        typed = mediator.add_typed_task("work", "Meeting")
+        mediator.import_external_tasks([ExternalTaskFormat(name="Import", completed=0)])
+        imported = controller.tasks[-1]
+        direct = Task("Direkt")
+        controller.tasks.append(direct)
+        
+        for task in (typed, imported, direct):
+            assert controller.get_by_id(task.id) is task
+        assert controller.toggle(direct.id) == True
+    
+    def test_assigning_plain_list_builds_index(self, controller):
+        """Zuweisung einer list an controller.tasks wird indiziert."""
+        task = Task("Liste")
+        controller.tasks = [task]
+        
+        assert isinstance(controller.tasks, TaskList)
+        assert controller.get_by_id(task.id) is task
+
+
+class TestSecondaryIndexes:
+    """Tests für Status- und Kategorie-Index im Controller."""
+    
+    @pytest.fixture
+    def controller(self):
+        return TaskController(repository=InMemoryTaskRepository())
+    
+    def test_status_queries_keep_list_order(self, controller):
+        """get_open/get_done liefern Tasks in Einfügereihenfolge."""
+        tasks = [controller.add(f"Task {i}") for i in range(5)]
+        for task in (tasks[3], tasks[0], tasks[2]):
+            controller.toggle(task.id)
+        controller.toggle(tasks[2].id)
+        
+        assert controller.get_open() == [tasks[1], tasks[2], tasks[4]]
+        assert controller.get_done() == [tasks[0], tasks[3]]
+    
+    def test_category_reference_counts(self, controller):
+        """Kategorie verschwindet erst mit ihrem letzten Task."""
+        a = controller.add("A", category="Arbeit")
+        b = controller.add("B", category="Arbeit")
+        controller.add("C", category="Privat")
+        
+        controller.update(a.id, category="Privat")
+        assert controller.get_categories() == ["Arbeit", "Privat"]
+        assert controller.get_by_category("Privat")[0] is a
+        
+        controller.delete(b.id)
+        assert controller.get_categories() == ["Privat"]
+        assert controller.get_by_category("Arbeit") == []
+    
+    def test_indexes_follow_direct_list_changes(self, controller):
+        """Direktes append/remove und Neuzuweisung aktualisieren die Indizes."""
+        task = Task("Direkt", category="Extern", done=True)
+        controller.tasks.append(task)
+        assert controller.get_done() == [task]
+        assert controller.get_categories() == ["Extern"]
+        
+        controller.tasks.remove(task)
+        assert controller.get_done() == []
+        
+        controller.tasks = [Task("Neu", category="Liste")]
+        assert controller.get_categories() == ["Liste"]
+        assert len(controller.get_open()) == 1
+
+
+class TestDueDateIndex:
+    """Tests für Fälligkeits-Index und Bereichsabfragen."""
+    
+    TODAY = date(2024, 5, 15)
+    
+    @pytest.fixture
+    def controller(self):
+        ctrl = TaskController(repository=InMemoryTaskRepository())
+        for title, offset in [("Später", 10), ("Gestern", -1), ("Heute", 0),
+                              ("Morgen", 1), ("Vorgestern", -2), ("Woche", 7)]:
+            ctrl.add(title, due_date=self.TODAY + timedelta(days=offset))
+        ctrl.add("Ohne Datum")
+        return ctrl
+    
+    def titles(self, tasks):
+        return [t.title for t in tasks]
+    
+    def test_overdue_and_due_today(self, controller):
+        """Überfällige nach Datum sortiert, heute fällige inkl. erledigter."""
+        controller.toggle(controller.get_due_today(self.TODAY)[0].id)
+        
+        assert self.titles(controller.get_overdue(self.TODAY)) == ["Vorgestern", "Gestern"]
+        assert self.titles(controller.get_due_today(self.TODAY)) == ["Heute"]
+    
+    def test_range_queries(self, controller):
+        """before ist exklusiv, between inklusiv, upcoming ab morgen."""
+        assert self.titles(controller.get_due_before(self.TODAY)) == ["Vorgestern", "Gestern"]
+        assert self.titles(controller.get_due_between(
+            self.TODAY, self.TODAY + timedelta(days=7))) == ["Heute", "Morgen", "Woche"]
+        assert self.titles(controller.get_upcoming(7, today=self.TODAY)) == ["Morgen", "Woche"]
+    
+    def test_index_follows_updates(self, controller):
+        """Erledigen, Datum ändern und Löschen wirken auf die Abfragen."""
+        tomorrow = controller.get_upcoming(1, today=self.TODAY)[0]
+        yesterday = controller.get_overdue(self.TODAY)[-1]
+        controller.toggle(yesterday.id)
+        controller.update(tomorrow.id, due_date=self.TODAY - timedelta(days=5))
+        controller.delete(controller.get_overdue(self.TODAY)[1].id)
+        
+        assert self.titles(controller.get_overdue(self.TODAY)) == ["Morgen"]
+        assert controller.get_upcoming(5, today=self.TODAY) == []
+    
+    def test_task_methods_accept_today(self):
+        """is_overdue/is_due_today nutzen den übergebenen Stichtag."""
+        task = Task("Stichtag", due_date=self.TODAY)
+        
+        assert task.is_due_today(self.TODAY)
+        assert task.is_overdue(self.TODAY + timedelta(days=1))
+        assert not task.is_overdue(self.TODAY)
+
+
+class TestStatistics:
+    """Laufende Zähler gegen vollständiges Nachzählen."""
+    
+    @staticmethod
+    def recount(tasks, today):
+        done = sum(1 for t in tasks if t.done)
+        categories = {}
+        for t in tasks:
+            categories[t.category] = categories.get(t.category, 0) + 1
+        return {
+            "total": len(tasks),
+            "done": done,
+            "open": len(tasks) - done,
+            "progress": done / len(tasks) if tasks else 0,
+            "overdue": sum(1 for t in tasks if t.is_overdue(today)),
+            "due_today": sum(1 for t in tasks if t.is_due_today(today)),
+        }, categories
+    
+    @pytest.mark.parametrize("seed", range(10))
+    def test_counters_match_recount(self, seed):
+        """Zufällige Änderungsfolgen, Datumswechsel inklusive."""
+        rng = random.Random(seed)
+        ctrl = TaskController(repository=InMemoryTaskRepository())
+        today = date(2024, 1, 10)
+        
+        def random_due():
+            return rng.choice([None, today + timedelta(days=rng.randint(-3, 3))])
+        
+        for step in range(300):
+            ids = [t.id for t in ctrl.tasks]
+            action = rng.random()
+            if action < 0.35 or not ids:
+                ctrl.add(f"Task {step}", category=rng.choice(["", "A", "B"]),
+                         due_date=random_due())
+            elif action < 0.55:
+                ctrl.toggle(rng.choice(ids))
+            elif action < 0.7:
+                ctrl.update(rng.choice(ids), category=rng.choice(["", "A", "C"]),
+                            due_date=random_due())
+            elif action < 0.85:
+                ctrl.delete(rng.choice(ids))
+            elif action < 0.9:
+                ctrl.tasks.append(Task("Direkt", done=rng.random() < 0.5,
+                                       due_date=random_due()))
+            elif action < 0.95:
+                ctrl.save()
+                ctrl.load()
+            else:
+                today += timedelta(days=rng.choice([-1, 1]))
+            
+            expected, categories = self.recount(list(ctrl.tasks), today)
+            assert ctrl.get_statistics(today) == expected
+            assert ctrl.get_category_counts() == categories
+
+
+class TestTaskQuery:
+    """Tests für zusammengesetzte Abfragen und den Planer."""
+    
+    TODAY = date(2024, 5, 15)
+    
+    @pytest.fixture
+    def controller(self):
+        ctrl = TaskController(repository=InMemoryTaskRepository())
+        day = lambda offset: self.TODAY + timedelta(days=offset)
+        for title, category, due in [
+            ("Ohne Datum", "Arbeit", None), ("Nächste Woche", "Arbeit", day(7)),
+            ("Heute", "Privat", day(0)), ("Gestern", "Arbeit", day(-1)),
+            ("Fertig", "Arbeit", day(-3)), ("Morgen", "Privat", day(1)),
+        ]:
+            ctrl.add(title, category=category, due_date=due)
+        ctrl.toggle(ctrl.query(TaskQuery(text="fertig"))[0].id)
+        return ctrl
+    
+    def titles(self, tasks):
+        return [t.title for t in tasks]
+    
+    def test_smart_sort(self, controller):
+        """Überfällig -> Heute -> Datum -> ohne Datum -> erledigt."""
+        result = controller.query(TaskQuery(sort="smart"), today=self.TODAY)
+        
+        assert self.titles(result) == ["Gestern", "Heute", "Morgen", "Nächste Woche",
+                                       "Ohne Datum", "Fertig"]
+    
+    def test_combined_filters_with_limit(self, controller):
+        """Status, Kategorie, Bereich und Limit/Offset wirken zusammen."""
+        query = TaskQuery(status="open", category="Arbeit", due_from=self.TODAY - timedelta(days=5),
+                          due_to=self.TODAY + timedelta(days=7), sort="due")
+        
+        assert self.titles(controller.query(query)) == ["Gestern", "Nächste Woche"]
+        assert self.titles(controller.query(TaskQuery(sort="title", limit=2, offset=1))) == [
+            "Gestern", "Heute"]
+    
+    def test_planner_uses_smallest_index(self, controller):
+        """Der Planer nimmt die kleinste Kandidatenmenge."""
+        candidates, ordered, _ = controller._plan(TaskQuery(status="done", category="Arbeit"))
+        
+        assert not ordered
+        assert self.titles(candidates) == ["Fertig"]
+    
+    def test_due_range_includes_done_without_status(self, controller):
+        """Ohne Status liefert ein Bereich offene und erledigte Tasks."""
+        query = TaskQuery(due_to=self.TODAY - timedelta(days=1))
+        
+        assert self.titles(controller.query(query)) == ["Gestern", "Fertig"]
+    
+    def test_count_ignores_limit_and_offset(self, controller):
+        """count() zählt alle Treffer, die Seiten ergeben zusammen die volle Liste."""
+        query = TaskQuery(category="Arbeit", sort="smart")
+        pages = [controller.query(TaskQuery(category="Arbeit", sort="smart", limit=2, offset=o),
+                                  today=self.TODAY) for o in (0, 2, 4)]
+        
+        assert controller.count(query) == 4
+        assert controller.count(TaskQuery(status="open", text="morgen")) == 1
+        assert controller.count(TaskQuery()) == 6
+        assert [t for page in pages for t in page] == controller.query(query, today=self.TODAY)
+    
+    def test_invalid_query_raises(self):
+        with pytest.raises(ValueError):
+            TaskQuery(sort="zufall")
+        with pytest.raises(ValueError):
+            TaskQuery(status="irgendwas")
+
+
+class TestSearch:
+    """Tests für die Volltextsuche über den invertierten Index."""
+    
+    @pytest.fixture
+    def mediator(self):
+        return TaskMediator(TaskController(repository=InMemoryTaskRepository()))
+    
+    def titles(self, tasks):
+        return [t.title for t in tasks]
+    
+    def test_accents_case_and_prefix(self, mediator):
+        """Umlaute, ß und Emoji-Präfixe stören die Suche nicht."""
+        mediator.add_typed_task("work", "Übungsblatt für Mathe")
+        mediator.add_task("Straßenfest planen")
+        mediator.add_task("Uebung")
+        
+        assert self.titles(mediator.search_tasks("ubung")) == ["🔨 Übungsblatt für Mathe"]
+        assert self.titles(mediator.search_tasks("STRASSE")) == ["Straßenfest planen"]
+        assert self.titles(mediator.search_tasks("fur mat")) == ["🔨 Übungsblatt für Mathe"]
+        assert mediator.search_tasks("🔨") == []
+    
+    def test_index_follows_update_and_delete(self, mediator):
+        """Umbenennen und Löschen aktualisieren den Index."""
+        task = mediator.add_task("Alter Titel")
+        other = mediator.add_task("Titelseite drucken")
+        mediator.update_task(task.id, title="Neuer Name")
+        
+        assert self.titles(mediator.search_tasks("titel")) == ["Titelseite drucken"]
+        assert self.titles(mediator.search_tasks("neu")) == ["Neuer Name"]
+        
+        mediator.delete_task(other.id)
+        assert mediator.search_tasks("titel") == []
+    
+    def test_query_combines_text_with_filters(self, mediator):
+        """Text in TaskQuery wird mit den übrigen Filtern kombiniert."""
+        mediator.add_task("Bericht schreiben", category="Arbeit")
+        mediator.add_task("Bericht lesen", category="Privat")
+        
+        result = mediator.query_tasks(TaskQuery(text="ber", category="Privat"))
+        assert self.titles(result) == ["Bericht lesen"]
+
+
+class RecordingRepository(InMemoryTaskRepository, TaskChangeSetInterface):
+    """In-Memory Repository, das übergebene Änderungen mitschreibt."""
+    
+    def __init__(self):
+        super().__init__()
+        self.changes = []
+    
+    def save_changes(self, changes: TaskChangeSet) -> None:
+        self.changes.append(changes)
+
+
+class TestChangeTracking:
+    """Tests für die Änderungsverfolgung im Controller."""
+    
+    @pytest.fixture
+    def controller(self):
+        return TaskController(repository=RecordingRepository())
+    
+    def test_tracks_created_modified_deleted(self, controller):
+        """Neue, geänderte und gelöschte Tasks werden erfasst."""
+        kept = controller.add("Bleibt")
+        gone = controller.add("Geht")
+        controller.save()
+        
+        new = controller.add("Neu")
+        controller.toggle(kept.id)
+        controller.delete(gone.id)
+        changes = controller.get_changes()
+        
+        assert [t.id for t in changes.upserts] == [new.id, kept.id]
+        assert changes.deletes == [gone.id]
+    
+    def test_delete_unsaved_task_leaves_no_change(self, controller):
+        """Ungespeicherter und wieder gelöschter Task erzeugt keine Änderung."""
+        task = controller.add("Kurzlebig")
+        controller.delete(task.id)
+        
+        assert controller.has_changes() == False
+    
+    def test_save_passes_changes_and_clears(self, controller):
+        """save() übergibt nur die Änderungen und setzt sie zurück."""
+        controller.add("Eins")
+        controller.save()
+        controller.save()
+        
+        assert len(controller.repository.changes) == 1
+        assert controller.has_changes() == False
+    
+    def test_full_save_fallback(self):
+        """Repositories ohne Teil-Speicherung erhalten alle Tasks."""
+        repo = InMemoryTaskRepository()
+        controller = TaskController(repository=repo)
+        controller.add("Eins")
+        controller.add("Zwei")
+        controller.save()
+        
+        assert len(repo.load()) == 2
+
+
+class TestWriteBehind:
+    """Tests für verzögertes Speichern über den WriteBehindFlusher."""
+    
+    @pytest.fixture
+    def setup(self):
+        repo = RecordingRepository()
+        ctrl = TaskController(repository=repo)
+        flusher = WriteBehindFlusher(ctrl, interval_ms=10_000, max_pending=5)
+        yield TaskMediator(ctrl, flusher=flusher), repo
+        flusher.close()
+    
+    def test_mutations_do_not_save_immediately(self, setup):
+        """Änderungen werden nur vorgemerkt."""
+        mediator, repo = setup
+        mediator.add_task("Eins")
+        mediator.add_task("Zwei")
+        
+        assert repo.changes == []
+        assert mediator.flusher.pending == 2
+    
+    def test_flush_coalesces_changes(self, setup):
+        """flush() schreibt alle Änderungen in einem Durchgang."""
+        mediator, repo = setup
+        task = mediator.add_task("Eins")
+        mediator.toggle_task(task.id)
+        mediator.add_task("Zwei")
+        
+        mediator.flush()
+        
+        assert len(repo.changes) == 1
+        assert len(repo.changes[0].upserts) == 2
+    
+    def test_flush_after_max_pending(self, setup):
+        """Ab max_pending Änderungen schreibt der Hintergrund-Thread."""
+        mediator, repo = setup
+        for i in range(5):
+            mediator.add_task(f"Task {i}")
+        
+        deadline = time.monotonic() + 2
+        while not repo.changes and time.monotonic() < deadline:
+            time.sleep(0.01)
+        
+        assert sum(len(c.upserts) for c in repo.changes) == 5
+    
+    def test_close_flushes_pending(self):
+        """Beim Schließen werden ausstehende Änderungen geschrieben."""
+        repo = RecordingRepository()
+        ctrl = TaskController(repository=repo)
+        flusher = WriteBehindFlusher(ctrl, interval_ms=10_000)
+        TaskMediator(ctrl, flusher=flusher).add_task("Offen")
+        
+        flusher.close()
+        
+        assert len(repo.changes) == 1
+
+
+class TestBulkOperations:
+    """Sammeloperationen: ein Speichern und eine Benachrichtigung pro Aufruf."""
+    
+    @pytest.fixture
+    def setup(self):
+        repo = RecordingRepository()
+        mediator = TaskMediator(TaskController(repository=repo))
+        events = []
+        mediator.add_listener(events.append)
+        return mediator, repo, events
+    
+    def test_add_many_saves_once(self, setup):
+        mediator, repo, events = setup
+        tasks = mediator.add_many(["Eins", " ", "Zwei", "Drei"], category="Import")
+        
+        assert [t.title for t in tasks] == ["Eins", "Zwei", "Drei"]
+        assert len(repo.changes) == 1 and len(repo.changes[0].upserts) == 3
+        assert events == ["tasks_added"]
+    
+    def test_set_done_and_delete_many(self, setup):
+        """Nur abweichende Tasks werden geändert, Duplikate einmal gezählt."""
+        mediator, repo, events = setup
+        a, b, c = mediator.add_many(["A", "B", "C"])
+        mediator.toggle_task(a.id)
+        
+        assert mediator.set_done_many([a.id, b.id, b.id, "fehlt"]) == 1
+        assert mediator.controller.get_done() == [a, b]
+        assert mediator.delete_many([t.id for t in mediator.get_done_tasks()]) == 2
+        assert mediator.get_all_tasks() == [c]
+        assert events[-2:] == ["tasks_toggled", "tasks_deleted"]
+        assert len(repo.changes) == 4
+    
+    def test_update_many_moves_category(self, setup):
+        """Kategorie verschieben aktualisiert Index und speichert einmal."""
+        mediator, repo, _ = setup
+        tasks = mediator.add_many(["A", "B"], category="Alt")
+        saves = len(repo.changes)
+        
+        assert mediator.update_many([t.id for t in tasks], category="Neu") == 2
+        assert mediator.get_categories() == ["Neu"]
+        assert len(repo.changes) == saves + 1
+    
+    def test_update_many_empty_title_changes_nothing(self, setup):
+        mediator, repo, events = setup
+        tasks = mediator.add_many(["A", "B"])
+        
+        assert mediator.update_many([t.id for t in tasks], title=" ") == 0
+        assert [t.title for t in tasks] == ["A", "B"]
+        assert events == ["tasks_added"]
+    
+    def test_no_save_without_changes(self, setup):
+        mediator, repo, events = setup
+        
+        assert mediator.delete_many(["fehlt"]) == 0
+        assert repo.changes == [] and events == []
+
+
 class TestTaskMediator:
     """Tests für TaskMediator."""
     
@@ -226,3 +872,104 @@ class TestTaskMediator:
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--cov=.", "--cov-report=term-missing"])
+
+
+class TestViewModel:
+    """Tests für den Schnappschuss der View."""
+    
+    TODAY = date(2024, 5, 15)
+    
+    @pytest.fixture
+    def mediator(self):
+        mediator = TaskMediator(TaskController(repository=InMemoryTaskRepository()))
+        mediator.add_task("Überfällig", category="Arbeit", due_date=self.TODAY - timedelta(days=2))
+        mediator.add_task("Heute", category="Privat", due_date=self.TODAY)
+        mediator.add_task("Später", category="Arbeit", due_date=self.TODAY + timedelta(days=3))
+        mediator.add_many([f"Task {i}" for i in range(4)])
+        return mediator
+    
+    def test_rows_have_precomputed_labels(self, mediator):
+        vm = build_view_model(mediator, TaskQuery(sort="smart"), 0, 3, today=self.TODAY)
+        
+        assert [(r.title, r.due_class, r.due_label) for r in vm.rows] == [
+            ("Überfällig", "date-overdue", "⚠️ 13.05."),
+            ("Heute", "date-today", "📅 Heute"),
+            ("Später", "date-normal", "📅 18.05."),
+        ]
+        assert (vm.total, vm.open_count, vm.pages) == (7, 7, 3)
+        assert vm.categories == ("Arbeit", "Privat")
+        assert vm.stats["total"] == 7
+    
+    def test_done_task_shows_no_date(self, mediator):
+        task = mediator.get_all_tasks()[0]
+        mediator.toggle_task(task.id)
+        
+        assert TaskRow.from_task(task, self.TODAY, mediator.get_task_version(task.id)).due_class == ""
+    
+    def test_reused_until_version_changes(self, mediator):
+        query = TaskQuery(category="Arbeit")
+        vm = get_view_model(mediator, query, 0, 10, today=self.TODAY)
+        
+        assert get_view_model(mediator, query, 0, 10, previous=vm, today=self.TODAY) is vm
+        mediator.toggle_task(vm.rows[0].id)
+        fresh = get_view_model(mediator, query, 0, 10, previous=vm, today=self.TODAY)
+        assert fresh is not vm
+        assert (fresh.open_count, fresh.done_count) == (1, 1)
+        assert get_view_model(mediator, query, 0, 10, previous=fresh,
+                              today=self.TODAY + timedelta(days=1)) is not fresh
+    
+    def test_page_is_clamped(self, mediator):
+        vm = build_view_model(mediator, TaskQuery(), 5, 3, today=self.TODAY)
+        
+        assert vm.page == 2
+        assert [r.title for r in vm.rows] == ["Task 3"]
+    
+    def test_controller_version_counts_changes(self, mediator):
+        before = mediator.get_version()
+        task = mediator.add_task("Neu")
+        mediator.update_task(task.id, title="Neu 2")
+        mediator.delete_task(task.id)
+        
+        assert mediator.get_version() == before + 3
+        mediator.get_statistics()
+        assert mediator.get_version() == before + 3
+    
+    def test_task_version_changes_only_for_modified_task(self, mediator):
+        first, second = mediator.get_all_tasks()[:2]
+        before = mediator.get_task_version(second.id)
+        version = mediator.get_task_version(first.id)
+        
+        mediator.toggle_task(first.id)
+        
+        assert mediator.get_task_version(first.id) > version
+        assert mediator.get_task_version(second.id) == before
+        vm = build_view_model(mediator, TaskQuery(), 0, 10, today=self.TODAY)
+        assert vm.row(first.id).version == mediator.get_task_version(first.id)
+    
+    def test_render_cache_rebuilds_after_change(self, mediator):
+        cache = RenderCache(10)
+        task = mediator.get_all_tasks()[0]
+        
+        def render():
+            row = TaskRow.from_task(mediator.get_task_by_id(task.id), self.TODAY,
+                                    mediator.get_task_version(task.id))
+            return cache.get_or_build((row.id, row.version, self.TODAY), lambda: render_row_html(row))
+        
+        title_html, meta_html = render()
+        assert render() == (title_html, meta_html)
+        assert (cache.hits, cache.misses) == (1, 1)
+        mediator.toggle_task(task.id)
+        
+        assert render()[0] == '<div class="task-done">Überfällig</div>'
+        assert cache.misses == 2
+    
+    def test_render_cache_evicts_least_recently_used(self):
+        cache = RenderCache(2)
+        cache.get_or_build("a", lambda: "A")
+        cache.get_or_build("b", lambda: "B")
+        cache.get_or_build("a", lambda: "x")
+        cache.get_or_build("c", lambda: "C")
+        
+        assert len(cache) == 2
+        assert cache.get_or_build("a", lambda: "x") == "A"
+        assert cache.get_or_build("b", lambda: "B2") == "B2"
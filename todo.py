@@ -0,0 +1,12 @@
+import sys
+import os
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(_BASE_DIR, "src"))
+
+from cli import main
+
+
+# Kommandozeile ohne Streamlit, z.B.: python -m todo list --status open
+if __name__ == "__main__":
+    sys.exit(main())